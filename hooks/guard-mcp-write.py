@@ -2,19 +2,24 @@
 """
 Cursor beforeMCPExecution hook: require authorization for MCP tools that write data.
 
-Reads JSON from stdin (tool_name, tool_input). If the tool is a known write tool
-(memory_store, create_entities, GitHub write, Shrimp update, etc.), returns permission: ask.
-Otherwise returns permission: allow.
+Reads JSON from stdin (tool_name, tool_input, server url/command). The decision comes
+from the (server, tool) policy table compiled from mcp.json and mcp-policy.json (see
+guardlib/mcp_policy.py). Tools not in the table fall back to WRITE_TOOLS and a
+word-based verb check; that decision is remembered. Write tools return permission: ask.
 
 Output: {"permission": "allow"} or {"permission": "ask", "user_message": "...", "agent_message": "..."}
-Exit: 0 for allow/ask; 2 for deny. Fail-closed: on error, output deny and exit 2.
+Exit: 0 for allow/ask; 2 for deny. On error or past its time budget, the fallback
+decision from guardlib/runtime.py applies (default: ask).
 """
 
 from __future__ import annotations
 
 import json
+import re
 import sys
 
+from guardlib import mcp_policy, registry
+
 
 WRITE_TOOLS = frozenset({
     "memory_store",
@@ -39,50 +44,79 @@ WRITE_TOOLS = frozenset({
     "delete",
 })
 
+# Verbs that mark a tool as writing when they appear as a whole word in its name.
+WRITE_VERBS = frozenset({
+    "store", "create", "add", "write", "push", "merge", "update", "post", "put", "patch",
+    "delete", "remove", "insert", "upload", "edit", "set", "fork", "clear",
+})
+
+_WORD_SPLIT = re.compile(r"[_\W]+|(?<=[a-z0-9])(?=[A-Z])")
 
-def main() -> int:
+# Bump when heuristic_decision's logic changes: remembered decisions made by an
+# older version are then dropped. Changes to the data it reads are seen by HEURISTIC.
+HEURISTIC_VERSION = 1
+
+
+def heuristic_decision(tool_name: str) -> str:
+    """Fallback for tools not in the policy table: "ask" for likely writes, else "allow"."""
+    if mcp_policy.normalize_tool(tool_name) in WRITE_TOOLS:
+        return "ask"
+    words = {w.lower() for w in _WORD_SPLIT.split(tool_name) if w}
+    return "ask" if words & WRITE_VERBS else "allow"
+
+
+# Everything heuristic_decision depends on, as the policy cache key for remembered decisions.
+HEURISTIC = mcp_policy.digest((HEURISTIC_VERSION, sorted(WRITE_TOOLS), sorted(WRITE_VERBS), _WORD_SPLIT.pattern))
+
+
+def evaluate(raw: str, ctx: dict | None = None) -> tuple[dict, int]:
+    """Decide on one hook payload. Returns (output JSON object, exit code).
+
+    ctx, if given, receives "subject" for the audit log (never content).
+    """
+    ctx = {} if ctx is None else ctx
     try:
-        payload = json.load(sys.stdin)
+        payload = json.loads(raw)
     except json.JSONDecodeError:
-        print(json.dumps({"permission": "deny", "user_message": "Hook could not parse input."}))
-        return 2
+        return {"permission": "deny", "user_message": "Hook could not parse input."}, 2
 
-    tool_name = (payload.get("tool_name") or "").strip().lower()
+    raw_name = (payload.get("tool_name") or "").strip()
+    tool_name = raw_name.lower()
     if not tool_name:
-        print(json.dumps({"permission": "allow"}))
-        return 0
-
-    # Normalize: tool names may be "memory_store" or "memory/store"
-    tool_name_flat = tool_name.replace("/", "_").replace("-", "_")
-    if tool_name_flat in WRITE_TOOLS:
-        pass
-    elif any(w in tool_name_flat for w in ("store", "create", "add", "write", "push", "merge", "update", "post", "put", "patch", "delete", "execute_task", "verify_task", "split_tasks")):
-        # Likely a write tool
-        pass
-    else:
-        print(json.dumps({"permission": "allow"}))
-        return 0
+        return {"permission": "allow"}, 0
+
+    policy = mcp_policy.get_policy(HEURISTIC)
+    server = policy.resolve_server(payload)
+    ctx["subject"] = f"{server}/{mcp_policy.normalize_tool(raw_name)}"
+    decision = policy.decide(server, raw_name, heuristic_decision)
+    if decision == "allow":
+        return {"permission": "allow"}, 0
+    if decision == "deny":
+        return {
+            "permission": "deny",
+            "user_message": f"MCP tool '{tool_name}' is blocked by mcp-policy.json.",
+        }, 2
 
     user_message = f"MCP tool '{tool_name}' can write or change data. Confirm you want to run it."
     agent_message = (
         f"The tool '{tool_name}' was flagged as a write operation. "
         "User authorization is required. Summarize the intended action and ask the user to confirm."
     )
-    print(
-        json.dumps(
-            {
-                "permission": "ask",
-                "user_message": user_message,
-                "agent_message": agent_message,
-            }
-        )
-    )
-    return 0
+    return {
+        "permission": "ask",
+        "user_message": user_message,
+        "agent_message": agent_message,
+    }, 0
+
+
+def main() -> int:
+    return registry.main("mcp-write", sys.modules[__name__])
 
 
 if __name__ == "__main__":
     try:
         sys.exit(main())
     except Exception:
-        print(json.dumps({"permission": "deny", "user_message": "Hook failed."}))
-        sys.exit(2)
+        out, code = registry.fallback("mcp-write", "error")
+        print(out)
+        sys.exit(code)
@@ -3,102 +3,176 @@
 Cursor preToolUse (Write) hook: require authorization before writing secrets to files.
 
 Reads JSON from stdin. If the write target is a sensitive path (e.g. .env, *.pem)
-and the content looks like secrets (password=, api_key=, etc.), returns decision: deny
-with a reason. Otherwise returns decision: allow.
+and the content looks like secrets (password=, api_key=, etc., a provider token
+such as ghp_... or AKIA..., or a high-entropy string; see guardlib/detect.py),
+returns decision: deny with a reason. Otherwise returns decision: allow. Content (edits[].new_string,
+new_string, content/contents) is scanned in bounded windows; see guardlib/scan.py.
+The path is read first without decoding the payload (guardlib/payload.py), so a
+write to an ordinary path is allowed in the same time whatever the content size.
 
 Output: {"decision": "allow"} or {"decision": "deny", "reason": "..."}
-Exit: 0 for allow, 2 for deny.
+Exit: 0 for allow, 2 for deny. On error or past its time budget, the fallback
+decision from guardlib/runtime.py applies (default: ask, i.e. deny with a reason).
 """
 
 from __future__ import annotations
 
 import json
-import re
 import sys
-from pathlib import Path
 
+from guardlib import audit, detect, payload as payload_reader, registry, scan
+from guardlib.rulepack import RulePack
 
+
+# (rule name, pattern); extra rules can be added in guard-rules.json (see guardlib/rulepack.py).
 SENSITIVE_PATH_PATTERNS = (
-    r"\.env",
-    r"\.env\.",
-    r"\.env$",
-    r"secret",
-    r"credential",
-    r"\.pem$",
-    r"\.key$",
-    r"config/local",
+    ("env-file", r"\.env"),
+    ("env-variant", r"\.env\."),
+    ("env-exact", r"\.env$"),
+    ("secret-path", r"secret"),
+    ("credential-path", r"credential"),
+    ("pem-file", r"\.pem$"),
+    ("key-file", r"\.key$"),
+    ("local-config", r"config/local"),
 )
 SECRET_CONTENT_PATTERNS = (
-    r"password\s*=",
-    r"api_key\s*=",
-    r"apikey\s*=",
-    r"secret\s*=",
-    r"token\s*=",
-    r"Authorization\s*:",
-    r"Bearer\s+",
+    ("password-assignment", r"password\s*="),
+    ("api-key-assignment", r"api_key\s*="),
+    ("apikey-assignment", r"apikey\s*="),
+    ("secret-assignment", r"secret\s*="),
+    ("token-assignment", r"token\s*="),
+    ("authorization-header", r"Authorization\s*:"),
+    ("bearer-token", r"Bearer\s+"),
+)
+
+# Provider tokens as (name, pattern); each needs a literal prefix. Extra formats and
+# settings can be added under "detect" in guard-rules.json (see guardlib/detect.py).
+TOKEN_FORMATS = (
+    ("github-token", r"ghp_[A-Za-z0-9]{36}"),
+    ("github-token", r"gho_[A-Za-z0-9]{36}"),
+    ("github-token", r"ghu_[A-Za-z0-9]{36}"),
+    ("github-token", r"ghs_[A-Za-z0-9]{36}"),
+    ("github-token", r"ghr_[A-Za-z0-9]{36}"),
+    ("github-fine-grained-token", r"github_pat_[A-Za-z0-9]{22}_[A-Za-z0-9]{59}"),
+    ("aws-access-key", r"AKIA[A-Z0-9]{16}"),
+    ("aws-access-key", r"ASIA[A-Z0-9]{16}"),
+    ("private-key", r"-----BEGIN (?:[A-Z0-9]{1,10} ){0,3}PRIVATE KEY(?: BLOCK)?-----"),
+    ("grafana-service-account-token", r"glsa_[A-Za-z0-9]{32}_[A-Fa-f0-9]{8}"),
+    ("grafana-cloud-token", r"glc_[A-Za-z0-9+/]{32,400}={0,2}"),
+    ("grafana-api-key", r"eyJrIjoi[A-Za-z0-9+/]{40,400}={0,2}"),
+    ("jwt", r"eyJ[A-Za-z0-9_-]{10,500}\.eyJ[A-Za-z0-9_-]{10,8000}\.[A-Za-z0-9_-]{10,1000}"),
+    ("postman-api-key", r"PMAK-[a-f0-9]{24}-[a-f0-9]{34}"),
+    ("slack-token", r"xox[abposr]-[A-Za-z0-9-]{10,250}"),
+    ("stripe-secret-key", r"sk_live_[A-Za-z0-9]{24,99}"),
+    ("stripe-secret-key", r"rk_live_[A-Za-z0-9]{24,99}"),
+    ("google-api-key", r"AIza[A-Za-z0-9_-]{35}"),
+    ("openai-api-key", r"sk-proj-[A-Za-z0-9_-]{40,200}"),
+    ("anthropic-api-key", r"sk-ant-[A-Za-z0-9_-]{40,200}"),
+    ("npm-token", r"npm_[A-Za-z0-9]{36}"),
+)
+# Placeholders and checksums that look like secrets (searched in the finding's text).
+SECRET_ALLOWLIST = (
+    r"(?i:example|placeholder|dummy|changeme|redacted|your[_-])",
+    r"(?i:x{8,}|\*{8,}|0{12,})",
+    r"(?:sha1|sha256|sha384|sha512)-",
 )
 
+RULES = RulePack({"path": SENSITIVE_PATH_PATTERNS, "content": SECRET_CONTENT_PATTERNS})
+DETECTOR = detect.Detector(TOKEN_FORMATS, SECRET_ALLOWLIST)
 
-def is_sensitive_path(file_path: str) -> bool:
+
+def sensitive_path_rule(file_path: str) -> str | None:
+    """Name of the path rule matching file_path, or None."""
     path_lower = file_path.lower().replace("\\", "/")
-    return any(re.search(p, path_lower, re.IGNORECASE) for p in SENSITIVE_PATH_PATTERNS)
+    return RULES.search("path", path_lower)
+
+
+def secret_content_rule(text: str, start: int = 0, stop: int | None = None) -> str | None:
+    """Name of the content rule or secret detector matching text[start:stop], or None.
+
+    The detector sees all of text, for context around the window (scan.scan).
+    """
+    stop = len(text) if stop is None else stop
+    window = text[start:stop] if start or stop < len(text) else text
+    if not window or not window.strip():
+        return None
+    return RULES.search("content", window) or DETECTOR.search(text, start, stop)
+
+
+def is_sensitive_path(file_path: str) -> bool:
+    return sensitive_path_rule(file_path) is not None
 
 
 def has_secret_like_content(text: str) -> bool:
-    if not text or not text.strip():
-        return False
-    return any(re.search(p, text, re.IGNORECASE) for p in SECRET_CONTENT_PATTERNS)
+    return secret_content_rule(text) is not None
 
 
-def main() -> int:
+def evaluate(raw: str, ctx: dict | None = None) -> tuple[dict, int]:
+    """Decide on one hook payload. Returns (output JSON object, exit code).
+
+    ctx, if given, receives "subject" for the audit log (never content).
+    """
+    ctx = {} if ctx is None else ctx
+    # Early exit for large payloads: every path key is ordinary, so the content is never decoded.
+    candidates = payload_reader.path_candidates(raw) if len(raw) >= payload_reader.MIN_CHARS else None
+    if candidates is not None and not any(sensitive_path_rule(p) for p in candidates):
+        paths = [p for p in candidates if p]
+        if paths:
+            ctx["subject"] = audit.path_fingerprint(paths[0])
+        return {"decision": "allow"}, 0
+
     try:
-        payload = json.load(sys.stdin)
+        payload = json.loads(raw)
     except json.JSONDecodeError:
-        print(json.dumps({"decision": "allow"}))
-        return 0
+        return {"decision": "allow"}, 0
 
     tool_input = payload.get("tool_input") or {}
     if isinstance(tool_input, str):
         try:
             tool_input = json.loads(tool_input)
         except json.JSONDecodeError:
-            print(json.dumps({"decision": "allow"}))
-            return 0
+            return {"decision": "allow"}, 0
 
-    file_path = tool_input.get("path") or tool_input.get("file_path") or ""
-    edits = tool_input.get("edits") or tool_input.get("new_string") or []
-    if isinstance(edits, str):
-        content_to_check = edits
-    elif isinstance(edits, list):
-        content_to_check = " ".join(
-            (e.get("new_string") or "") for e in edits if isinstance(e, dict)
-        )
-    else:
-        content_to_check = ""
+    if not isinstance(tool_input, dict):
+        return {"decision": "allow"}, 0
 
+    file_path = tool_input.get("path") or tool_input.get("file_path") or ""
     if not file_path:
-        print(json.dumps({"decision": "allow"}))
-        return 0
-
-    if not is_sensitive_path(file_path):
-        print(json.dumps({"decision": "allow"}))
-        return 0
-
-    if not has_secret_like_content(content_to_check):
-        print(json.dumps({"decision": "allow"}))
-        return 0
+        return {"decision": "allow"}, 0
+    ctx["subject"] = audit.path_fingerprint(file_path)
+
+    path_rule = sensitive_path_rule(file_path)
+    if path_rule is None:
+        return {"decision": "allow"}, 0
+
+    # Edits and whole-file content are scanned one by one in bounded windows.
+    result = scan.scan(scan.iter_texts(tool_input), secret_content_rule)
+    if result.rule is None:
+        if not result.truncated or scan.oversize_policy() == "allow":
+            return {"decision": "allow"}, 0
+        reason = (
+            f"Content for sensitive path (rule '{path_rule}') is larger than the "
+            f"{result.scanned}-character scan limit and was not fully checked for secrets. "
+            "Confirm you want to write it, or raise CURSOR_GUARD_SCAN_MAX_BYTES."
+        )
+        return {"decision": "deny", "reason": reason}, 2
 
     reason = (
         "Writing secrets to a file requires explicit user authorization. "
-        "Confirm you want to persist this sensitive data, then retry."
+        "Confirm you want to persist this sensitive data, then retry. "
+        f"(matched path rule '{path_rule}', content rule '{result.rule}')"
     )
-    print(json.dumps({"decision": "deny", "reason": reason}))
-    return 2
+    return {"decision": "deny", "reason": reason}, 2
+
+
+def main() -> int:
+    return registry.main("secret-write", sys.modules[__name__])
 
 
 if __name__ == "__main__":
     try:
         sys.exit(main())
     except Exception:
-        print(json.dumps({"decision": "allow"}))
-        sys.exit(0)
+        out, code = registry.fallback("secret-write", "error")
+        print(out)
+        sys.exit(code)
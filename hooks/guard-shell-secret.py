@@ -2,11 +2,14 @@
 """
 Cursor beforeShellExecution hook: require authorization for commands that write to .env.
 
-Reads JSON from stdin (command). If the command appears to write to .env or similar
-sensitive files, returns permission: ask. Otherwise returns permission: allow.
+Reads JSON from stdin (command). The command is parsed (guardlib/shellparse.py) and
+returns permission: ask only when a write target (redirect, tee, sed -i, cp/mv
+destination, ...) is a sensitive path per guard-secret-write's path rules, or cannot
+be resolved ($VAR). Reads such as `cat .env.example` or `grep FOO .env` are allowed.
 
 Output: {"permission": "allow"} or {"permission": "ask", "user_message": "...", "agent_message": "..."}
-Exit: 0.
+Exit: 0 (2 for a deny fallback). On error or past its time budget, the fallback
+decision from guardlib/runtime.py applies (default: ask).
 """
 
 from __future__ import annotations
@@ -14,40 +17,70 @@ from __future__ import annotations
 import json
 import sys
 
+from guardlib import audit, registry, shellparse
 
-def main() -> int:
+
+def evaluate(raw: str, ctx: dict | None = None) -> tuple[dict, int]:
+    """Decide on one hook payload. Returns (output JSON object, exit code).
+
+    ctx, if given, receives "subject" for the audit log (never content).
+    """
+    ctx = {} if ctx is None else ctx
     try:
-        payload = json.load(sys.stdin)
+        payload = json.loads(raw)
     except json.JSONDecodeError:
-        print(json.dumps({"permission": "allow"}))
-        return 0
+        return {"permission": "allow"}, 0
 
     command = payload.get("command") or ""
     if not command:
-        print(json.dumps({"permission": "allow"}))
-        return 0
+        return {"permission": "allow"}, 0
+    program = (command.split(None, 1) or [""])[0]
+    # A leading VAR=value could carry a secret; label it generically.
+    ctx["subject"] = audit.fingerprint(command, "assign" if "=" in program else program[:32])
+
+    try:
+        targets = shellparse.write_targets(command)
+    except shellparse.ParseError:
+        targets = None
 
-    # Already matched by hooks.json matcher; if we're called, treat as ask
-    user_message = "This command may write secrets to a file. Confirm you want to run it."
+    if targets is None:
+        detail = "could not be parsed"
+    elif not targets:
+        return {"permission": "allow"}, 0
+    else:
+        path_rule = registry.load_hook("secret-write").sensitive_path_rule
+        flagged = []
+        for target in targets:
+            if "$" in target or "`" in target:
+                flagged.append(f"'{target}' (unresolved)")
+            else:
+                rule = path_rule(target)
+                if rule:
+                    flagged.append(f"'{target}' (rule '{rule}')")
+        if not flagged:
+            return {"permission": "allow"}, 0
+        detail = "writes to " + ", ".join(flagged)
+
+    user_message = f"This command {detail} and may write secrets to a file. Confirm you want to run it."
     agent_message = (
-        "The command was flagged because it may persist secrets (e.g. to .env). "
+        f"The command was flagged because it {detail}, which may persist secrets (e.g. to .env). "
         "User authorization is required. Ask the user to confirm, then re-run if approved."
     )
-    print(
-        json.dumps(
-            {
-                "permission": "ask",
-                "user_message": user_message,
-                "agent_message": agent_message,
-            }
-        )
-    )
-    return 0
+    return {
+        "permission": "ask",
+        "user_message": user_message,
+        "agent_message": agent_message,
+    }, 0
+
+
+def main() -> int:
+    return registry.main("shell-secret", sys.modules[__name__])
 
 
 if __name__ == "__main__":
     try:
         sys.exit(main())
     except Exception:
-        print(json.dumps({"permission": "allow"}))
-        sys.exit(0)
+        out, code = registry.fallback("shell-secret", "error")
+        print(out)
+        sys.exit(code)
@@ -0,0 +1 @@
+"""Shared support code for the Cursor guard hooks (hook server, client shim)."""
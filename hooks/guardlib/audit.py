@@ -0,0 +1,298 @@
+"""
+Append-only decision audit log shared by all guard hooks.
+
+One JSON object per line: ts, hook, subject (tool name or a path/command fingerprint,
+never content), decision, us (evaluation time). Records are buffered and written with
+a single os.write on an O_APPEND descriptor, so concurrent hook processes need no lock:
+each flush lands as one contiguous append. One-shot hooks flush at exit; the hook
+server flushes every FLUSH_RECORDS records or FLUSH_SECONDS seconds.
+
+When the log grows past CURSOR_HOOK_AUDIT_MAX_BYTES it is renamed to a unique
+"<log>.<ns>" file (a rename race cannot overwrite another writer's rotation) and only
+the newest KEEP_ROTATED files are kept.
+
+Evaluation times also go to a persistent latency histogram, latency.bin next to the
+log, which keeps the whole history where the log keeps a window. Each evaluation is
+one 2-byte entry: hook id and outcome (ok, timeout, error), then a log-scale time
+bucket. Buckets split every power of two of microseconds into 4, so a percentile
+read from them is within 25% of the true value, from 1 us to over an hour. Entries
+are buffered and appended with the audit records. Past COMPACT_BYTES the writer
+that notices renames latency.bin to a unique file, counts its entries, deletes it
+and appends the counts to latency.totals as one marshal record; a crash in between
+loses that file's entries but never counts them twice. The histogram is the sum of
+the totals records plus the live file.
+
+Settings (environment):
+  CURSOR_HOOK_AUDIT            "0" disables the log
+  CURSOR_HOOK_AUDIT_LOG        log path (default $XDG_STATE_HOME/cursor-hooks/audit.log)
+  CURSOR_HOOK_AUDIT_MAX_BYTES  rotation size (default 5 MiB)
+  CURSOR_HOOK_LATENCY          "0" disables the histogram
+  CURSOR_HOOK_LATENCY_LOG      histogram path (default latency.bin next to the log)
+"""
+
+from __future__ import annotations
+
+import atexit
+import hashlib
+import json
+import marshal
+import os
+import time
+from collections.abc import Iterator
+
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+KEEP_ROTATED = 5
+FLUSH_RECORDS = 64
+FLUSH_SECONDS = 1.0
+# Histogram entries store these ids: never renumber, only add.
+HOOK_IDS = {"mcp-write": 1, "secret-write": 2, "shell-secret": 3}
+OUTCOMES = ("ok", "timeout", "error")
+SUB_BUCKETS = 4
+BUCKETS = 128
+COMPACT_BYTES = 256 * 1024
+
+_buffer: list[str] = []
+_latency = bytearray()
+_last_flush = time.monotonic()
+_atexit_registered = False
+
+
+def enabled() -> bool:
+    return os.environ.get("CURSOR_HOOK_AUDIT", "1") != "0"
+
+
+def log_path() -> str:
+    override = os.environ.get("CURSOR_HOOK_AUDIT_LOG")
+    if override:
+        return override
+    base = os.environ.get("XDG_STATE_HOME") or os.path.join(os.path.expanduser("~"), ".local", "state")
+    return os.path.join(base, "cursor-hooks", "audit.log")
+
+
+def latency_enabled() -> bool:
+    return os.environ.get("CURSOR_HOOK_LATENCY", "1") != "0"
+
+
+def latency_path() -> str:
+    return os.environ.get("CURSOR_HOOK_LATENCY_LOG") or os.path.join(os.path.dirname(log_path()), "latency.bin")
+
+
+def max_bytes() -> int:
+    try:
+        return int(os.environ.get("CURSOR_HOOK_AUDIT_MAX_BYTES", DEFAULT_MAX_BYTES))
+    except ValueError:
+        return DEFAULT_MAX_BYTES
+
+
+def fingerprint(value: str, label: str = "") -> str:
+    """Stable, non-reversible identifier: "<label>#<short hash>"."""
+    digest = hashlib.sha1(value.encode("utf-8", errors="replace")).hexdigest()[:10]
+    return f"{label}#{digest}"
+
+
+def path_fingerprint(path: str) -> str:
+    """Fingerprint of a file path, labelled with its suffix (or name for dotfiles like .env)."""
+    name = path.replace("\\", "/").rsplit("/", 1)[-1]
+    label = name if name.startswith(".") else (os.path.splitext(name)[1] or name)
+    return fingerprint(path, label[:32])
+
+
+def record(hook: str, subject: str | None, decision: str, elapsed_us: float, outcome: str = "ok") -> None:
+    """Queue one audit record and histogram entry; flushes when the buffer is large or old enough.
+
+    outcome is "ok", or "timeout"/"error" for a fallback decision.
+    """
+    global _atexit_registered
+    if latency_enabled():
+        # One in-place add: server threads never see half an entry.
+        _latency.extend((HOOK_IDS.get(hook, 0) * 4 + OUTCOMES.index(outcome), bucket(elapsed_us)))
+    if enabled():
+        _buffer.append(
+            json.dumps(
+                {
+                    "ts": round(time.time(), 3),
+                    "hook": hook,
+                    "subject": subject or "",
+                    "decision": decision,
+                    "us": round(elapsed_us, 1),
+                },
+                separators=(",", ":"),
+            )
+        )
+    elif not _latency:
+        return
+    if not _atexit_registered:
+        atexit.register(flush)
+        _atexit_registered = True
+    if len(_buffer) >= FLUSH_RECORDS:
+        flush()
+    else:
+        flush_if_due()
+
+
+def flush_if_due() -> None:
+    """Flush when buffered records are older than FLUSH_SECONDS (called from server loops)."""
+    if (_buffer or _latency) and time.monotonic() - _last_flush >= FLUSH_SECONDS:
+        flush()
+
+
+def flush() -> None:
+    """Write buffered records and histogram entries, one append each; never raises."""
+    global _last_flush
+    _last_flush = time.monotonic()
+    if _latency:
+        entries = bytes(_latency)
+        del _latency[: len(entries)]
+        path = latency_path()
+        if _append(path, entries) > COMPACT_BYTES:
+            _compact(path)
+    if not _buffer:
+        return
+    lines = _buffer[:]
+    del _buffer[: len(lines)]
+    path = log_path()
+    if _append(path, ("\n".join(lines) + "\n").encode("utf-8")) > max_bytes():
+        _rotate(path)
+
+
+def _append(path: str, data: bytes) -> int:
+    """Append data with one write; the file's new size, or 0 on error."""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        try:
+            os.write(fd, data)
+            return os.fstat(fd).st_size
+        finally:
+            os.close(fd)
+    except OSError:
+        return 0  # auditing must never break a hook
+
+
+def _rotate(path: str) -> None:
+    try:
+        os.rename(path, f"{path}.{time.time_ns()}")
+    except OSError:
+        return  # another writer rotated first
+    for old in rotated_files(path)[:-KEEP_ROTATED]:
+        try:
+            os.unlink(old)
+        except OSError:
+            pass
+
+
+def rotated_files(path: str) -> list[str]:
+    """Rotated logs for path, oldest first."""
+    directory, name = os.path.split(path)
+    prefix = name + "."
+    found = []
+    try:
+        for entry in os.scandir(directory or "."):
+            suffix = entry.name[len(prefix):]
+            if entry.name.startswith(prefix) and suffix.isdigit():
+                found.append((int(suffix), entry.path))
+    except OSError:
+        return []
+    return [p for _, p in sorted(found)]
+
+
+def iter_records(path: str | None = None) -> Iterator[dict]:
+    """Stream records from rotated logs (oldest first) and the live log, one line at a time."""
+    path = path or log_path()
+    for file in [*rotated_files(path), path]:
+        try:
+            with open(file, "r", encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # partial line from a crashed writer
+        except OSError:
+            continue
+
+
+def bucket(us: float) -> int:
+    """Histogram bucket of a time in microseconds: below 4 exactly, then 4 per power of two."""
+    v = int(us)
+    if v < SUB_BUCKETS:
+        return max(v, 0)
+    exp = v.bit_length() - 1
+    return min((exp - 1) * SUB_BUCKETS + ((v >> (exp - 2)) & (SUB_BUCKETS - 1)), BUCKETS - 1)
+
+
+def bucket_floor(i: int) -> int:
+    """Smallest time (us) in bucket i; bucket_floor(i + 1) is its exclusive upper bound."""
+    if i < SUB_BUCKETS:
+        return i
+    exp, sub = divmod(i, SUB_BUCKETS)
+    return (SUB_BUCKETS + sub) << (exp - 1)
+
+
+def _count(data: bytes, counts: dict | None = None) -> dict[tuple[int, int], int]:
+    """(id/outcome byte, bucket) -> entries, for a run of 2-byte entries."""
+    counts = {} if counts is None else counts
+    for key in zip(data[0::2], data[1::2]):
+        counts[key] = counts.get(key, 0) + 1
+    return counts
+
+
+def _totals_path(path: str) -> str:
+    return os.path.splitext(path)[0] + ".totals"
+
+
+def _compact(path: str) -> None:
+    piece = f"{path}.{time.time_ns()}"
+    try:
+        os.rename(path, piece)
+    except OSError:
+        return  # another writer compacts it
+    try:
+        with open(piece, "rb") as f:
+            data = f.read()
+        os.unlink(piece)
+    except OSError:
+        return
+    _append(_totals_path(path), marshal.dumps(_count(data)))
+
+
+def latency_histogram(path: str | None = None) -> dict[tuple[str, str], list[int]]:
+    """Counts per bucket for each (hook, outcome) with entries: totals plus the live file."""
+    path = path or latency_path()
+    counts: dict[tuple[int, int], int] = {}
+    try:
+        with open(_totals_path(path), "rb") as f:
+            while True:
+                try:
+                    folded = marshal.load(f)
+                except (EOFError, ValueError, TypeError):
+                    break  # end of file, or a record cut short by a crash
+                for key, n in folded.items():
+                    counts[key] = counts.get(key, 0) + n
+    except OSError:
+        pass
+    try:
+        with open(path, "rb") as f:
+            _count(f.read(), counts)
+    except OSError:
+        pass
+    names = {i: name for name, i in HOOK_IDS.items()}
+    result: dict[tuple[str, str], list[int]] = {}
+    for (kind, i), n in counts.items():
+        hook = names.get(kind // 4, "other")
+        outcome = OUTCOMES[kind % 4] if kind % 4 < len(OUTCOMES) else "other"
+        result.setdefault((hook, outcome), [0] * BUCKETS)[min(i, BUCKETS - 1)] += n
+    return result
+
+
+def percentile(counts: list[int], q: float) -> int:
+    """Upper bound (us) of the bucket holding the q-th percentile (0-100) of counts."""
+    total = sum(counts)
+    if not total:
+        return 0
+    rank = max(1, -(-total * q // 100))
+    seen = 0
+    for i, n in enumerate(counts):
+        seen += n
+        if seen >= rank:
+            return bucket_floor(i + 1)
+    return bucket_floor(BUCKETS)
@@ -0,0 +1,368 @@
+"""
+Secret detectors for file content: provider token formats and high-entropy strings.
+
+Both kinds of detector share one walk over the text, in position order:
+
+- Token formats are provider tokens with a fixed literal prefix, such as ghp_,
+  AKIA, "-----BEGIN ... PRIVATE KEY-----", glsa_ or eyJ. The prefixes of all
+  formats are merged into a trie and written out as one regex. At each position
+  the trie reads one character per level, whatever the number of formats. Each
+  leaf of the trie confirms its hit with the owning formats' own patterns
+  (a lookahead at the prefix start), so a near miss costs no Python step. A
+  token that starts with a letter or digit must start a word: the character
+  before it is not a letter, digit, "_" or "-".
+- Entropy checks look at runs of at least min_length token characters
+  ([A-Za-z0-9+/_-], plus trailing "=" padding). A run is split into windows of
+  `window` characters, moving half a window at a time. The Shannon entropy of
+  each window is compared with the threshold for its alphabet: hex, or base64
+  with digits and both cases. Windows shorter than `window` get a
+  proportionally lower threshold. "=" ends a run, so KEY=value is judged by
+  its value.
+
+Runs are found with str.find on a copy of the text in which every character is
+mapped to its class (str.translate). The prefix trie and the run search are
+separate C-speed scans: merged into one regex alternation, re loses its
+first-character skip and is about four times slower. Format patterns use
+bounded repeats of single character classes. Most read on over letters,
+digits, "_" and "-", after which no token starts, so a stretch of text is read
+by a few attempts of a format, not one per prefix in it. The time is linear in
+the text length, with no backtracking that grows with the input. Runs longer
+than max_length are encoded data (images, bundles), not credentials, and are
+only checked for token formats.
+
+A finding is dropped if its text matches an allow pattern, if its line holds
+ALLOW_MARKER ("pragma: allowlist secret"), or if it is inside a PEM block that
+is not a private key (certificates, public keys). A run that contains a token format,
+allowed or not, is judged by that format alone.
+
+findings() can be limited to the window text[start:stop] of a longer text
+(guardlib/scan.py). Only findings starting in the window are reported, but the
+whole text is context. Allow markers and PEM headers are looked up before the
+window. A run that reaches stop is followed past it. A run already under way at
+start was judged by entropy in the window before, so only its token formats are
+checked here; so is the rest of a run after a token. The first finding of the
+windows is therefore that of the whole text, which is all guardlib/scan.py needs.
+
+Built-in formats and allow patterns come from the guard script. Settings are read
+from the "detect" object in guard-rules.json (see guardlib/rulepack.py):
+
+  {
+    "detect": {
+      "tokens": [{"name": "acme-key", "pattern": "acme_[A-Za-z0-9]{32}"}],
+      "allow": ["^AKIA[A-Z0-9]{12}TEST"],
+      "disable": ["jwt"],
+      "entropy": {"enabled": true, "window": 32, "min_length": 20, "max_length": 1024,
+                  "base64": 4.2, "hex": 3.0}
+    }
+  }
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import sys
+from collections import Counter
+from collections.abc import Callable
+from math import log2
+
+from guardlib.rulepack import config_path, literal_prefix, sre_parse, trie_pattern
+
+Format = tuple[str, str]  # (name, pattern)
+Finding = tuple[str, int, int]  # (detector name, start, end)
+
+ENTROPY_NAME = "high-entropy-string"
+ALLOW_MARKER = "pragma: allowlist secret"
+ENTROPY_DEFAULTS = {"enabled": True, "window": 32, "min_length": 20, "max_length": 1024, "base64": 4.2, "hex": 3.0}
+# Shorter prefixes would confirm at too many positions in ordinary text.
+MIN_PREFIX = 3
+RUN_CHARS = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/_-")
+# str.translate table: run characters -> "a", other ASCII -> " " (other characters stay, also not "a").
+_CLASSES = {i: "a" if chr(i) in RUN_CHARS else " " for i in range(128)}
+_HEX = frozenset("0123456789abcdefABCDEF")
+_DIGITS = frozenset("0123456789")
+_UPPER = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+_LOWER = frozenset("abcdefghijklmnopqrstuvwxyz")
+_MARKER_REACH = 256
+_PEM_REACH = 16 * 1024
+
+
+def shannon_entropy(text: str) -> float:
+    """Bits per character of text."""
+    n = len(text)
+    if not n:
+        return 0.0
+    return log2(n) - sum(c * log2(c) for c in Counter(text).values()) / n
+
+
+def read_config(path: str) -> dict:
+    """The "detect" object of the user rule file ({} if absent or invalid)."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"guard rules: ignoring {path}: {e}", file=sys.stderr)
+        return {}
+    section = data.get("detect") if isinstance(data, dict) else None
+    return section if isinstance(section, dict) else {}
+
+
+def entropy_settings(data: object) -> dict:
+    """ENTROPY_DEFAULTS overridden by the valid values in data."""
+    settings = dict(ENTROPY_DEFAULTS)
+    if not isinstance(data, dict):
+        return settings
+    for key, value in data.items():
+        default = ENTROPY_DEFAULTS.get(key)
+        if default is None:
+            continue
+        if isinstance(default, bool):
+            valid = isinstance(value, bool)
+        else:
+            valid = isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0
+        if valid:
+            settings[key] = type(default)(value)
+        else:
+            print(f"guard rules: ignoring detect.entropy.{key}: {value!r}", file=sys.stderr)
+    settings["window"] = max(settings["window"], 8)
+    return settings
+
+
+class Scanner:
+    """Compiled detectors; findings() yields every secret found in a text."""
+
+    def __init__(self, formats: list[Format], allow: list[str], entropy: dict) -> None:
+        self.entropy = entropy
+        self._names: list[str] = []
+        self._reach = 0
+        # Prefix -> confirming regexes of its formats, as named groups t<index into _names>.
+        confirm: dict[str, list[str]] = {}
+        for name, pattern in formats:
+            prefix = literal_prefix(pattern, ignorecase=False)
+            if len(prefix) < MIN_PREFIX:
+                print(f"guard rules: skipping token format {name!r}: needs a literal prefix of {MIN_PREFIX}+ characters", file=sys.stderr)
+                continue
+            try:
+                re.compile(pattern)
+            except re.error as e:
+                print(f"guard rules: skipping token format {name!r}: {e}", file=sys.stderr)
+                continue
+            # The longest token, plus the character after it, bounds how far a search reads past a window.
+            self._reach = max(self._reach, min(sre_parse.parse(pattern).getwidth()[1] + 1, _PEM_REACH))
+            confirm.setdefault(prefix, []).append(f"(?P<t{len(self._names)}>{pattern})(?![A-Za-z0-9])")
+            self._names.append(name)
+        # After the prefix's k characters, a lookbehind steps back to where it starts and
+        # a lookahead there matches the formats, so a prefix that does not confirm fails
+        # inside the regex engine. Prefixes that start with a letter or digit must also
+        # start a word, checked first: a format reads on over letters, digits, "_" and
+        # "-", and none may start again inside the stretch it has just read.
+        leaves = {}
+        for prefix, groups in confirm.items():
+            k = len(prefix)
+            leaf = f"(?<=(?={'|'.join(groups)})[\\s\\S]{{{k}}})"
+            if prefix[0].isalnum():
+                leaf = f"(?<![\\w-][\\s\\S]{{{k}}})" + leaf
+            leaves[prefix] = leaf
+        trie = trie_pattern(list(confirm), leaves)
+        self._tokens = re.compile(trie) if trie else None
+        self._run_needle = "a" * entropy["min_length"]
+        self._run_end = re.compile("[^a]")
+
+        valid = []
+        for pattern in allow:
+            try:
+                re.compile(pattern)
+                valid.append(f"(?:{pattern})")
+            except re.error as e:
+                print(f"guard rules: skipping allow pattern {pattern!r}: {e}", file=sys.stderr)
+        self._allow = re.compile("|".join(valid)) if valid else None
+
+    def allowed(self, text: str, start: int, end: int) -> bool:
+        """True if text[start:end] is listed, on a marked line, or inside a public PEM block."""
+        if self._allow is not None and self._allow.search(text, start, end):
+            return True
+        line_start = text.rfind("\n", max(0, start - _MARKER_REACH), start) + 1 or max(0, start - _MARKER_REACH)
+        line_end = text.find("\n", end, end + _MARKER_REACH)
+        if line_end == -1:
+            line_end = end + _MARKER_REACH
+        if ALLOW_MARKER in text[line_start:line_end]:
+            return True
+        # Certificates and public keys are base64 as random as a secret.
+        begin = text.rfind("-----BEGIN ", max(0, start - _PEM_REACH), start)
+        if begin == -1:
+            return False
+        label_end = text.find("-----", begin + 11, begin + 80)
+        return label_end != -1 and "PRIVATE" not in text[begin + 11:label_end] and text.find("-----END ", begin, start) == -1
+
+    def _token(self, text: str, m: re.Match[str]) -> Finding | None:
+        """Finding for a token match of _tokens, or None if it is allowed."""
+        group = m.lastgroup or ""
+        end = m.end(group)
+        if self.allowed(text, m.start(), end):
+            return None
+        return self._names[int(group[1:])], m.start(), end
+
+    def _high_entropy(self, text: str, start: int, end: int) -> bool:
+        window = self.entropy["window"]
+        last = max(start, end - window)
+        for offset in list(range(start, last, window // 2)) + [last]:
+            part = text[offset:offset + window]
+            counts = Counter(part)
+            chars = counts.keys()
+            if chars <= _HEX:
+                threshold = self.entropy["hex"]
+                mixed = not chars.isdisjoint(_DIGITS) and not chars <= _DIGITS
+            else:
+                threshold = self.entropy["base64"]
+                mixed = not (chars.isdisjoint(_DIGITS) or chars.isdisjoint(_UPPER) or chars.isdisjoint(_LOWER))
+            if not mixed:
+                continue
+            n = len(part)
+            if n < window:
+                threshold *= log2(n) / log2(window)
+            if log2(n) - sum(c * log2(c) for c in counts.values()) / n >= threshold:
+                return True
+        return False
+
+    def _in_run(
+        self, text: str, start: int, end: int, entropy: bool, token: re.Match[str] | None, next_token: Callable[[int, int], re.Match[str] | None]
+    ) -> tuple[Finding | None, re.Match[str] | None]:
+        """Finding in the run text[start:end], and the next token match not yet looked at.
+
+        token is the first token match at or after start. Tokens starting in the run
+        decide it, allowed or not; only a run without one is checked for entropy.
+        """
+        matched = False
+        while token is not None and token.start() < end:
+            matched = True
+            finding = self._token(text, token)
+            if finding is not None:
+                return finding, token
+            token = next_token(token.start() + 1, end)
+        if matched or not entropy or not self.entropy["enabled"] or end - start > self.entropy["max_length"]:
+            return None, token
+        if self._high_entropy(text, start, end) and not self.allowed(text, start, end):
+            return (ENTROPY_NAME, start, end), token
+        return None, token
+
+    def findings(self, text: str, start: int = 0, stop: int | None = None):
+        """Yield (name, start, end) for each secret starting in text[start:stop], left to right.
+
+        Tokens come from the trie regex, confirmed as it matches; runs from a copy
+        of the range with every character mapped to its class, searched with
+        str.find. Both are C-speed scans, merged here in position order. Context
+        outside the range still counts: a token or a run that starts before stop
+        is followed to its end, and a run already under way at start belongs to
+        the window before.
+        """
+        n = len(text)
+        stop = n if stop is None else min(stop, n)
+        needle = self._run_needle
+        # A run that starts just before stop is only recognised min_length characters on.
+        edge = min(n, stop + len(needle) - 1)
+        classes = text.translate(_CLASSES) if not start and edge == n else text[start:edge].translate(_CLASSES)
+        max_length = self.entropy["max_length"]
+        search = self._tokens.search if self._tokens is not None else None
+
+        def next_token(pos: int, before: int = stop) -> re.Match[str] | None:
+            # The first token at pos or after that starts before stop, or before the end of
+            # a run that goes on past it. A token reads at most _reach characters.
+            before = max(before, stop)
+            m = search(text, pos, min(n, before + self._reach)) if search is not None else None
+            return m if m is not None and m.start() < before else None
+
+        def run_at(pos: int) -> int:
+            found = classes.find(needle, pos - start)
+            return -1 if found == -1 or found + start >= stop else found + start
+
+        run_start = run_at(start)
+        # The tail of a run that started before the window was judged by entropy
+        # there; here it is only checked for token formats.
+        continued = start if start and text[start - 1] in RUN_CHARS else -1
+        token = next_token(start)
+        while token is not None or run_start != -1:
+            hit = token.start() if token is not None else n
+            if run_start != -1 and run_start <= hit:
+                m = self._run_end.search(classes, run_start - start + len(needle))
+                if m is not None:
+                    end = m.start() + start
+                elif edge == n:
+                    end = n
+                else:
+                    # The run goes on past the window: max_length + 1 characters are enough to judge it.
+                    tail = text[edge:run_start + max_length + 1].translate(_CLASSES)
+                    m = self._run_end.search(tail)
+                    end = edge + (m.start() if m else len(tail))
+                while end < n and text[end] == "=" and end - run_start < max_length:
+                    end += 1  # base64 padding
+                if token is None and end > stop:
+                    token = next_token(stop, end)  # a token past stop still decides the run
+                finding, token = self._in_run(text, run_start, end, run_start != continued, token, next_token)
+                if finding is not None and finding[1] >= stop:
+                    finding = None  # the next window reports it
+                if token is not None and token.start() >= stop:
+                    token = None
+                resume = max(end, finding[2]) if finding is not None else end
+            else:
+                finding = self._token(text, token)  # type: ignore[arg-type]
+                resume = finding[2] if finding is not None else hit + 1
+            if finding is not None:
+                yield finding
+            if resume >= stop:
+                return
+            if finding is not None and text[resume - 1] in RUN_CHARS:
+                continued = resume  # the rest of a run that held a token
+            if token is not None and token.start() < resume:
+                token = next_token(resume)
+            if run_start != -1 and run_start < resume:
+                run_start = run_at(resume)
+
+
+class Detector:
+    """Lazily built Scanner; rebuilt when the user config file changes (cheap stat per call)."""
+
+    def __init__(self, formats: tuple[Format, ...], allow: tuple[str, ...] = ()) -> None:
+        self.formats = formats
+        self.allow = allow
+        self._stamp: tuple | None = None
+        self._scanner: Scanner | None = None
+
+    def _current(self) -> Scanner:
+        path = config_path()
+        try:
+            st = os.stat(path)
+            stamp = (path, st.st_mtime_ns, st.st_size)
+        except OSError:
+            stamp = (path, 0, -1)
+        if self._scanner is None or stamp != self._stamp:
+            self._scanner = self.build(read_config(path))
+            self._stamp = stamp
+        return self._scanner
+
+    def build(self, config: dict) -> Scanner:
+        """Scanner for the built-in formats and allow patterns plus a "detect" config object."""
+        formats = list(self.formats)
+        for i, item in enumerate(config.get("tokens") or ()):
+            if isinstance(item, str):
+                formats.append((f"token-custom-{i}", item))
+            elif isinstance(item, dict) and isinstance(item.get("pattern"), str):
+                formats.append((str(item.get("name") or f"token-custom-{i}"), item["pattern"]))
+        disabled = {d for d in config.get("disable") or () if isinstance(d, str)}
+        formats = [(name, pattern) for name, pattern in formats if name not in disabled]
+        allow = list(self.allow) + [p for p in config.get("allow") or () if isinstance(p, str)]
+        entropy = entropy_settings(config.get("entropy"))
+        if ENTROPY_NAME in disabled:
+            entropy["enabled"] = False
+        return Scanner(formats, allow, entropy)
+
+    def findings(self, text: str, start: int = 0, stop: int | None = None) -> list[Finding]:
+        return list(self._current().findings(text, start, stop))
+
+    def search(self, text: str, start: int = 0, stop: int | None = None) -> str | None:
+        """Name of the first detector that finds a secret starting in text[start:stop], else None."""
+        for name, _, _ in self._current().findings(text, start, stop):
+            return name
+        return None
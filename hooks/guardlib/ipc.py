@@ -0,0 +1,83 @@
+"""
+Wire protocol between hook-client.py and hook-server.py over a Unix socket.
+
+Request:  "<hook name>\n" + raw hook payload, then the client shuts down writing.
+Response: "<exit code>\n" + hook stdout line.
+
+Uses the low-level _socket module: the high-level socket module pulls in enum and
+selectors, which roughly doubles the client's startup time.
+
+The client only trusts a server running as the same user. Without XDG_RUNTIME_DIR
+the socket lives in a shared directory such as /tmp, where another user could
+create it first and answer "allow" to every decision. So the socket file must be
+owned by this user, and where the platform reports it (SO_PEERCRED), so must the
+process that accepted the connection. Otherwise request raises PermissionError and
+the client evaluates in-process.
+"""
+
+from __future__ import annotations
+
+import _socket
+import os
+import sys
+
+SOCKET_ENV = "CURSOR_HOOK_SOCKET"
+CLIENT_TIMEOUT = 2.0
+
+
+def socket_path() -> str:
+    """Default socket path; override with CURSOR_HOOK_SOCKET."""
+    path = os.environ.get(SOCKET_ENV)
+    if path:
+        return path
+    base = os.environ.get("XDG_RUNTIME_DIR") or os.environ.get("TMPDIR") or "/tmp"
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    return os.path.join(base, f"cursor-hooks-{uid}.sock")
+
+
+def check_owner(path: str) -> None:
+    """Raise PermissionError unless the socket file at path belongs to this user."""
+    if hasattr(os, "getuid") and os.lstat(path).st_uid != os.getuid():
+        raise PermissionError(f"{path} belongs to another user")
+
+
+def check_peer(sock: _socket.socket) -> None:
+    """Raise PermissionError if the server process runs as another user (Linux only)."""
+    if not hasattr(_socket, "SO_PEERCRED"):
+        return
+    # struct ucred {pid_t pid; uid_t uid; gid_t gid;}, read without importing struct.
+    creds = sock.getsockopt(_socket.SOL_SOCKET, _socket.SO_PEERCRED, 12)
+    if int.from_bytes(creds[4:8], sys.byteorder) != os.getuid():
+        raise PermissionError("hook server runs as another user")
+
+
+def recv_all(sock: _socket.socket) -> bytes:
+    chunks = []
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            return b"".join(chunks)
+        chunks.append(chunk)
+
+
+def request(hook: str, raw: bytes, path: str | None = None, timeout: float = CLIENT_TIMEOUT) -> tuple[str, int]:
+    """Send one payload to the hook server. Raises OSError if it is unreachable.
+
+    Raises TimeoutError (an OSError) if the server accepts but does not answer within timeout.
+    """
+    path = path or socket_path()
+    check_owner(path)
+    sock = _socket.socket(_socket.AF_UNIX, _socket.SOCK_STREAM)
+    try:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        check_peer(sock)
+        sock.sendall(hook.encode("utf-8") + b"\n" + raw)
+        sock.shutdown(_socket.SHUT_WR)
+        response = recv_all(sock)
+    finally:
+        sock.close()
+    head, sep, body = response.partition(b"\n")
+    if not sep:
+        raise ConnectionError("Truncated response from hook server.")
+    return body.decode("utf-8"), int(head)
@@ -0,0 +1,346 @@
+"""
+MCP write policy: (server, tool) -> "allow" | "ask" | "deny", compiled from mcp.json.
+
+The table is built from the servers declared in mcp.json (next to hooks.json;
+override: CURSOR_MCP_CONFIG), the built-in TOOL_CATALOG of known read/write tools per
+server kind, and the user override file mcp-policy.json (override: CURSOR_MCP_POLICY):
+
+  {
+    "github": {"get_me": "allow", "create_issue": "ask"},
+    "*":      {"run_workflow": "deny"}
+  }
+
+An override beats the catalog, and a server's own override beats "*".
+
+Lookups are dict hits. Tools missing from the table are classified once by the
+caller's fallback heuristic, and the decision is remembered. The table lives in a
+marshal file under $XDG_CACHE_HOME/cursor-hooks; remembered decisions are appended
+to a log next to it, one marshal record each, so a new tool costs one small append
+rather than a rewrite of the table. Both are invalidated when mcp.json, the
+override file, the catalog or the caller's heuristic (passed to get_policy as a
+digest) changes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import marshal
+import os
+import sys
+from collections.abc import Callable
+
+from guardlib.registry import HOOKS_DIR
+
+CACHE_VERSION = 3
+DECISIONS = ("allow", "ask", "deny")
+ANY_SERVER = "*"
+
+# Known tools per server kind (docker image "mcp/<kind>", or the server name).
+TOOL_CATALOG: dict[str, dict[str, tuple[str, ...]]] = {
+    "neo4j-memory": {
+        "read": ("read_graph", "search_memories", "find_memories_by_name"),
+        "write": (
+            "create_entities", "delete_entities", "create_relations", "delete_relations",
+            "add_observations", "delete_observations",
+        ),
+    },
+    "github": {
+        "read": (
+            "get_me", "get_file_contents", "search_repositories", "search_code", "search_users",
+            "search_issues", "search_pull_requests", "list_issues", "get_issue", "get_issue_comments",
+            "list_pull_requests", "get_pull_request", "get_pull_request_files", "get_pull_request_diff",
+            "get_pull_request_status", "get_pull_request_comments", "get_pull_request_reviews",
+            "list_commits", "get_commit", "list_branches", "list_tags", "get_tag",
+            "list_notifications", "get_notification_details", "list_code_scanning_alerts",
+            "get_code_scanning_alert", "list_secret_scanning_alerts", "get_secret_scanning_alert",
+        ),
+        "write": (
+            "create_or_update_file", "delete_file", "push_files", "create_repository",
+            "fork_repository", "create_branch", "create_issue", "update_issue", "add_issue_comment",
+            "create_pull_request", "update_pull_request", "update_pull_request_branch",
+            "merge_pull_request", "create_pending_pull_request_review",
+            "add_comment_to_pending_review", "submit_pending_pull_request_review",
+            "create_and_submit_pull_request_review", "delete_pending_pull_request_review",
+            "request_copilot_review", "assign_copilot_to_issue", "dismiss_notification",
+            "mark_all_notifications_read", "manage_notification_subscription",
+            "manage_repository_notification_subscription", "run_workflow",
+        ),
+    },
+    "grafana": {
+        "read": (
+            "search_dashboards", "get_dashboard_by_uid", "get_dashboard_panel_queries",
+            "list_datasources", "get_datasource_by_uid", "get_datasource_by_name",
+            "query_prometheus", "list_prometheus_metric_metadata", "list_prometheus_metric_names",
+            "list_prometheus_label_names", "list_prometheus_label_values", "query_loki_logs",
+            "query_loki_stats", "list_loki_label_names", "list_loki_label_values",
+            "list_incidents", "get_incident", "list_alert_rules", "get_alert_rule_by_uid",
+            "list_contact_points", "list_oncall_schedules", "get_oncall_shift",
+            "get_current_oncall_users", "list_oncall_teams", "list_oncall_users", "list_teams",
+            "list_users_by_org", "find_error_pattern_logs", "find_slow_requests",
+            "get_sift_investigation", "get_sift_analysis", "list_sift_investigations",
+        ),
+        "write": (
+            "update_dashboard", "create_incident", "add_activity_to_incident",
+            "create_alert_rule", "update_alert_rule", "delete_alert_rule",
+            "create_annotation", "update_annotation",
+        ),
+    },
+    "shrimp": {
+        "read": (
+            "analyze_task", "reflect_task", "list_tasks", "query_task", "get_task_detail",
+            "process_thought", "research_mode",
+        ),
+        "write": (
+            "plan_task", "split_tasks", "execute_task", "verify_task", "update_task",
+            "delete_task", "clear_all_tasks", "init_project_rules",
+        ),
+    },
+    "playwright": {
+        "read": (
+            "browser_navigate", "browser_navigate_back", "browser_snapshot", "browser_click",
+            "browser_type", "browser_hover", "browser_press_key", "browser_select_option",
+            "browser_fill_form", "browser_drag", "browser_wait_for", "browser_tabs",
+            "browser_take_screenshot", "browser_console_messages", "browser_network_requests",
+            "browser_resize", "browser_handle_dialog", "browser_evaluate", "browser_close",
+        ),
+        "write": ("browser_file_upload", "browser_install"),
+    },
+    "duckduckgo": {
+        "read": ("search", "fetch_content"),
+        "write": (),
+    },
+    "postman": {
+        "read": (
+            "get_workspaces", "get_workspace", "get_collections", "get_collection",
+            "get_environments", "get_environment", "get_mocks", "get_mock", "get_monitors",
+            "get_monitor", "get_spec", "get_all_specs", "get_authenticated_user",
+        ),
+        "write": (
+            "create_workspace", "update_workspace", "delete_workspace", "create_collection",
+            "put_collection", "patch_collection", "delete_collection", "create_environment",
+            "put_environment", "delete_environment", "create_mock", "update_mock", "delete_mock",
+            "create_monitor", "update_monitor", "delete_monitor", "run_monitor",
+            "create_spec", "update_spec_properties", "delete_spec",
+        ),
+    },
+    "apify": {
+        "read": (
+            "search_actors", "fetch_actor_details", "get_actor_output", "search_apify_docs",
+            "fetch_apify_docs",
+        ),
+        "write": ("call_actor", "add_actor"),
+    },
+}
+
+Key = tuple[str, str]  # (server, normalized tool name)
+
+
+def normalize_tool(name: str) -> str:
+    """Lowercase; "memory/store" and "memory-store" become "memory_store"."""
+    return name.strip().lower().replace("/", "_").replace("-", "_")
+
+
+def mcp_config_path() -> str:
+    return os.environ.get("CURSOR_MCP_CONFIG") or os.path.join(os.path.dirname(HOOKS_DIR), "mcp.json")
+
+
+def override_path() -> str:
+    return os.environ.get("CURSOR_MCP_POLICY") or os.path.join(os.path.dirname(HOOKS_DIR), "mcp-policy.json")
+
+
+def cache_path() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "cursor-hooks", "mcp-policy.marshal")
+
+
+def memo_path() -> str:
+    return os.path.splitext(cache_path())[0] + ".memo"
+
+
+def digest(value: object) -> str:
+    """Stable short digest of a value's repr, for cache keys (sort sets first)."""
+    return hashlib.sha1(repr(value).encode("utf-8")).hexdigest()
+
+
+def _read_json(path: str) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"mcp policy: ignoring {path}: {e}", file=sys.stderr)
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def server_kind(name: str, config: dict) -> str:
+    """Catalog key for a server: docker image "mcp/<kind>", else the server name."""
+    for arg in config.get("args") or ():
+        if isinstance(arg, str) and arg.startswith("mcp/"):
+            kind = arg[4:].split(":", 1)[0]
+            if kind in TOOL_CATALOG:
+                return kind
+    lowered = name.lower()
+    for kind in TOOL_CATALOG:
+        if kind in lowered:
+            return kind
+    return lowered
+
+
+def server_signature(config: dict) -> str:
+    """How a server shows up in hook payloads: its URL or its full command line."""
+    if config.get("url"):
+        return str(config["url"])
+    return " ".join(str(part) for part in [config.get("command") or "", *(config.get("args") or ())]).strip()
+
+
+def compile_table(servers: dict, overrides: dict) -> tuple[dict[Key, str], dict[str, str]]:
+    """Build the (server, tool) decision table and the signature -> server index."""
+    table: dict[Key, str] = {}
+    signatures: dict[str, str] = {}
+    for name, config in servers.items():
+        if not isinstance(config, dict):
+            continue
+        signatures[server_signature(config)] = name
+        catalog = TOOL_CATALOG.get(server_kind(name, config))
+        if not catalog:
+            continue
+        for tool in catalog["read"]:
+            table[(name, tool)] = "allow"
+            table.setdefault((ANY_SERVER, tool), "allow")
+        for tool in catalog["write"]:
+            table[(name, tool)] = "ask"
+            table[(ANY_SERVER, tool)] = "ask"  # a write anywhere wins for unknown servers
+    # Overrides beat the catalog, and a server's own override beats "*": "*" goes first,
+    # onto every server's catalog entry for the tool as well, so the lookup needs no second step.
+    ordered = sorted(overrides.items(), key=lambda item: item[0] != ANY_SERVER)
+    for server, tools in ordered:
+        if not isinstance(tools, dict):
+            continue
+        for tool, decision in tools.items():
+            if decision not in DECISIONS:
+                print(f"mcp policy: ignoring {server}/{tool}: {decision!r}", file=sys.stderr)
+                continue
+            tool = normalize_tool(tool)
+            if server == ANY_SERVER:
+                for key in [k for k in table if k[1] == tool]:
+                    table[key] = decision
+            table[(server, tool)] = decision
+    return table, signatures
+
+
+def _stamp(path: str) -> tuple[int, int]:
+    try:
+        st = os.stat(path)
+        return st.st_mtime_ns, st.st_size
+    except OSError:
+        return 0, -1
+
+
+class Policy:
+    """Compiled policy plus remembered heuristic decisions, persisted between runs."""
+
+    def __init__(self, heuristic: str = "") -> None:
+        mcp_path, override = mcp_config_path(), override_path()
+        catalog = digest(sorted(TOOL_CATALOG.items()))
+        self.key = (CACHE_VERSION, mcp_path, _stamp(mcp_path), override, _stamp(override), catalog, heuristic)
+        self.table: dict[Key, str] = {}
+        self.signatures: dict[str, str] = {}
+        self.memo: dict[Key, str] = {}
+        if self._load():
+            self._load_memo()
+        else:
+            servers = _read_json(mcp_path).get("mcpServers") or {}
+            self.table, self.signatures = compile_table(servers, _read_json(override))
+            self._save()
+
+    def _load(self) -> bool:
+        try:
+            with open(cache_path(), "rb") as f:
+                key, self.table, self.signatures = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            return False
+        if key != self.key:
+            self.table, self.signatures = {}, {}
+            return False
+        return True
+
+    def _load_memo(self) -> None:
+        try:
+            f = open(memo_path(), "rb")
+        except OSError:
+            return
+        with f:
+            while True:
+                try:
+                    key, server, tool, decision = marshal.load(f)
+                except (EOFError, ValueError, TypeError):
+                    break  # end of the log, or a record cut short by a concurrent append
+                if key == self.key:
+                    self.memo[(server, tool)] = decision
+
+    def _save(self) -> None:
+        path = cache_path()
+        tmp = f"{os.path.splitext(path)[0]}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp, "wb") as f:
+                marshal.dump((self.key, self.table, self.signatures), f)
+            os.replace(tmp, path)
+            os.unlink(memo_path())  # decisions made under the old key
+        except OSError:
+            pass  # persistence is an optimization only
+
+    def _remember(self, key: Key, decision: str) -> None:
+        self.memo[key] = decision
+        try:
+            # One write in append mode: concurrent hooks add whole records.
+            with open(memo_path(), "ab") as f:
+                f.write(marshal.dumps((self.key, *key, decision)))
+        except OSError:
+            pass
+
+    def resolve_server(self, payload: dict) -> str:
+        """Server name for a hook payload (explicit name, URL or command line), else "*"."""
+        for field in ("server", "server_name", "serverName"):
+            name = payload.get(field)
+            if isinstance(name, str) and name:
+                return name
+        for field in ("url", "command"):
+            value = payload.get(field)
+            if isinstance(value, str) and value:
+                name = self.signatures.get(value.strip())
+                if name:
+                    return name
+        return ANY_SERVER
+
+    def decide(self, server: str, tool_name: str, fallback: Callable[[str], str]) -> str:
+        """Decision for (server, tool); unseen tools go through fallback once and are remembered."""
+        tool = normalize_tool(tool_name)
+        key = (server, tool)
+        decision = self.table.get(key) or self.table.get((ANY_SERVER, tool)) or self.memo.get(key)
+        if decision is None:
+            decision = fallback(tool_name)
+            self._remember(key, decision)
+        return decision
+
+
+_policy: Policy | None = None
+_policy_key: tuple | None = None
+
+
+def get_policy(heuristic: str = "") -> Policy:
+    """Process-wide policy, reloaded when mcp.json, the override file or heuristic changes.
+
+    heuristic is a digest of everything the caller's fallback depends on, so decisions
+    remembered under an older heuristic are not reused.
+    """
+    global _policy, _policy_key
+    mcp_path, override = mcp_config_path(), override_path()
+    key = (mcp_path, _stamp(mcp_path), override, _stamp(override), heuristic)
+    if _policy is None or key != _policy_key:
+        _policy = Policy(heuristic)
+        _policy_key = key
+    return _policy
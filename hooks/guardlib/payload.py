@@ -0,0 +1,131 @@
+"""
+Partial reads of hook payloads: the write target path without decoding the content.
+
+A Write payload is mostly tool_input content (content, contents, edits), but the
+decision needs only the target path unless that path is sensitive. path_candidates
+finds the tool_input key, then every "path": and "file_path": key after it in the
+raw JSON text with str.find, and decodes only the values of those keys. It does not
+decode the payload or walk its structure: the cost is one C-speed pass over the
+payload, with no copies.
+
+Escaping decides what is a key. Inside a JSON string every quote is escaped, so a
+quote preceded by k backslashes is structural at level 0 when k is even. Level 1
+is JSON text inside a JSON string, such as a tool_input sent as a string: there
+a quote is structural when k % 4 == 1, as in \\"path\\". A structural string
+followed by ':' is a key. Payload keys come from Cursor, not from the content:
+they are matched literally (Cursor does not \\u-escape ASCII), and the first
+level-0 "tool_input" key is the top-level one. Whether its value is an object or
+a string decides which level is searched.
+
+The result is a superset of the paths the guard reads (tool_input.path or
+file_path, whether tool_input is an object or a string):
+
+- keys at any depth after tool_input count, not only those directly under it
+- for an object tool_input, JSON text inside strings is not searched (it is content)
+
+Callers must only use it for decisions that hold for every candidate (allow
+when none is sensitive) and fall back to json.loads otherwise.
+"""
+
+from __future__ import annotations
+
+import json
+
+KEYS = ("path", "file_path")
+# Below this many characters json.loads is as fast as the search; callers just parse.
+MIN_CHARS = 64 * 1024
+_QUOTE = {0: '"', 1: '\\"'}
+_LEVEL_WHITESPACE = {0: (" ", "\t", "\n", "\r"), 1: (" ", "\t", "\\n", "\\r", "\\t")}
+
+
+def _backslashes_before(raw: str, i: int) -> int:
+    j = i
+    while j > 0 and raw[j - 1] == "\\":
+        j -= 1
+    return i - j
+
+
+def _structural(raw: str, quote: int, level: int) -> bool:
+    """True if the quote at index quote delimits a string at level (0 or 1)."""
+    k = _backslashes_before(raw, quote)
+    return k % 2 == 0 if level == 0 else k % 4 == 1
+
+
+def _skip_ws(raw: str, i: int, level: int) -> int:
+    space = _LEVEL_WHITESPACE[level]
+    while True:
+        for s in space:
+            if raw.startswith(s, i):
+                i += len(s)
+                break
+        else:
+            return i
+
+
+def _value(raw: str, i: int, level: int) -> str | None:
+    """The string value starting at index i (at its opening quote), None if not a string."""
+    if not raw.startswith(_QUOTE[level], i):
+        return None
+    start = i + len(_QUOTE[level])
+    if level == 0:
+        return json.decoder.scanstring(raw, start)[0]
+    end = raw.find('"', start)
+    while end != -1 and not _structural(raw, end, 1):
+        end = raw.find('"', end + 1)
+    if end == -1:
+        raise ValueError("unterminated string")
+    # Two decodes: payload string -> JSON text -> value.
+    text = json.loads('"' + raw[start : end - 1] + '"')
+    return json.loads('"' + text + '"')
+
+
+def _find_key(raw: str, key: str, level: int, start: int = 0) -> int:
+    """Index just past the ':' of the first key at level from start, or -1."""
+    quote = _QUOTE[level]
+    needle = quote + key + quote
+    i = raw.find(needle, start)
+    while i != -1:
+        if _structural(raw, i + len(quote) - 1, level) and _structural(raw, i + len(needle) - 1, level):
+            after = _skip_ws(raw, i + len(needle), level)
+            if raw.startswith(":", after):
+                return after + 1
+        i = raw.find(needle, i + 1)
+    return -1
+
+
+def path_candidates(raw: str) -> list[str] | None:
+    """Values of every path/file_path key in or after tool_input; None if one is not a string.
+
+    [] when there is no tool_input (the guard allows those as well).
+    """
+    try:
+        value_at = _find_key(raw, "tool_input", 0)
+        if value_at == -1:
+            return []
+        value_at = _skip_ws(raw, value_at, 0)
+        level = 1 if raw.startswith('"', value_at) else 0
+        quote = _QUOTE[level]
+        needle = "path" + quote
+        candidates: list[str] = []
+        i = raw.find(needle, value_at)
+        while i != -1:
+            close = i + len(needle) - 1
+            for key in KEYS:
+                opening = i + 4 - len(key) - len(quote)
+                if (
+                    opening >= 0
+                    and raw.startswith(quote + key, opening)
+                    and _structural(raw, opening + len(quote) - 1, level)
+                    and _structural(raw, close, level)
+                ):
+                    after = _skip_ws(raw, close + 1, level)
+                    if raw.startswith(":", after):
+                        value = _value(raw, _skip_ws(raw, after + 1, level), level)
+                        if value is None:
+                            return None
+                        candidates.append(value)
+                    break
+            i = raw.find(needle, i + len(needle))
+    except (ValueError, IndexError):
+        return None
+    return candidates
@@ -0,0 +1,101 @@
+"""
+Hook registry: map hook names to guard scripts and evaluate payloads in-process.
+
+Guard scripts have hyphenated file names, so they are loaded by path (only when a
+hook of that type runs; the loader avoids importlib.util for startup time). Each one
+exposes evaluate(raw, ctx) -> (result, exit_code). evaluate may set ctx["subject"]
+(tool name or fingerprint) for the audit log. It runs within the hook's budget;
+when that runs out or evaluate raises, the hook's fallback decision is returned
+instead (see guardlib/runtime.py) and audited with the cause.
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+import os
+import sys
+import time
+from importlib.machinery import SourceFileLoader
+from types import ModuleType
+
+from guardlib import audit, runtime
+from guardlib.runtime import BUNDLED, HOOKS_DIR
+
+HOOK_SCRIPTS = {
+    "mcp-write": "guard-mcp-write.py",
+    "secret-write": "guard-secret-write.py",
+    "shell-secret": "guard-shell-secret.py",
+}
+
+_loaded: dict[str, ModuleType] = {}
+
+
+def load_hook(name: str) -> ModuleType:
+    """Load (once) and return the guard module registered under name."""
+    module = _loaded.get(name)
+    if module is not None:
+        return module
+    try:
+        script = HOOK_SCRIPTS[name]
+    except KeyError:
+        raise ValueError(f"Unknown hook: {name}") from None
+    module_name = "guard_" + name.replace("-", "_")
+    if BUNDLED:
+        module = importlib.import_module(module_name)
+    else:
+        path = os.path.join(HOOKS_DIR, script)
+        loader = SourceFileLoader(module_name, path)
+        module = ModuleType(module_name)
+        module.__file__ = path
+        module.__loader__ = loader
+        loader.exec_module(module)
+    _loaded[name] = module
+    return module
+
+
+def run_module(name: str, module: ModuleType, raw: str) -> tuple[str, int]:
+    """Evaluate raw stdin text with a loaded guard module within its budget and audit the decision."""
+    ctx: dict = {}
+    t0 = time.perf_counter()
+    try:
+        result, code = runtime.call(name, module.evaluate, raw, ctx)
+    except runtime.DeadlineExceeded:
+        return fallback(name, "timeout", ctx.get("subject"), (time.perf_counter() - t0) * 1e6)
+    except Exception:
+        return fallback(name, "error", ctx.get("subject"), (time.perf_counter() - t0) * 1e6)
+    elapsed_us = (time.perf_counter() - t0) * 1e6
+    decision = result.get("permission") or result.get("decision") or ""
+    audit.record(name, ctx.get("subject"), decision, elapsed_us)
+    return json.dumps(result), code
+
+
+def fallback(name: str, cause: str, subject: str | None = None, elapsed_us: float = 0.0) -> tuple[str, int]:
+    """The hook's fallback decision for cause ("timeout" or "error"), audited with that cause."""
+    result, code = runtime.fallback_result(name, cause)
+    decision = result.get("permission") or result.get("decision") or ""
+    audit.record(name, f"{cause}:{subject}" if subject else cause, decision, elapsed_us, cause)
+    return json.dumps(result), code
+
+
+def run_hook(name: str, raw: str) -> tuple[str, int]:
+    """Evaluate raw stdin text with the named hook. Returns (stdout line, exit code)."""
+    return run_module(name, load_hook(name), raw)
+
+
+def main(name: str, module: ModuleType) -> int:
+    """Guard script entry point: read stdin and decide within the budget, print the result."""
+    t0 = time.perf_counter()
+    runtime.arm(runtime.settings(name)[0])
+    stage = "stdin"
+    try:
+        try:
+            raw = sys.stdin.read()
+            stage = None
+            out, code = run_module(name, module, raw)
+        except runtime.DeadlineExceeded:
+            out, code = fallback(name, "timeout", stage, (time.perf_counter() - t0) * 1e6)
+    finally:
+        runtime.disarm()
+    print(out)
+    return code
@@ -0,0 +1,277 @@
+"""
+Rule pack: merge each group of guard patterns into one precompiled matcher.
+
+Python's re engine tries every branch of a case-insensitive alternation at every
+position, so a plain "a|b|c" merge gets slower with each rule. Instead, each rule's
+required ASCII literal prefix is extracted at build time; those literals, written
+as one case-sensitive trie regex, run over the lowercased input (which re can scan
+with a first-character charset). A candidate position is confirmed with one match
+call: the rules whose prefix starts with that character, merged into a named-group
+alternation in rule order. Rules without a usable prefix go into one merged
+named-group regex. Either way the matcher reports which rule fired, and each added
+rule costs a trie branch rather than a regex call per candidate.
+
+The lowercased copy stays: scanning the original text with a case-insensitive trie
+loses the first-character skip and is 2-3x slower than copying.
+
+Built-in rules come from the guard script; extra rules are read from
+guard-rules.json next to hooks.json (override: CURSOR_GUARD_RULES):
+
+  {
+    "path":    [{"name": "vault-file", "pattern": "\\.vault$"}],
+    "content": ["private_key\\s*="]
+  }
+
+The validated rules, their prefixes and the merged sources are cached on disk
+(marshal) and reused while the config file's mtime/size and the built-in rules
+are unchanged. Python cannot serialize compiled regex programs, so the final
+re.compile calls still run once per process.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import marshal
+import os
+import re
+import sys
+from collections.abc import Callable
+
+from guardlib.registry import HOOKS_DIR
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover - older Pythons
+    import sre_parse  # type: ignore[no-redef]
+
+RULES_ENV = "CURSOR_GUARD_RULES"
+CACHE_VERSION = 3
+
+Rule = tuple[str, str]  # (name, pattern)
+# Cached form of one group: (names, patterns, literal prefixes, prefilter source, residual source)
+GroupSpec = tuple[list[str], list[str], list[str], str, str]
+
+
+def config_path() -> str:
+    """User rule file: $CURSOR_GUARD_RULES or guard-rules.json next to hooks.json."""
+    return os.environ.get(RULES_ENV) or os.path.join(os.path.dirname(HOOKS_DIR), "guard-rules.json")
+
+
+def cache_path() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "cursor-hooks", "rulepack.marshal")
+
+
+def literal_prefix(pattern: str, ignorecase: bool = True) -> str:
+    """ASCII literal every match of pattern starts with, lowercased if ignorecase ("" if none)."""
+    try:
+        parsed = sre_parse.parse(pattern, re.IGNORECASE if ignorecase else 0)
+    except re.error:
+        return ""
+    chars = []
+    for op, arg in parsed:
+        if op is not sre_parse.LITERAL or arg > 127:
+            break
+        chars.append(chr(arg).lower() if ignorecase else chr(arg))
+    return "".join(chars)
+
+
+def trie_pattern(literals: list[str], leaves: dict[str, str] | None = None) -> str:
+    """One regex matching wherever any of literals starts, written as a trie.
+
+    A literal that extends another is dropped: the shorter one already marks the
+    position. With leaves (literal -> regex), each literal is followed by its
+    regex and longer literals are kept, tried before the shorter ones they extend.
+    """
+    root: dict[str, dict] = {}
+    for literal in literals:
+        node = root
+        for ch in literal:
+            node = node.setdefault(ch, {})
+        node[""] = {"": literal}
+
+    def render(node: dict[str, dict]) -> str:
+        if "" in node and leaves is None:
+            return ""
+        parts = [re.escape(ch) + render(child) for ch, child in sorted(node.items()) if ch]
+        if "" in node:
+            parts.append(leaves[node[""][""]])  # type: ignore[index]
+        return parts[0] if len(parts) == 1 else "(?:" + "|".join(parts) + ")"
+
+    return render(root) if root else ""
+
+
+class RuleGroup:
+    """One merged matcher; search() returns the name of the first rule that fires."""
+
+    def __init__(self, spec: GroupSpec) -> None:
+        self.names, self.patterns, self.prefixes, prefilter, residual = spec
+        self._prefilter = re.compile(prefilter) if prefilter else None
+        self._residual = re.compile(residual, re.IGNORECASE) if residual else None
+        self._compiled: dict[str, Callable[..., re.Match[str] | None]] = {}
+        # First character of each prefix -> rule indexes to confirm at a candidate position.
+        self._by_first: dict[str, list[int]] = {}
+        for i, prefix in enumerate(self.prefixes):
+            if prefix:
+                self._by_first.setdefault(prefix[0], []).append(i)
+
+    def _confirm(self, first: str) -> Callable[..., re.Match[str] | None]:
+        """match() of the merged rules whose prefix starts with first (compiled on first use)."""
+        match = self._compiled.get(first)
+        if match is None:
+            merged = "|".join(f"(?P<r{i}>{self.patterns[i]})" for i in self._by_first[first])
+            match = self._compiled[first] = re.compile(merged, re.IGNORECASE).match
+        return match
+
+    def _search_slow(self, text: str) -> str | None:
+        for i, prefix in enumerate(self.prefixes):
+            if prefix and re.search(self.patterns[i], text, re.IGNORECASE):
+                return self.names[i]
+        return None
+
+    def search(self, text: str) -> str | None:
+        if self._prefilter is not None:
+            lower = text.lower()
+            if len(lower) != len(text):
+                # Some characters change length when lowercased; positions would not line up.
+                hit = self._search_slow(text)
+                if hit:
+                    return hit
+            else:
+                search = self._prefilter.search
+                m = search(lower)
+                while m is not None:
+                    pos = m.start()
+                    hit = self._confirm(lower[pos])(text, pos)
+                    if hit is not None:
+                        return self.names[int(hit.lastgroup[1:])]
+                    # Resume one character later so overlapping prefixes are not skipped.
+                    m = search(lower, pos + 1)
+        if self._residual is not None:
+            m = self._residual.search(text)
+            if m is not None:
+                return self.names[int(m.lastgroup[1:])]
+        return None
+
+
+def merge(rules: list[Rule]) -> GroupSpec:
+    """Validate rules and build the cached group spec. Invalid patterns are skipped."""
+    names: list[str] = []
+    patterns: list[str] = []
+    prefixes: list[str] = []
+    residual: list[str] = []
+    for name, pattern in rules:
+        try:
+            # Compile inside an alternation so flags that only work at the start fail here.
+            compiled = re.compile(f"x|(?:{pattern})")
+        except re.error as e:
+            print(f"guard rules: skipping rule {name!r}: {e}", file=sys.stderr)
+            continue
+        if compiled.groupindex:
+            print(f"guard rules: skipping rule {name!r}: named groups are not supported", file=sys.stderr)
+            continue
+        prefix = literal_prefix(pattern)
+        if not prefix:
+            residual.append(f"(?P<r{len(names)}>{pattern})")
+        names.append(name)
+        patterns.append(pattern)
+        prefixes.append(prefix)
+    prefilter = trie_pattern(sorted({p for p in prefixes if p}))
+    return names, patterns, prefixes, prefilter, "|".join(residual)
+
+
+def _read_user_rules(path: str) -> dict[str, list[Rule]]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"guard rules: ignoring {path}: {e}", file=sys.stderr)
+        return {}
+    groups: dict[str, list[Rule]] = {}
+    if not isinstance(data, dict):
+        return groups
+    for group, items in data.items():
+        if not isinstance(items, list):
+            continue
+        rules: list[Rule] = []
+        for i, item in enumerate(items):
+            if isinstance(item, str):
+                rules.append((f"{group}-custom-{i}", item))
+            elif isinstance(item, dict) and isinstance(item.get("pattern"), str):
+                rules.append((str(item.get("name") or f"{group}-custom-{i}"), item["pattern"]))
+        groups[group] = rules
+    return groups
+
+
+def _cache_key(builtin: dict[str, tuple[Rule, ...]], path: str) -> tuple:
+    try:
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        stamp = (0, -1)
+    digest = hashlib.sha1(repr(sorted(builtin.items())).encode("utf-8")).hexdigest()
+    return (CACHE_VERSION, path, stamp, digest)
+
+
+def _load_cache(key: tuple) -> dict[str, GroupSpec] | None:
+    try:
+        with open(cache_path(), "rb") as f:
+            cached_key, groups = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    return groups if cached_key == key else None
+
+
+def _store_cache(key: tuple, groups: dict[str, GroupSpec]) -> None:
+    path = cache_path()
+    tmp = f"{os.path.splitext(path)[0]}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp, "wb") as f:
+            marshal.dump((key, groups), f)
+        os.replace(tmp, path)
+    except OSError:
+        pass  # cache is an optimization only
+
+
+def build(builtin: dict[str, tuple[Rule, ...]], path: str | None = None) -> dict[str, RuleGroup]:
+    """Build the pack for builtin rules plus the user config, using the disk cache."""
+    path = path or config_path()
+    key = _cache_key(builtin, path)
+    sources = _load_cache(key)
+    if sources is None:
+        user = _read_user_rules(path)
+        sources = {}
+        for group in set(builtin) | set(user):
+            sources[group] = merge(list(builtin.get(group, ())) + user.get(group, []))
+        _store_cache(key, sources)
+    return {group: RuleGroup(spec) for group, spec in sources.items()}
+
+
+class RulePack:
+    """Lazily built pack; rebuilt when the user config file changes (cheap stat per call)."""
+
+    def __init__(self, builtin: dict[str, tuple[Rule, ...]]) -> None:
+        self.builtin = builtin
+        self._stamp: tuple | None = None
+        self._groups: dict[str, RuleGroup] = {}
+
+    def _current(self) -> dict[str, RuleGroup]:
+        path = config_path()
+        try:
+            st = os.stat(path)
+            stamp = (path, st.st_mtime_ns, st.st_size)
+        except OSError:
+            stamp = (path, 0, -1)
+        if stamp != self._stamp:
+            self._groups = build(self.builtin, path)
+            self._stamp = stamp
+        return self._groups
+
+    def search(self, group: str, text: str) -> str | None:
+        """Return the name of the first rule in group that matches text, else None."""
+        matcher = self._current().get(group)
+        return matcher.search(text) if matcher else None
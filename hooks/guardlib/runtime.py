@@ -0,0 +1,226 @@
+"""
+Hook runtime: per-hook time budgets and the fallback decision when a hook cannot decide.
+
+Every hook type has a budget for reading its payload and deciding, and one explicit
+fallback decision (allow, ask or deny) used both when the budget runs out and when
+evaluation raises. Built-in defaults are in HOOKS; hook-runtime.json next to
+hooks.json (override: CURSOR_HOOK_RUNTIME) can change them per hook, with
+"default" applying to every hook:
+
+  {
+    "default":      {"budget_ms": 1000, "fallback": "ask"},
+    "secret-write": {"budget_ms": 5000, "fallback": "deny"}
+  }
+
+The budget is enforced with a SIGALRM interval timer in one-shot hook processes:
+the handler raises DeadlineExceeded wherever the hook is (a stdin read, a regex
+scan, a socket wait). The regex engine checks for signals as it runs, so even a
+pathological pattern is interrupted. Off the main thread (the hook server) or
+without setitimer (Windows), the evaluation runs in a worker thread that is
+abandoned when the budget runs out.
+
+The client's fast path imports this module before it knows whether the server is
+up, so it avoids json: a parsed hook-runtime.json is cached on disk (marshal) and
+reused while the file's mtime/size are unchanged.
+"""
+
+from __future__ import annotations
+
+import _signal
+import marshal
+import os
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+# Inside the zip bundle (scripts/build-hook-bundle.py) the guard scripts are plain
+# modules named guard_<hook>, and the directory holding the bundle stands in for hooks/.
+BUNDLED = not os.path.isdir(_ROOT)
+HOOKS_DIR = os.path.dirname(_ROOT) if BUNDLED else _ROOT
+
+RUNTIME_ENV = "CURSOR_HOOK_RUNTIME"
+DECISIONS = ("allow", "ask", "deny")
+
+# hook -> (output key, budget ms, fallback decision). The output key is the field
+# Cursor reads for that hook type: "permission" (allow/ask/deny) or "decision" (allow/deny).
+HOOKS = {
+    "mcp-write": ("permission", 1000, "ask"),
+    "secret-write": ("decision", 2000, "ask"),
+    "shell-secret": ("permission", 1000, "ask"),
+}
+DEFAULT = ("permission", 1000, "ask")
+
+_settings: dict[str, tuple[float, str]] | None = None
+_armed = False
+
+
+class DeadlineExceeded(BaseException):
+    """Raised when a hook runs past its budget.
+
+    A BaseException, like KeyboardInterrupt, so the guards' own except clauses do not
+    swallow it.
+    """
+
+
+def config_path() -> str:
+    """Runtime settings file: $CURSOR_HOOK_RUNTIME or hook-runtime.json next to hooks.json."""
+    return os.environ.get(RUNTIME_ENV) or os.path.join(os.path.dirname(HOOKS_DIR), "hook-runtime.json")
+
+
+def cache_path() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "cursor-hooks", "runtime.marshal")
+
+
+def parse_config(data: object) -> dict[str, tuple[float, str]]:
+    """Validated (budget seconds, fallback) per hook name; invalid entries are ignored."""
+    data = data if isinstance(data, dict) else {}
+    default = data.get("default") if isinstance(data.get("default"), dict) else {}
+    settings = {}
+    for name in [*HOOKS, *(k for k in data if k not in HOOKS and k != "default")]:
+        _, budget_ms, fallback = HOOKS.get(name, DEFAULT)
+        for entry in (default, data.get(name)):
+            if not isinstance(entry, dict):
+                continue
+            value = entry.get("budget_ms")
+            if isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0:
+                budget_ms = value
+            if entry.get("fallback") in DECISIONS:
+                fallback = entry["fallback"]
+        settings[name] = (budget_ms / 1000, fallback)
+    return settings
+
+
+def _load() -> dict[str, tuple[float, str]]:
+    path = config_path()
+    try:
+        st = os.stat(path)
+    except OSError:
+        return parse_config({})
+    key = (path, st.st_mtime_ns, st.st_size)
+    try:
+        with open(cache_path(), "rb") as f:
+            cached_key, settings = marshal.load(f)
+        if cached_key == key:
+            return settings
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+    import json
+    import sys
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            settings = parse_config(json.load(f))
+    except (OSError, ValueError) as e:
+        print(f"hook runtime: ignoring {path}: {e}", file=sys.stderr)
+        return parse_config({})
+    cache = cache_path()
+    tmp = f"{os.path.splitext(cache)[0]}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache), exist_ok=True)
+        with open(tmp, "wb") as f:
+            marshal.dump((key, settings), f)
+        os.replace(tmp, cache)
+    except OSError:
+        pass  # the cache only saves a json import
+    return settings
+
+
+def settings(hook: str) -> tuple[float, str]:
+    """(budget in seconds, fallback decision) for hook."""
+    global _settings
+    if _settings is None:
+        _settings = _load()
+    found = _settings.get(hook)
+    if found is None:
+        _, budget_ms, fallback = DEFAULT
+        found = (budget_ms / 1000, fallback)
+    return found
+
+
+def _expired(signum: int, frame: object) -> None:
+    raise DeadlineExceeded
+
+
+def arm(seconds: float) -> bool:
+    """Raise DeadlineExceeded in this thread after seconds; False if that is not possible here."""
+    global _armed
+    if _armed or not hasattr(_signal, "setitimer"):
+        return False
+    try:
+        _signal.signal(_signal.SIGALRM, _expired)
+    except ValueError:
+        return False  # not the main thread
+    _signal.setitimer(_signal.ITIMER_REAL, seconds)
+    _armed = True
+    return True
+
+
+def disarm() -> None:
+    global _armed
+    if _armed:
+        _signal.setitimer(_signal.ITIMER_REAL, 0)
+        _armed = False
+
+
+def call(hook: str, fn, *args):
+    """fn(*args) within hook's budget; raises DeadlineExceeded when it runs out.
+
+    Under a timer armed by the caller (hook-client.py covers the stdin read as well),
+    fn just runs: that timer already bounds it.
+    """
+    if _armed:
+        return fn(*args)
+    seconds = settings(hook)[0]
+    if arm(seconds):
+        try:
+            return fn(*args)
+        finally:
+            disarm()
+    return _call_in_thread(seconds, fn, args)
+
+
+def _call_in_thread(seconds: float, fn, args: tuple):
+    import threading
+
+    box: list = []
+
+    def target() -> None:
+        try:
+            box.append((True, fn(*args)))
+        except BaseException as e:  # re-raised in the caller
+            box.append((False, e))
+
+    worker = threading.Thread(target=target, name="hook-eval", daemon=True)
+    worker.start()
+    worker.join(seconds)
+    if not box:
+        # Python cannot stop a thread; it finishes in the background and its result is dropped.
+        raise DeadlineExceeded
+    ok, value = box[0]
+    if ok:
+        return value
+    raise value
+
+
+def fallback_result(hook: str, cause: str) -> tuple[dict, int]:
+    """Output and exit code of hook's fallback decision; cause is "timeout" or "error"."""
+    seconds, decision = settings(hook)
+    key = HOOKS.get(hook, DEFAULT)[0]
+    if cause == "timeout":
+        what = f"The {hook} hook did not decide within its {seconds * 1000:g} ms budget"
+    else:
+        what = f"The {hook} hook failed"
+    if decision == "allow":
+        return {key: "allow"}, 0
+    if key == "decision":
+        # preToolUse has no ask: a deny whose reason asks for confirmation is how the guard asks.
+        reason = f"{what}, so this action was not checked."
+        if decision == "ask":
+            reason += " Confirm you want it, then retry."
+        return {"decision": "deny", "reason": reason}, 2
+    if decision == "deny":
+        return {"permission": "deny", "user_message": f"{what}."}, 2
+    return {
+        "permission": "ask",
+        "user_message": f"{what}, so this action was not checked. Confirm you want to run it.",
+        "agent_message": f"{what}. User authorization is required. Ask the user to confirm.",
+    }, 0
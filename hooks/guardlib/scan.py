@@ -0,0 +1,91 @@
+"""
+Streaming, bounded-memory content scan for Write payloads.
+
+Texts are scanned one at a time in fixed-size windows instead of being joined into
+one string. Consecutive windows overlap by OVERLAP characters, so any match no
+longer than OVERLAP that starts in one window is fully contained in it. The scan
+stops at the first hit and inspects at most max_chars characters in total.
+
+The match callable gets the whole text and the window's bounds, not a copy of
+the window: a detector can look behind the window for context (the PEM header
+of a certificate, an allowlist marker) and past it for the end of a run.
+
+Settings (environment):
+  CURSOR_GUARD_SCAN_MAX_BYTES   cap on characters inspected (default 8 MiB)
+  CURSOR_GUARD_OVERSIZE_POLICY  "deny" (default) or "allow": decision when the cap
+                                is reached before the content was fully scanned
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Callable, Iterable, Iterator
+
+CHUNK_SIZE = 64 * 1024
+OVERLAP = 1024
+DEFAULT_MAX_CHARS = 8 * 1024 * 1024
+OVERSIZE_POLICIES = ("deny", "allow")
+
+
+def max_chars() -> int:
+    try:
+        return int(os.environ.get("CURSOR_GUARD_SCAN_MAX_BYTES", DEFAULT_MAX_CHARS))
+    except ValueError:
+        return DEFAULT_MAX_CHARS
+
+
+def oversize_policy() -> str:
+    policy = os.environ.get("CURSOR_GUARD_OVERSIZE_POLICY", "deny").strip().lower()
+    return policy if policy in OVERSIZE_POLICIES else "deny"
+
+
+def iter_texts(tool_input: dict) -> Iterator[str]:
+    """Yield every content field of a Write/Edit tool_input, without copying."""
+    edits = tool_input.get("edits") or tool_input.get("new_string") or []
+    if isinstance(edits, str):
+        yield edits
+    elif isinstance(edits, list):
+        for e in edits:
+            if isinstance(e, dict) and isinstance(e.get("new_string"), str):
+                yield e["new_string"]
+    for key in ("content", "contents"):
+        value = tool_input.get(key)
+        if isinstance(value, str):
+            yield value
+
+
+class ScanResult:
+    """Outcome of a scan: rule that fired (or None) and whether the cap was hit."""
+
+    __slots__ = ("rule", "truncated", "scanned")
+
+    def __init__(self, rule: str | None, truncated: bool, scanned: int) -> None:
+        self.rule = rule
+        self.truncated = truncated
+        self.scanned = scanned
+
+
+def scan(
+    texts: Iterable[str],
+    match: Callable[[str, int, int], str | None],
+    limit: int | None = None,
+    chunk_size: int = CHUNK_SIZE,
+    overlap: int = OVERLAP,
+) -> ScanResult:
+    """Run match(text, start, stop) over texts window by window; stop at the first hit or after limit chars."""
+    limit = max_chars() if limit is None else limit
+    scanned = 0
+    for text in texts:
+        n = len(text)
+        start = 0
+        while start < n:
+            if scanned >= limit:
+                return ScanResult(None, True, scanned)
+            step = min(chunk_size, limit - scanned)
+            end = start + step
+            rule = match(text, start, min(n, end + overlap))
+            if rule is not None:
+                return ScanResult(rule, False, scanned + min(step, n - start))
+            scanned += min(step, n - start)
+            start = end
+    return ScanResult(None, False, scanned)
@@ -0,0 +1,264 @@
+"""
+Shell command analysis: find the files a command line writes to.
+
+A single regex pass tokenizes the command into words and operators (quotes and
+escapes kept inside words), heredoc bodies and # comments are skipped, and each
+simple command of every pipeline/list is checked for write targets:
+
+- redirections: >, >>, >|, &>, &>>, N>, N>>, <> (not fd duplication like 2>&1)
+- tee FILE..., sed -i ... FILE..., perl/ruby -i ... FILE..., dd of=FILE
+- cp/mv/install/ln/rsync ... DEST; with -t DIR, several sources or a trailing "/",
+  the DIR/<source name> paths are reported too
+- sh/bash/zsh -c "..." and eval ... are analyzed recursively
+- process substitutions >(...) and <(...) are commands of their own; in the
+  command around them they stand for a /dev/fd path
+
+Leading wrappers (sudo, env, nohup, time, nice, command, exec, xargs), shell keywords
+(do, then, ...) and VAR=value assignments are skipped. Commands that contain no ">"
+and none of the writing commands are not tokenized at all; otherwise the cost is
+linear in the command length.
+"""
+
+from __future__ import annotations
+
+import re
+
+# Groups: newline, operator, word, stray quote (whitespace is matched but not captured).
+_TOKEN = re.compile(
+    r"""[ \t\r]+|\\\n|\#[^\n]*"""
+    r"""|(\n)"""
+    r"""|([<>]\(|\d*(?:>>|>\||>&|<>|>)|&>>?|<<<|<<-?|<&|<|\|[|&]?|&&?|;;?|[()])"""
+    r"""|((?:[^\s'"\\|&;<>()]+|\\.|'[^']*'|"(?:[^"\\]+|\\.)*")+)"""
+    r"""|(['"])""",
+    re.DOTALL,
+)
+# Commands without any of these cannot write a file (cheap pre-check before tokenizing).
+_MAY_WRITE = re.compile(r">|\b(?:tee|sed|perl|ruby|cp|mv|install|ln|rsync|dd|eval|sh|bash|zsh|dash|ksh)\b")
+_HEREDOC = re.compile(r"""<<(-?)\s*(?:'([^']*)'|"([^"]*)"|\\?([^\s;|&<>()]+))""")
+_UNQUOTE = re.compile(r"""'([^']*)'|"((?:[^"\\]|\\.)*)"|\\(.)""", re.DOTALL)
+
+SEPARATORS = frozenset({"|", "||", "|&", "&&", ";", ";;", "&", "(", ")"})
+_FD = re.compile(r"^(\d+|-)$")
+WRITE_REDIRECTS = re.compile(r"^(\d*>>|\d*>\||&>>|&>|\d*<>|\d*>)$")
+# Command prefixes that run another command, with their options that take a value.
+WRAPPERS = {
+    "sudo": frozenset({"-u", "-g", "-C", "-D", "-h", "-p", "-r", "-t", "-U"}),
+    "doas": frozenset({"-u", "-C"}),
+    "env": frozenset({"-u", "-C", "-S"}),
+    "nice": frozenset({"-n"}),
+    "xargs": frozenset({"-I", "-n", "-P", "-L", "-d", "-E", "-s", "-a"}),
+    "nohup": frozenset(),
+    "time": frozenset(),
+    "command": frozenset(),
+    "exec": frozenset({"-a"}),
+    "builtin": frozenset(),
+}
+KEYWORDS = frozenset({"if", "then", "elif", "else", "while", "until", "do", "!", "{"})
+_ASSIGNMENT = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*=")
+SHELLS = frozenset({"sh", "bash", "zsh", "dash", "ksh"})
+# In-place editors with -i: (letters that take the script, letters that take a value).
+IN_PLACE_EDITORS = {"perl": ("eE", "IMmx"), "ruby": ("e", "IrCEFx")}
+PROCESS_PATH = "/dev/fd/63"  # what a process substitution expands to
+MAX_DEPTH = 3
+
+
+class ParseError(ValueError):
+    """Command could not be tokenized (e.g. unbalanced quotes)."""
+
+
+def unquote(word: str) -> str:
+    if "'" not in word and '"' not in word and "\\" not in word:
+        return word
+
+    def repl(m: re.Match[str]) -> str:
+        if m.group(1) is not None:
+            return m.group(1)
+        if m.group(2) is not None:
+            return re.sub(r"\\(.)", r"\1", m.group(2))
+        return m.group(3)
+
+    return _UNQUOTE.sub(repl, word)
+
+
+def strip_heredocs(command: str) -> str:
+    """Drop heredoc bodies so their text is not parsed as commands."""
+    if "<<" not in command:
+        return command
+    lines = command.split("\n")
+    out = []
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        out.append(line)
+        i += 1
+        for m in _HEREDOC.finditer(line):
+            if line[m.start():m.start() + 3] == "<<<":
+                continue  # here-string, no body
+            delim = next(g for g in m.groups()[1:] if g is not None)
+            strip_tabs = bool(m.group(1))
+            while i < len(lines):
+                body = lines[i].lstrip("\t") if strip_tabs else lines[i]
+                i += 1
+                if body == delim:
+                    break
+    return "\n".join(out)
+
+
+def _positional(args: list[str], with_value: frozenset[str] = frozenset()) -> list[str]:
+    """Non-option arguments (honours "--" and options that take a value)."""
+    out = []
+    i = 0
+    only_positional = False
+    while i < len(args):
+        a = args[i]
+        if only_positional or not a.startswith("-") or a == "-":
+            out.append(a)
+        elif a == "--":
+            only_positional = True
+        elif a in with_value:
+            i += 1
+        i += 1
+    return out
+
+
+def _into_directory(directory: str, sources: list[str]) -> list[str]:
+    """Paths created by copying/moving sources into directory."""
+    base = directory.rstrip("/") or "/"
+    return [directory] + [f"{base}/{src.rstrip('/').rsplit('/', 1)[-1]}" for src in sources]
+
+
+def _in_place_files(args: list[str], script_letters: str, value_letters: str) -> list[str]:
+    """Files a perl/ruby command line edits with -i (-i.bak, -pi, -i -pe ...), else []."""
+    in_place = has_script = False
+    files: list[str] = []
+    i = 0
+    while i < len(args):
+        a = args[i]
+        if a == "--":
+            files.extend(args[i + 1:])
+            break
+        if a.startswith("-") and not a.startswith("--") and a != "-":
+            for j, ch in enumerate(a[1:], 1):
+                if ch == "i":
+                    in_place = True
+                    break  # the rest is the backup suffix
+                if ch in script_letters or ch in value_letters:
+                    has_script = has_script or ch in script_letters
+                    if j == len(a) - 1:
+                        i += 1  # the value is the next argument
+                    break
+        elif not a.startswith("--"):
+            files.extend(args[i:])  # switches end at the first other argument
+            break
+        i += 1
+    if not in_place:
+        return []
+    return files if has_script else files[1:]
+
+
+def _command_targets(argv: list[str], depth: int) -> list[str]:
+    while argv:
+        head = argv[0].rsplit("/", 1)[-1]
+        if head in WRAPPERS:
+            with_value = WRAPPERS[head]
+            argv = argv[1:]
+            while argv and argv[0].startswith("-") and argv[0] != "--":
+                argv = argv[2:] if argv[0] in with_value else argv[1:]
+            if argv and argv[0] == "--":
+                argv = argv[1:]
+        elif head in KEYWORDS or _ASSIGNMENT.match(argv[0]):
+            argv = argv[1:]
+        else:
+            break
+    if not argv:
+        return []
+    name, args = argv[0].rsplit("/", 1)[-1], argv[1:]
+    if name == "tee":
+        return _positional(args)
+    if name == "sed":
+        in_place = any(
+            a == "--in-place" or a.startswith("--in-place=") or (re.match(r"^-[a-zA-Z]*i", a) is not None and not a.startswith("--"))
+            for a in args
+        )
+        if not in_place:
+            return []
+        has_script_opt = any(a in ("-e", "-f", "--expression", "--file") or a.startswith(("--expression=", "--file=")) for a in args)
+        files = _positional(args, frozenset({"-e", "-f", "--expression", "--file", "-l", "--line-length"}))
+        return files if has_script_opt else files[1:]
+    if name in ("cp", "mv", "install", "ln", "rsync"):
+        files = _positional(args, frozenset({"-t", "--target-directory", "-S", "--suffix", "-m", "--mode", "-o", "--owner", "-g", "--group"}))
+        for i, a in enumerate(args):
+            if a in ("-t", "--target-directory") and i + 1 < len(args):
+                return _into_directory(args[i + 1], files)
+            if a.startswith("--target-directory="):
+                return _into_directory(a.split("=", 1)[1], files)
+        if len(files) < 2:
+            return []
+        if len(files) > 2 or files[-1].endswith("/"):
+            return _into_directory(files[-1], files[:-1])
+        return files[-1:]
+    if name in IN_PLACE_EDITORS:
+        return _in_place_files(args, *IN_PLACE_EDITORS[name])
+    if name == "dd":
+        return [a[3:] for a in args if a.startswith("of=")]
+    if name == "eval" and depth < MAX_DEPTH:
+        return write_targets(" ".join(args), depth + 1)
+    if name in SHELLS and depth < MAX_DEPTH:
+        for i, a in enumerate(args):
+            if a == "-c" or (a.startswith("-") and not a.startswith("--") and "c" in a[1:]):
+                if i + 1 < len(args):
+                    return write_targets(args[i + 1], depth + 1)
+                break
+    return []
+
+
+def write_targets(command: str, depth: int = 0) -> list[str]:
+    """All files the command may write to (unquoted, unresolved). Raises ParseError.
+
+    One pass over the tokens: words collect into argv, a write redirection takes the
+    following word as a target, and separators end the current simple command. A
+    process substitution saves the command around it, collects its own, and at its
+    ")" puts PROCESS_PATH into the saved command as a word.
+    """
+    targets: list[str] = []
+    if not _MAY_WRITE.search(command):
+        return targets
+    argv: list[str] = []
+    redirect: str | None = None  # operator waiting for its word
+    # One entry per open "(": the enclosing (argv, redirect) of a process substitution, None for a subshell.
+    opened: list[tuple[list[str], str | None] | None] = []
+    for nl, op, word, bad in _TOKEN.findall(strip_heredocs(command)):
+        if op in ("<(", ">("):
+            opened.append((argv, redirect))
+            argv, redirect = [], None
+            continue
+        if op == ")" and opened and opened[-1] is not None:
+            if argv:
+                targets.extend(_command_targets(argv, depth))
+            argv, redirect = opened.pop()  # type: ignore[misc]
+            word = PROCESS_PATH
+        elif op in ("(", ")"):
+            if op == "(":
+                opened.append(None)
+            elif opened:
+                opened.pop()
+        if word:
+            if redirect is None:
+                argv.append(unquote(word))
+            elif WRITE_REDIRECTS.match(redirect) or (redirect.endswith(">&") and not _FD.match(word)):
+                targets.append(unquote(word))  # >&file (not >&2) also redirects to a file
+            redirect = None
+        elif op and op not in SEPARATORS:
+            redirect = op
+        elif op or nl:
+            if argv:
+                targets.extend(_command_targets(argv, depth))
+                argv = []
+            redirect = None
+        elif bad:
+            raise ParseError("unbalanced quote")
+    if opened and any(entry is not None for entry in opened):
+        raise ParseError("unclosed process substitution")
+    if argv:
+        targets.extend(_command_targets(argv, depth))
+    return targets
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Summarize the guard hook audit log by hook, subject and decision.
+
+Streams the live log and its rotated files line by line; memory grows with the number
+of distinct (hook, subject, decision) keys, not with the log size.
+
+--latency prints the persistent latency histogram instead (guardlib/audit.py):
+calls, timeouts and errors per hook, and percentiles of evaluation time. It covers
+every call since the histogram was started, not just the audit log's window.
+
+Usage:
+  hook-audit.py [--hook NAME] [--decision DECISION] [--since HOURS] [--top N] [--json] [--log PATH]
+  hook-audit.py --latency [--hook NAME] [--json] [--histogram PATH]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+
+from guardlib import audit
+
+
+def summarize(records, hook: str | None, decision: str | None, since: float | None) -> dict:
+    stats: dict[tuple[str, str, str], list[float]] = {}  # key -> [count, total_us, max_us]
+    for r in records:
+        if hook and r.get("hook") != hook:
+            continue
+        if decision and r.get("decision") != decision:
+            continue
+        if since and r.get("ts", 0) < since:
+            continue
+        key = (r.get("hook", ""), r.get("subject", ""), r.get("decision", ""))
+        us = float(r.get("us", 0.0))
+        s = stats.get(key)
+        if s is None:
+            stats[key] = [1, us, us]
+        else:
+            s[0] += 1
+            s[1] += us
+            if us > s[2]:
+                s[2] = us
+    return stats
+
+
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+def latency_summary(histogram: dict[tuple[str, str], list[int]], hook: str | None) -> list[dict]:
+    """One row per hook: calls by outcome and percentiles (bucket upper bounds, us) over all calls."""
+    merged: dict[str, list[int]] = {}
+    outcomes: dict[str, dict[str, int]] = {}
+    for (h, outcome), counts in histogram.items():
+        if hook and h != hook:
+            continue
+        total = merged.setdefault(h, [0] * audit.BUCKETS)
+        for i, n in enumerate(counts):
+            total[i] += n
+        outcomes.setdefault(h, {})[outcome] = sum(counts)
+    rows = []
+    for h, counts in sorted(merged.items()):
+        top = max(i for i, n in enumerate(counts) if n)
+        row = {"hook": h, "calls": sum(counts), **{o: outcomes[h].get(o, 0) for o in audit.OUTCOMES[1:]}}
+        row.update({f"p{q:g}_us": audit.percentile(counts, q) for q in PERCENTILES})
+        row["max_us"] = audit.bucket_floor(top + 1)
+        rows.append(row)
+    return rows
+
+
+def print_latency(path: str, hook: str | None, as_json: bool) -> int:
+    rows = latency_summary(audit.latency_histogram(path), hook)
+    if as_json:
+        print(json.dumps(rows, indent=2))
+        return 0
+    if not rows:
+        print(f"No latency entries in {path}")
+        return 0
+    heads = [f"p{q:g}" for q in PERCENTILES]
+    print(f"  {'hook':13} {'calls':>8} {'timeout':>8} {'error':>6} " + " ".join(f"{h:>9}" for h in heads) + f" {'max':>9}")
+    for row in rows:
+        values = [row[f"{h}_us"] for h in heads] + [row["max_us"]]
+        print(
+            f"  {row['hook']:13} {row['calls']:8} {row['timeout']:8} {row['error']:6} "
+            + " ".join(f"{_ms(v):>9}" for v in values)
+        )
+    print("\n  Times are upper bounds of log-scale buckets (within 25%).")
+    return 0
+
+
+def _ms(us: int) -> str:
+    return f"{us / 1000:.2f}ms" if us < 1_000_000 else f"{us / 1e6:.2f}s"
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Summarize the guard hook audit log.")
+    p.add_argument("--log", default=None, help="Audit log path (default: $CURSOR_HOOK_AUDIT_LOG or state dir).")
+    p.add_argument("--hook", default=None, help="Only this hook (mcp-write, secret-write, shell-secret).")
+    p.add_argument("--decision", default=None, help="Only this decision (allow, ask, deny).")
+    p.add_argument("--since", type=float, default=None, help="Only records from the last N hours.")
+    p.add_argument("--top", type=int, default=30, help="Rows to print (default: 30).")
+    p.add_argument("--json", action="store_true", help="Emit JSON instead of a table.")
+    p.add_argument("--latency", action="store_true", help="Summarize the latency histogram instead of the log.")
+    p.add_argument("--histogram", default=None, help="Histogram path (default: $CURSOR_HOOK_LATENCY_LOG or next to the log).")
+    args = p.parse_args()
+
+    if args.latency:
+        return print_latency(args.histogram or audit.latency_path(), args.hook, args.json)
+
+    since = time.time() - args.since * 3600 if args.since else None
+    path = args.log or audit.log_path()
+    stats = summarize(audit.iter_records(path), args.hook, args.decision, since)
+    rows = sorted(stats.items(), key=lambda kv: kv[1][0], reverse=True)
+
+    if args.json:
+        print(json.dumps([
+            {"hook": h, "subject": s, "decision": d, "count": int(c), "avg_us": round(t / c, 1), "max_us": m}
+            for (h, s, d), (c, t, m) in rows
+        ], indent=2))
+        return 0
+
+    if not rows:
+        print(f"No audit records in {path}")
+        return 0
+    totals: dict[tuple[str, str], int] = {}
+    for (h, _, d), (c, _, _) in rows:
+        totals[(h, d)] = totals.get((h, d), 0) + int(c)
+    print("Decisions:")
+    for (h, d), c in sorted(totals.items()):
+        print(f"  {h:13} {d:6} {c:8}")
+    print("")
+    print(f"  {'hook':13} {'decision':8} {'count':>8} {'avg us':>9} {'max us':>9}  subject")
+    for (h, s, d), (c, t, m) in rows[: args.top]:
+        print(f"  {h:13} {d:8} {int(c):8} {t / c:9.1f} {m:9.1f}  {s}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
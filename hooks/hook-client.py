@@ -0,0 +1,69 @@
+#!/usr/bin/env -S python3 -I -S
+"""
+Cursor hook entrypoint for all hook types: forward the payload to hook-server.py.
+
+Usage (in hooks.json): .cursor/hooks/hook-client.py <hook>
+  where <hook> is mcp-write, secret-write or shell-secret.
+
+Same stdin/stdout contract and exit codes as the guard-*.py scripts. If the
+hook server is not running, the hook is evaluated in-process instead, loading
+only that hook's guard module and rules.
+
+The hook's time budget (guardlib/runtime.py) starts before stdin is read and
+covers the server round trip or the local evaluation. When it runs out, or the
+server accepts but does not answer in time, the hook's fallback decision is
+printed; the payload is not evaluated a second time.
+
+Runs isolated and site-free (-I -S): no user site-packages, no PYTHON* variables,
+no .pth processing. -I also leaves the script directory off sys.path, so it is
+added explicitly. The same file is the __main__ of the zip bundle built by
+scripts/build-hook-bundle.py.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.realpath(__file__)))
+
+from guardlib import ipc, runtime  # noqa: E402
+
+
+def main() -> int:
+    if len(sys.argv) != 2:
+        print("Usage: hook-client.py <hook>", file=sys.stderr)
+        return 2
+    hook = sys.argv[1]
+    budget = runtime.settings(hook)[0]
+    runtime.arm(budget)
+    stage = "stdin"
+    try:
+        raw = sys.stdin.buffer.read()
+        stage = "server"
+        try:
+            out, code = ipc.request(hook, raw, timeout=budget)
+        except TimeoutError:
+            raise runtime.DeadlineExceeded from None
+        except (OSError, ValueError, AttributeError):
+            # Server down, stale socket, socket of another user, or no AF_UNIX support: evaluate locally.
+            stage = None
+            from guardlib import registry
+
+            try:
+                out, code = registry.run_hook(hook, raw.decode("utf-8", errors="replace"))
+            except ValueError as e:
+                print(f"Error: {e}", file=sys.stderr)
+                return 2
+    except runtime.DeadlineExceeded:
+        from guardlib import registry
+
+        out, code = registry.fallback(hook, "timeout", stage, budget * 1e6)
+    finally:
+        runtime.disarm()
+    print(out)
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Long-lived Cursor hook server: keeps all guard hooks loaded and answers over a Unix socket.
+
+Avoids a cold interpreter start (plus json/re imports and pattern setup) on every
+tool call. Clients connect via hook-client.py; see guardlib/ipc.py for the protocol.
+Each evaluation runs in a worker thread bounded by the hook's budget
+(guardlib/runtime.py); past it, the fallback decision is sent.
+
+Usage:
+  hook-server.py [--socket PATH]        # run in the foreground
+  hook-server.py --stop [--socket PATH] # stop a running server
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import socketserver
+import sys
+import threading
+
+from guardlib import audit, ipc, registry
+
+
+class HookHandler(socketserver.BaseRequestHandler):
+    def handle(self) -> None:
+        data = ipc.recv_all(self.request)
+        head, _, raw = data.partition(b"\n")
+        hook = head.decode("utf-8", errors="replace").strip()
+        if hook == "__ping__":
+            self.request.sendall(b"0\npong")
+            return
+        if hook == "__stop__":
+            self.request.sendall(b"0\nstopping")
+            threading.Thread(target=self.server.shutdown).start()
+            return
+        try:
+            out, code = registry.run_hook(hook, raw.decode("utf-8", errors="replace"))
+        except ValueError as e:
+            # Unknown hook name: let the client fall back to its own evaluation.
+            print(f"hook-server: {e}", file=sys.stderr)
+            return
+        try:
+            self.request.sendall(f"{code}\n{out}".encode("utf-8"))
+        except OSError:
+            pass  # the client's own budget ran out first and it printed the fallback
+
+
+class HookServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def service_actions(self) -> None:
+        audit.flush_if_due()
+
+
+def serve(path: str) -> int:
+    if os.path.exists(path):
+        try:
+            ipc.request("__ping__", b"", path)
+            print(f"Error: hook server already running on {path}", file=sys.stderr)
+            return 1
+        except PermissionError as e:
+            print(f"Error: {e}; set CURSOR_HOOK_SOCKET or XDG_RUNTIME_DIR", file=sys.stderr)
+            return 1
+        except OSError:
+            os.unlink(path)  # stale socket from a crashed server
+    for name in registry.HOOK_SCRIPTS:
+        registry.load_hook(name)
+    old_umask = os.umask(0o177)
+    try:
+        server = HookServer(path, HookHandler)
+    finally:
+        os.umask(old_umask)
+    print(f"hook-server listening on {path}", file=sys.stderr)
+    try:
+        server.serve_forever(poll_interval=0.2)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Serve Cursor guard hooks over a Unix socket.")
+    parser.add_argument("--socket", default=None, help="Socket path (default: $CURSOR_HOOK_SOCKET or runtime dir).")
+    parser.add_argument("--stop", action="store_true", help="Stop the server listening on the socket.")
+    args = parser.parse_args()
+    path = args.socket or ipc.socket_path()
+    if args.stop:
+        try:
+            ipc.request("__stop__", b"", path)
+        except OSError:
+            print(f"No hook server running on {path}", file=sys.stderr)
+            return 1
+        return 0
+    return serve(path)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,514 @@
+#!/usr/bin/env python3
+"""
+MCP usage analyzer: per-server and per-tool calls, errors and durations from Cursor's logs.
+
+Streams Cursor's MCP log files in one pass, line by line, with memory bounded by
+the number of distinct servers and tools (never by log size):
+
+- MCP log files are found under Cursor's log directories (or --logs DIR/FILE):
+  any *.log, rotated *.log.N and compressed *.gz file with "mcp" in its path.
+  .gz files are decompressed while streaming.
+- A server's name comes from the file name ("MCP user-github.log" -> github),
+  else from a "[server]" tag after the log level.
+- Calls are the "CallTool"/"Calling tool 'x'" lines; a following "Successfully
+  called tool 'x'" or "Error calling tool 'x'" line on the same server ends the
+  call, and the time between the two is its duration. Durations go into a
+  fixed set of log-scale buckets, so percentiles need no sample lists.
+- Server starts ("Starting new stdio process", "Creating client") are counted:
+  each one is a container start paid.
+
+The result is compared with mcp.json: configured servers with no calls are
+unused, servers with fewer than --rare calls are rarely used; both still pay
+their start-up in every session.
+
+--state FILE makes runs incremental: the read offset of every file and the
+running totals are saved, and the next run only reads what was appended. Files
+are recognized by path and inode or by their first bytes, so a log that was
+rotated (renamed, or compressed to .gz) continues where it was, not from zero.
+A call still open at the end of a run is counted but gets no duration.
+
+Writes JSON (default ~/.cursor/test-results/mcp-usage-analysis-<timestamp>.json)
+and prints a table.
+
+Usage:
+  analyze-mcp-usage.py [--logs DIR_OR_FILE ...] [--config mcp.json] [--state FILE]
+                       [--reset] [--rare N] [--out FILE] [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import glob
+import gzip
+import json
+import math
+import os
+import re
+import sys
+import time
+from typing import Any, Dict, IO, Iterator, List, Optional, Tuple
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPTS_DIR)
+import mcp_stdio  # noqa: E402
+
+STATE_VERSION = 1
+HEAD_BYTES = 256
+CHUNK_BYTES = 4 << 20
+PENDING_PER_TOOL = 64
+# Duration buckets: bucket i holds durations up to BUCKET_BASE ** i ms.
+BUCKET_BASE = 1.25
+
+_TIMESTAMP = re.compile(r"(\d{4})-(\d\d)-(\d\d)[ T](\d\d):(\d\d):(\d\d)(?:[.,](\d{1,6}))?")
+_LEVEL_TAG = re.compile(r"\[(?:info|warning|warn|error|debug|trace)\]\s*\[([^\]]{1,80})\]", re.IGNORECASE)
+_ERROR_LEVEL = re.compile(r"\[error\]", re.IGNORECASE)
+_CALL_START = re.compile(r"(?:Handling CallTool action for tool|Calling tool) '([^']{1,200})'")
+_CALL_OK = re.compile(r"Successfully called tool '([^']{1,200})'")
+_CALL_ERROR = re.compile(r"(?:Error calling tool|Failed to call tool|Tool call failed)(?: '([^']{1,200})')?")
+_SERVER_START = re.compile(r"Starting new stdio process|Creating (?:stdio |streamableHttp |SSE )?client|Connecting to (?:streamableHttp|SSE) server")
+# Only lines with one of these words are decoded and parsed; the rest are just counted.
+_INTERESTING = (b"tool", b"rror", b"ERROR", b"process", b"client", b"Connecting")
+_FILE_SERVER = re.compile(r"^MCP (?:user|project)-(.+?)\.log|^MCP (?!Logs?\b)(.+?)\.log", re.IGNORECASE)
+
+
+def default_log_roots() -> List[str]:
+    """Cursor's log directories on Linux, macOS, Windows and (from WSL) the Windows side."""
+    home = os.path.expanduser("~")
+    roots = [
+        os.path.join(os.environ.get("XDG_CONFIG_HOME") or os.path.join(home, ".config"), "Cursor", "logs"),
+        os.path.join(home, "Library", "Application Support", "Cursor", "logs"),
+    ]
+    if os.environ.get("APPDATA"):
+        roots.append(os.path.join(os.environ["APPDATA"], "Cursor", "logs"))
+    roots += glob.glob("/mnt/c/Users/*/AppData/Roaming/Cursor/logs")
+    return [r for r in roots if os.path.isdir(r)]
+
+
+def is_mcp_log(path: str) -> bool:
+    name = os.path.basename(path)
+    if not re.search(r"\.log(?:\.\d+)?(?:\.gz)?$|\.gz$", name):
+        return False
+    return "mcp" in path.lower()
+
+
+def find_log_files(targets: List[str]) -> List[str]:
+    """MCP log files under the targets, oldest first (so rotated parts come before current ones)."""
+    files = set()
+    for target in targets:
+        if os.path.isfile(target):
+            files.add(os.path.abspath(target))
+            continue
+        for dirpath, _, names in os.walk(target):
+            for name in names:
+                path = os.path.join(dirpath, name)
+                if is_mcp_log(path):
+                    files.add(os.path.abspath(path))
+
+    def mtime(path: str) -> float:
+        try:
+            return os.stat(path).st_mtime
+        except OSError:
+            return 0.0
+
+    return sorted(files, key=lambda p: (mtime(p), p))
+
+
+def server_from_filename(path: str) -> Optional[str]:
+    name = re.sub(r"(?:\.\d+)?(?:\.gz)?$", "", os.path.basename(path))
+    match = _FILE_SERVER.match(name)
+    if not match:
+        return None
+    return match.group(1) or match.group(2)
+
+
+_day_cache: Dict[Tuple[int, int, int], float] = {}
+
+
+def parse_timestamp(line: str) -> Optional[float]:
+    """Seconds (local wall clock, arbitrary epoch) of a line's leading timestamp, or None."""
+    match = _TIMESTAMP.match(line)
+    if not match:
+        return None
+    y, mo, d, h, mi, s, frac = match.groups()
+    day = (int(y), int(mo), int(d))
+    base = _day_cache.get(day)
+    if base is None:
+        try:
+            base = datetime.date(*day).toordinal() * 86400.0
+        except ValueError:
+            return None
+        _day_cache[day] = base
+    return base + int(h) * 3600 + int(mi) * 60 + int(s) + (int(frac) / 10 ** len(frac) if frac else 0.0)
+
+
+class ToolStats:
+    """Counts and a bucketed duration histogram for one (server, tool)."""
+
+    __slots__ = ("calls", "ok", "errors", "timed", "total_ms", "max_ms", "buckets")
+
+    def __init__(self) -> None:
+        self.calls = self.ok = self.errors = self.timed = 0
+        self.total_ms = self.max_ms = 0.0
+        self.buckets: Dict[int, int] = {}
+
+    def add_duration(self, ms: float) -> None:
+        self.timed += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        index = 0 if ms <= 1 else math.ceil(math.log(ms, BUCKET_BASE))
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def percentile(self, p: float) -> Optional[float]:
+        if not self.timed:
+            return None
+        rank = max(1, math.ceil(p / 100 * self.timed))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(self.max_ms, BUCKET_BASE ** index)
+        return self.max_ms
+
+    def merge(self, other: "ToolStats") -> None:
+        self.calls += other.calls
+        self.ok += other.ok
+        self.errors += other.errors
+        self.timed += other.timed
+        self.total_ms += other.total_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls, "ok": self.ok, "errors": self.errors, "timed": self.timed,
+            "total_ms": round(self.total_ms, 3), "max_ms": round(self.max_ms, 3),
+            "buckets": {str(k): v for k, v in sorted(self.buckets.items())},
+        }
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "ToolStats":
+        stats = cls()
+        for key in ("calls", "ok", "errors", "timed"):
+            setattr(stats, key, int(data.get(key, 0)))
+        stats.total_ms, stats.max_ms = float(data.get("total_ms", 0)), float(data.get("max_ms", 0))
+        stats.buckets = {int(k): int(v) for k, v in (data.get("buckets") or {}).items()}
+        return stats
+
+
+class Usage:
+    """Running totals: per server (starts, error lines) and per (server, tool) ToolStats."""
+
+    def __init__(self) -> None:
+        self.tools: Dict[str, Dict[str, ToolStats]] = {}
+        self.starts: Dict[str, int] = {}
+        self.error_lines: Dict[str, int] = {}
+        self.lines = 0
+        self.bytes = 0
+        self.pending: Dict[Tuple[str, str], List[float]] = {}
+
+    def tool(self, server: str, name: str) -> ToolStats:
+        per_server = self.tools.setdefault(server, {})
+        stats = per_server.get(name)
+        if stats is None:
+            stats = per_server[name] = ToolStats()
+        return stats
+
+    def feed(self, line: str, file_server: Optional[str]) -> None:
+        """Count one decoded log line; lines without an _INTERESTING word need not be fed."""
+        has_tool = "tool" in line
+        is_error = _ERROR_LEVEL.search(line) is not None
+        server = file_server
+        if server is None:
+            tag = _LEVEL_TAG.search(line)
+            server = tag.group(1) if tag else "(unknown)"
+        if has_tool:
+            match = _CALL_START.search(line)
+            if match:
+                name = match.group(1)
+                self.tool(server, name).calls += 1
+                ts = parse_timestamp(line)
+                if ts is not None:
+                    pending = self.pending.setdefault((server, name), [])
+                    pending.append(ts)
+                    if len(pending) > PENDING_PER_TOOL:
+                        del pending[0]
+                return
+            match = _CALL_OK.search(line)
+            ok = match is not None
+            if not ok:
+                match = _CALL_ERROR.search(line)
+            if match:
+                name = match.group(1)
+                if name is None:
+                    # Error line without a tool name: the oldest call still open on this server.
+                    open_calls = [(times[0], tool) for (srv, tool), times in self.pending.items() if srv == server and times]
+                    name = min(open_calls)[1] if open_calls else "(unknown)"
+                stats = self.tool(server, name)
+                if ok:
+                    stats.ok += 1
+                else:
+                    stats.errors += 1
+                pending = self.pending.get((server, name))
+                ts = parse_timestamp(line)
+                if pending and ts is not None:
+                    stats.add_duration(max(0.0, (ts - pending.pop(0)) * 1000))
+                return
+        if _SERVER_START.search(line):
+            self.starts[server] = self.starts.get(server, 0) + 1
+        elif is_error:
+            self.error_lines[server] = self.error_lines.get(server, 0) + 1
+
+    def servers(self) -> List[str]:
+        return sorted(set(self.tools) | set(self.starts) | set(self.error_lines))
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "tools": {s: {t: st.to_json() for t, st in tools.items()} for s, tools in self.tools.items()},
+            "starts": self.starts,
+            "error_lines": self.error_lines,
+            "lines": self.lines,
+            "bytes": self.bytes,
+        }
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "Usage":
+        usage = cls()
+        usage.tools = {s: {t: ToolStats.from_json(st) for t, st in tools.items()} for s, tools in (data.get("tools") or {}).items()}
+        usage.starts = {k: int(v) for k, v in (data.get("starts") or {}).items()}
+        usage.error_lines = {k: int(v) for k, v in (data.get("error_lines") or {}).items()}
+        usage.lines, usage.bytes = int(data.get("lines", 0)), int(data.get("bytes", 0))
+        return usage
+
+
+def _open(path: str) -> IO[bytes]:
+    return gzip.open(path, "rb") if path.endswith(".gz") else open(path, "rb", buffering=1 << 20)  # type: ignore[return-value]
+
+
+def file_identity(path: str) -> Dict[str, Any]:
+    """inode, size, mtime and the first bytes of the (decompressed) content."""
+    st = os.stat(path)
+    with _open(path) as f:
+        head = f.read(HEAD_BYTES)
+    return {"inode": st.st_ino, "size": st.st_size, "mtime": st.st_mtime, "head": head.hex()}
+
+
+def resume_offset(path: str, identity: Dict[str, Any], seen_files: Dict[str, Any]) -> Optional[int]:
+    """Content offset to continue path from: 0 (new), an offset, or None (nothing new).
+
+    A file is recognized by its path and inode, or, after rotation (renamed, or
+    compressed to .gz), by its first HEAD_BYTES bytes, so rotated logs are not
+    counted twice. Offsets count decompressed bytes.
+    """
+    seen = seen_files.get(path)
+    if seen and seen.get("size") == identity["size"] and seen.get("mtime") == identity["mtime"] and seen.get("head") == identity["head"]:
+        return None
+    if not (seen and seen.get("head") == identity["head"] and (seen.get("inode") == identity["inode"] or path.endswith(".gz"))):
+        full_head = len(identity["head"]) == HEAD_BYTES * 2
+        seen = next((e for e in seen_files.values() if full_head and e.get("head") == identity["head"]), None)
+    if not seen:
+        return 0
+    offset = int(seen.get("offset", 0))
+    if not path.endswith(".gz") and identity["size"] < offset:
+        return 0  # truncated and rewritten
+    return offset
+
+
+def iter_chunks(path: str, offset: int) -> Iterator[Tuple[bytes, int]]:
+    """(block of complete lines, content offset after it) from offset on; the last partial line waits."""
+    with _open(path) as f:
+        if path.endswith(".gz"):
+            remaining = offset
+            while remaining > 0:  # gzip streams cannot seek cheaply; skip by reading
+                chunk = f.read(min(remaining, CHUNK_BYTES))
+                if not chunk:
+                    return
+                remaining -= len(chunk)
+        else:
+            f.seek(offset)
+        position, carry = offset, b""
+        while True:
+            data = f.read(CHUNK_BYTES)
+            if not data:
+                return
+            data = carry + data
+            cut = data.rfind(b"\n") + 1
+            carry = data[cut:]
+            if cut:
+                position += cut
+                yield data[:cut], position
+
+
+def interesting_lines(block: bytes) -> Iterator[bytes]:
+    """Lines of block containing any _INTERESTING word, in order; found with bytes.find, not per line."""
+    starts = set()
+    for word in _INTERESTING:
+        i = block.find(word)
+        while i != -1:
+            starts.add(block.rfind(b"\n", 0, i) + 1)
+            i = block.find(word, block.find(b"\n", i))
+    for start in sorted(starts):
+        yield block[start : block.find(b"\n", start) + 1]
+
+
+def analyze(files: List[str], usage: Usage, seen_files: Dict[str, Any]) -> Dict[str, Any]:
+    """Feed new lines of every file into usage; returns the per-file state for the next run."""
+    new_state: Dict[str, Any] = {}
+    for path in files:
+        try:
+            identity = file_identity(path)
+        except (OSError, EOFError) as e:
+            print(f"  skipping {path}: {e}", file=sys.stderr)
+            continue
+        offset = resume_offset(path, identity, seen_files)
+        if offset is None:
+            new_state[path] = seen_files[path]
+            continue
+        file_server = server_from_filename(path)
+        position = offset
+        try:
+            for block, position in iter_chunks(path, offset):
+                usage.bytes += len(block)
+                usage.lines += block.count(b"\n")
+                for raw in interesting_lines(block):
+                    usage.feed(raw.decode("utf-8", errors="replace"), file_server)
+        except (OSError, EOFError) as e:
+            print(f"  {path}: stopped early: {e}", file=sys.stderr)
+        new_state[path] = {**identity, "offset": position}
+    return new_state
+
+
+def load_state(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return state if isinstance(state, dict) and state.get("version") == STATE_VERSION else {}
+
+
+def save_state(path: str, files: Dict[str, Any], usage: Usage) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"version": STATE_VERSION, "files": files, "usage": usage.to_json()}, f)
+    os.replace(tmp, path)
+
+
+def build_report(usage: Usage, configured: List[str], rare: int) -> Dict[str, Any]:
+    servers = {}
+    for server in sorted(set(usage.servers()) | set(configured)):
+        tools = usage.tools.get(server, {})
+        total = ToolStats()
+        for stats in tools.values():
+            total.merge(stats)
+        servers[server] = {
+            "configured": server in configured,
+            "starts": usage.starts.get(server, 0),
+            "calls": total.calls,
+            "errors": total.errors,
+            "error_rate": round(total.errors / total.calls, 4) if total.calls else 0.0,
+            "error_lines": usage.error_lines.get(server, 0),
+            "duration_ms": _durations(total),
+            "tools": {
+                name: {
+                    "calls": s.calls,
+                    "errors": s.errors,
+                    "error_rate": round(s.errors / s.calls, 4) if s.calls else 0.0,
+                    "duration_ms": _durations(s),
+                }
+                for name, s in sorted(tools.items(), key=lambda kv: -kv[1].calls)
+            },
+        }
+    unused = [s for s in configured if servers[s]["calls"] == 0]
+    rarely = [s for s in configured if 0 < servers[s]["calls"] < rare]
+    return {
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "lines": usage.lines,
+        "bytes": usage.bytes,
+        "configuredServers": configured,
+        "servers": servers,
+        "unused": unused,
+        "rarelyUsed": rarely,
+        "unconfigured": [s for s in servers if not servers[s]["configured"] and s != "(unknown)"],
+    }
+
+
+def _durations(stats: ToolStats) -> Dict[str, Any]:
+    if not stats.timed:
+        return {}
+    return {
+        "p50": round(stats.percentile(50) or 0, 1),
+        "p95": round(stats.percentile(95) or 0, 1),
+        "mean": round(stats.total_ms / stats.timed, 1),
+        "max": round(stats.max_ms, 1),
+    }
+
+
+def print_table(report: Dict[str, Any]) -> None:
+    print(f"  {'server':22} {'cfg':3} {'starts':>6} {'calls':>7} {'err%':>6} {'p50 ms':>8} {'p95 ms':>8}  top tools")
+    for name, s in sorted(report["servers"].items(), key=lambda kv: -kv[1]["calls"]):
+        top = ", ".join(f"{t} {v['calls']}" for t, v in list(s["tools"].items())[:3])
+        d = s["duration_ms"]
+        print(
+            f"  {name:22} {'yes' if s['configured'] else 'no':3} {s['starts']:6} {s['calls']:7} "
+            f"{s['error_rate'] * 100:5.1f}% {d.get('p50', '-'):>8} {d.get('p95', '-'):>8}  {top}"
+        )
+    if report["unused"]:
+        print(f"\n  Unused (configured, no calls; still started every session): {', '.join(report['unused'])}")
+    if report["rarelyUsed"]:
+        print(f"  Rarely used: {', '.join(report['rarelyUsed'])}")
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Per-server and per-tool MCP usage from Cursor's logs, compared with mcp.json.")
+    p.add_argument("--logs", action="append", help="Log directory or file (repeatable; default: Cursor's log directories).")
+    p.add_argument("--config", default=None, help=f"mcp.json (default: ${mcp_stdio.MCP_CONFIG_ENV} or the repo's mcp.json).")
+    p.add_argument("--state", default=None, help="Resume state file: only read what was appended since the last run.")
+    p.add_argument("--reset", action="store_true", help="With --state: start over.")
+    p.add_argument("--rare", type=int, default=5, help="Servers with fewer calls are listed as rarely used (default: 5).")
+    p.add_argument("--out", default=None, help="Report JSON (default: ~/.cursor/test-results/mcp-usage-analysis-<timestamp>.json; '-' = none).")
+    p.add_argument("--json", action="store_true", help="Print the report JSON instead of the table.")
+    args = p.parse_args()
+
+    try:
+        configured = list(mcp_stdio.load_servers(args.config))
+    except (OSError, ValueError) as e:
+        print(f"Error: cannot read mcp.json: {e}", file=sys.stderr)
+        return 1
+    targets = args.logs or default_log_roots()
+    if not targets:
+        print("Error: no Cursor log directory found; pass --logs DIR", file=sys.stderr)
+        return 1
+
+    state = {} if (args.reset or not args.state) else load_state(args.state)
+    usage = Usage.from_json(state["usage"]) if state.get("usage") else Usage()
+    t0 = time.perf_counter()
+    files = find_log_files(targets)
+    bytes_before = usage.bytes
+    file_state = analyze(files, usage, state.get("files", {}))
+    elapsed = time.perf_counter() - t0
+    if args.state:
+        save_state(args.state, file_state, usage)
+
+    report = build_report(usage, configured, args.rare)
+    report["logFiles"] = len(files)
+    read = usage.bytes - bytes_before
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_table(report)
+    print(f"\n  {len(files)} log files, {read / 1e6:.1f} MB read in {elapsed:.2f} s ({read / 1e6 / max(elapsed, 1e-9):.0f} MB/s)", file=sys.stderr)
+    if args.out != "-":
+        out = args.out or os.path.join(os.path.expanduser("~"), ".cursor", "test-results", f"mcp-usage-analysis-{time.strftime('%Y%m%d-%H%M%S')}.json")
+        os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+        with open(out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"  Report saved to: {out}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Payload-size benchmark for guard-secret-write: allow latency and memory as Writes grow.
+
+For each --sizes content size and layout, builds a Write payload and times
+evaluate() in-process (p50 of --runs). It compares that with json.loads of the
+same payload, which is what every allow cost before guardlib/payload.py. It also
+records peak allocation (tracemalloc) for both. Layouts:
+
+- object: tool_input {"content": ..., "path": "src/app.py"} (path after the content)
+- string: tool_input as a JSON string with file_path (decoded twice before)
+- sensitive: path .env with clean content (full parse + scan; for reference)
+
+An allow reads only the path keys and decodes nothing else. Its time is one pass
+of str.find over the payload, and its memory stays flat. Exits 1 if an ordinary
+path is not allowed, or if its p50 at the largest size is not below json.loads.
+
+Usage:
+  bench-hook-payload.py [--sizes 1K,64K,1M,4M,16M] [--runs N] [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "hooks"))
+from guardlib import registry  # noqa: E402
+
+UNITS = {"K": 1 << 10, "M": 1 << 20}
+
+
+def parse_size(text: str) -> int:
+    text = text.strip().upper()
+    return int(text[:-1]) * UNITS[text[-1]] if text[-1:] in UNITS else int(text)
+
+
+def _content(size: int) -> str:
+    """Code-like, secret-free text with quotes and backslashes (escaped in JSON)."""
+    line = 'value = compute("item", path="src/{0}.py", sep="\\\\")  # generated\n'
+    return (line * (size // len(line) + 1))[:size]
+
+
+def payloads(size: int) -> Dict[str, str]:
+    content = _content(size)
+    return {
+        "object": json.dumps({"tool_name": "Write", "tool_input": {"content": content, "path": "src/app.py"}}),
+        "string": json.dumps({"tool_name": "Write", "tool_input": json.dumps({"content": content, "file_path": "src/app.py"})}),
+        "sensitive": json.dumps({"tool_name": "Write", "tool_input": {"content": content, "path": ".env"}}),
+    }
+
+
+def p50_ms(fn: Callable[[], Any], runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def peak_kb(fn: Callable[[], Any]) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Time guard-secret-write allow decisions as payloads grow.")
+    p.add_argument("--sizes", default="1K,64K,1M,4M,16M", help="Content sizes (default: 1K,64K,1M,4M,16M).")
+    p.add_argument("--runs", type=int, default=7, help="Timed runs per payload (default: 7).")
+    p.add_argument("--json", action="store_true", help="Print results as JSON.")
+    args = p.parse_args()
+
+    guard = registry.load_hook("secret-write")
+    sizes = [parse_size(s) for s in args.sizes.split(",") if s.strip()]
+    results: List[Dict[str, Any]] = []
+    problems: List[str] = []
+    for size in sizes:
+        for layout, raw in payloads(size).items():
+            decision = guard.evaluate(raw)[0]["decision"]
+            if layout != "sensitive" and decision != "allow":
+                problems.append(f"{layout} {size}: {decision} for src/app.py")
+            row = {
+                "layout": layout,
+                "content_bytes": size,
+                "payload_bytes": len(raw),
+                "decision": decision,
+                "evaluate_ms": round(p50_ms(lambda: guard.evaluate(raw), args.runs), 3),
+                "json_loads_ms": round(p50_ms(lambda: json.loads(raw), args.runs), 3),
+                "evaluate_peak_kb": round(peak_kb(lambda: guard.evaluate(raw)), 1),
+                "json_loads_peak_kb": round(peak_kb(lambda: json.loads(raw)), 1),
+            }
+            results.append(row)
+
+    largest = max(sizes)
+    for row in results:
+        if row["layout"] != "sensitive" and row["content_bytes"] == largest and row["evaluate_ms"] >= row["json_loads_ms"]:
+            problems.append(f"{row['layout']} {largest}: allow {row['evaluate_ms']} ms is not below json.loads {row['json_loads_ms']} ms")
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"  {'layout':10} {'content':>9} {'decision':8} {'evaluate ms':>12} {'json.loads ms':>14} {'evaluate KiB':>13} {'json.loads KiB':>15}")
+        for row in results:
+            print(
+                f"  {row['layout']:10} {row['content_bytes']:>9} {row['decision']:8} {row['evaluate_ms']:>12.3f} "
+                f"{row['json_loads_ms']:>14.3f} {row['evaluate_peak_kb']:>13.1f} {row['json_loads_peak_kb']:>15.1f}"
+            )
+    if problems:
+        print("\nProblems:", file=sys.stderr)
+        for line in problems:
+            print(f"  ✗ {line}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Hook latency benchmark: replay a payload corpus through the guard hooks in hooks/.
+
+Measures, per hook:
+- import time: loading the hook module (and its rules) in a fresh interpreter
+- cold start: wall time of `python3 hooks/guard-*.py` per call (subprocess mode)
+- decision latency: p50/p95/p99 of evaluate() in an already-loaded process (in-process mode)
+
+Corpus entries may carry "expect" (allow/ask/deny); each such payload is also checked
+for accuracy and the false-positive rate (expected allow, got ask/deny) and
+false-negative rate are reported. Any mismatch makes the run exit 1.
+
+Rule scaling: the secret-write content group is searched over generated text with
+0, 10 and 50 extra guard-rules.json rules, to show the cost of each added rule.
+
+Results are JSON, so runs can be compared. With --baseline, the run is checked against
+a stored result and exits 1 on regressions; rule-count changes (WRITE_TOOLS,
+SECRET_CONTENT_PATTERNS, SENSITIVE_PATH_PATTERNS) are reported next to them.
+
+Usage:
+  bench-hooks.py [--corpus FILE] [--runs N] [--subprocess-runs N] [--output FILE]
+  bench-hooks.py --baseline scripts/bench/hook-baseline.json [--tolerance 0.25]
+  bench-hooks.py --save-baseline
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+HOOKS_DIR = REPO_ROOT / "hooks"
+BENCH_DIR = Path(__file__).resolve().parent / "bench"
+DEFAULT_CORPUS = BENCH_DIR / "hook-corpus.jsonl"
+DEFAULT_BASELINE = BENCH_DIR / "hook-baseline.json"
+
+# hooks.json event for each hook name (used to apply the shell matcher).
+HOOK_EVENTS = {
+    "mcp-write": "beforeMCPExecution",
+    "secret-write": "preToolUse",
+    "shell-secret": "beforeShellExecution",
+}
+
+# Extra content rules per rule-scaling case, and the text they are searched over.
+RULE_SCALING = (0, 10, 50)
+RULE_SCALING_BYTES = 64 * 1024
+
+# Regressions smaller than these absolute amounts are treated as noise.
+MIN_SLACK_US = 20.0
+MIN_SLACK_MS = 5.0
+
+sys.path.insert(0, str(HOOKS_DIR))
+from guardlib import registry, rulepack  # noqa: E402
+
+
+def _percentiles(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    n = len(ordered)
+
+    def pick(q: float) -> float:
+        return round(ordered[min(n - 1, int(q * n))], 2)
+
+    return {"p50": round(statistics.median(ordered), 2), "p95": pick(0.95), "p99": pick(0.99)}
+
+
+def _generated_content(size: int) -> str:
+    """Secret-free, code-like text of roughly size characters."""
+    lines = []
+    total = 0
+    i = 0
+    while total < size:
+        line = f"value_{i} = compute(item_{i}, factor={i % 97})  # generated\n"
+        lines.append(line)
+        total += len(line)
+        i += 1
+    return "".join(lines)[:size]
+
+
+def _shell_matchers() -> List[re.Pattern[str]]:
+    try:
+        with open(REPO_ROOT / "hooks.json", "r", encoding="utf-8") as f:
+            config = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return []
+    entries = config.get("hooks", {}).get(HOOK_EVENTS["shell-secret"], [])
+    return [re.compile(e["matcher"]) for e in entries if e.get("matcher")]
+
+
+def load_corpus(path: Path) -> List[Dict[str, Any]]:
+    """Read the corpus; expand generated Write payloads; drop shell commands hooks.json would not route."""
+    matchers = _shell_matchers()
+    entries = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            item = json.loads(line)
+            if "generate" in item:
+                gen = item["generate"]
+                payload = {"tool_name": "Write", "tool_input": {"path": gen["path"], "content": _generated_content(gen["size"])}}
+            else:
+                payload = item["payload"]
+            if item["hook"] == "shell-secret" and matchers:
+                if not any(m.search(payload.get("command", "")) for m in matchers):
+                    print(f"  skip {item['name']}: not matched by hooks.json", file=sys.stderr)
+                    continue
+            entries.append({"hook": item["hook"], "name": item["name"], "raw": json.dumps(payload), "expect": item.get("expect")})
+    return entries
+
+
+def rule_counts() -> Dict[str, int]:
+    mcp = registry.load_hook("mcp-write")
+    secret = registry.load_hook("secret-write")
+    return {
+        "WRITE_TOOLS": len(mcp.WRITE_TOOLS),
+        "SECRET_CONTENT_PATTERNS": len(secret.SECRET_CONTENT_PATTERNS),
+        "SENSITIVE_PATH_PATTERNS": len(secret.SENSITIVE_PATH_PATTERNS),
+    }
+
+
+def check_accuracy(entries: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Per hook: decisions vs corpus "expect" labels, with false-positive/negative rates."""
+    results: Dict[str, Dict[str, Any]] = {}
+    for entry in entries:
+        expected = entry.get("expect")
+        if not expected:
+            continue
+        out, _ = registry.load_hook(entry["hook"]).evaluate(entry["raw"])
+        got = out.get("permission")
+        r = results.setdefault(entry["hook"], {"checked": 0, "allow_expected": 0, "block_expected": 0,
+                                               "false_positives": [], "false_negatives": [], "mismatches": []})
+        r["checked"] += 1
+        r["allow_expected" if expected == "allow" else "block_expected"] += 1
+        if got == expected:
+            continue
+        if expected == "allow":
+            r["false_positives"].append(entry["name"])
+        elif got == "allow":
+            r["false_negatives"].append(entry["name"])
+        else:
+            r["mismatches"].append(f"{entry['name']} ({expected} -> {got})")
+    for r in results.values():
+        r["false_positive_rate"] = round(len(r["false_positives"]) / r["allow_expected"], 3) if r["allow_expected"] else 0.0
+        r["false_negative_rate"] = round(len(r["false_negatives"]) / r["block_expected"], 3) if r["block_expected"] else 0.0
+    return results
+
+
+def bench_in_process(entries: List[Dict[str, Any]], runs: int) -> Dict[str, Dict[str, float]]:
+    """Decision latency (microseconds) per payload, hooks already loaded."""
+    results = {}
+    for entry in entries:
+        module = registry.load_hook(entry["hook"])
+        raw = entry["raw"]
+        for _ in range(min(runs, 20)):
+            module.evaluate(raw)  # warm caches (rule pack, policy table)
+        samples = []
+        for _ in range(runs):
+            t0 = time.perf_counter()
+            module.evaluate(raw)
+            samples.append((time.perf_counter() - t0) * 1e6)
+        results[entry["name"]] = {"hook": entry["hook"], "bytes": len(raw), **_percentiles(samples)}
+    return results
+
+
+def bench_rule_scaling(runs: int) -> Dict[str, float]:
+    """Microseconds (p50) to search the secret-write content group, per number of extra rules."""
+    builtin = {"content": registry.load_hook("secret-write").SECRET_CONTENT_PATTERNS}
+    text = _generated_content(RULE_SCALING_BYTES)
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="hook-bench-rules-") as tmp:
+        for count in RULE_SCALING:
+            path = os.path.join(tmp, f"guard-rules-{count}.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"content": [{"name": f"svc-{i}", "pattern": f"svc{i}_key\\s*=\\s*\\S{{8,}}"} for i in range(count)]}, f)
+            group = rulepack.build(builtin, path)["content"]
+            group.search(text)
+            samples = []
+            for _ in range(runs):
+                t0 = time.perf_counter()
+                group.search(text)
+                samples.append((time.perf_counter() - t0) * 1e6)
+            results[str(count)] = round(statistics.median(samples), 2)
+    return results
+
+
+def bench_subprocess(entries: List[Dict[str, Any]], runs: int) -> Dict[str, Dict[str, float]]:
+    """Wall time (milliseconds) of one hook process per call, per payload."""
+    results = {}
+    for entry in entries:
+        script = HOOKS_DIR / registry.HOOK_SCRIPTS[entry["hook"]]
+        data = entry["raw"].encode("utf-8")
+        samples = []
+        for _ in range(runs):
+            t0 = time.perf_counter()
+            subprocess.run([sys.executable, str(script)], input=data, capture_output=True, check=False)
+            samples.append((time.perf_counter() - t0) * 1000)
+        results[entry["name"]] = {"hook": entry["hook"], "bytes": len(data), **_percentiles(samples)}
+    return results
+
+
+def bench_import(hook: str, runs: int) -> float:
+    """Median milliseconds to load one hook module in a fresh interpreter."""
+    code = (
+        "import sys, time; sys.path.insert(0, sys.argv[1]); t = time.perf_counter(); "
+        "from guardlib import registry; registry.load_hook(sys.argv[2]); "
+        "print((time.perf_counter() - t) * 1000)"
+    )
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", code, str(HOOKS_DIR), hook], capture_output=True, text=True, check=True
+        ).stdout
+        samples.append(float(out.strip()))
+    return round(statistics.median(samples), 2)
+
+
+def bench_interpreter(runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        samples.append((time.perf_counter() - t0) * 1000)
+    return round(statistics.median(samples), 2)
+
+
+def summarize(payloads: Dict[str, Dict[str, float]], cold: Dict[str, Dict[str, float]]) -> Dict[str, Dict[str, Any]]:
+    hooks: Dict[str, Dict[str, Any]] = {}
+    for hook in registry.HOOK_SCRIPTS:
+        names = [n for n, r in payloads.items() if r["hook"] == hook]
+        if not names:
+            continue
+        hooks[hook] = {
+            "decision_us": {q: round(max(payloads[n][q] for n in names), 2) for q in ("p50", "p95", "p99")},
+            "cold_start_ms": {q: round(max(cold[n][q] for n in names), 2) for q in ("p50", "p95", "p99")} if cold else {},
+        }
+    return hooks
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Regressions of current vs baseline, as human-readable lines."""
+    problems = []
+
+    def check(label: str, now: float, before: float, slack: float) -> None:
+        if now > before * (1 + tolerance) and now - before > slack:
+            problems.append(f"{label}: {before} -> {now} (+{(now / before - 1) * 100 if before else 0:.0f}%)")
+
+    for hook, cur in current["hooks"].items():
+        base = baseline.get("hooks", {}).get(hook)
+        if not base:
+            continue
+        check(f"{hook} decision p95 (us)", cur["decision_us"]["p95"], base["decision_us"]["p95"], MIN_SLACK_US)
+        if "import_ms" in cur and "import_ms" in base:
+            check(f"{hook} import (ms)", cur["import_ms"], base["import_ms"], MIN_SLACK_MS)
+        if cur.get("cold_start_ms") and base.get("cold_start_ms"):
+            check(f"{hook} cold start p50 (ms)", cur["cold_start_ms"]["p50"], base["cold_start_ms"]["p50"], MIN_SLACK_MS)
+    for name, cur in current["payloads"].items():
+        base = baseline.get("payloads", {}).get(name)
+        if base:
+            check(f"payload {name} p95 (us)", cur["p95"], base["p95"], MIN_SLACK_US)
+    for count, now in current.get("rule_scaling", {}).items():
+        before = baseline.get("rule_scaling", {}).get(count)
+        if before:
+            check(f"rule scaling +{count} rules p50 (us)", now, before, MIN_SLACK_US)
+    return problems
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Benchmark guard hook latency over a payload corpus.")
+    p.add_argument("--corpus", default=str(DEFAULT_CORPUS), help="JSONL corpus (default: scripts/bench/hook-corpus.jsonl).")
+    p.add_argument("--runs", type=int, default=200, help="In-process evaluations per payload (default: 200).")
+    p.add_argument("--subprocess-runs", type=int, default=5, help="Hook processes per payload; 0 skips subprocess mode (default: 5).")
+    p.add_argument("--import-runs", type=int, default=5, help="Fresh interpreters per hook for import time (default: 5).")
+    p.add_argument("--output", default=None, help="Write results JSON here (default: stdout).")
+    p.add_argument("--baseline", default=None, help="Compare against this results JSON; exit 1 on regression.")
+    p.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown vs baseline (default: 0.25).")
+    p.add_argument("--save-baseline", action="store_true", help=f"Also write results to {DEFAULT_BASELINE.relative_to(REPO_ROOT)}.")
+    args = p.parse_args()
+
+    # Keep rule-pack / policy caches out of the user's cache dir, but warm within the run.
+    os.environ["XDG_CACHE_HOME"] = tempfile.mkdtemp(prefix="hook-bench-")
+    os.environ["CURSOR_HOOK_AUDIT"] = "0"  # do not flood the user's audit log
+
+    entries = load_corpus(Path(args.corpus))
+    print(f"Benchmarking {len(entries)} payloads...", file=sys.stderr)
+    accuracy = check_accuracy(entries)
+    payloads = bench_in_process(entries, args.runs)
+    scaling = bench_rule_scaling(max(args.runs // 10, 5))
+    cold = bench_subprocess(entries, args.subprocess_runs) if args.subprocess_runs > 0 else {}
+    hooks = summarize(payloads, cold)
+    for hook in hooks:
+        hooks[hook]["import_ms"] = bench_import(hook, args.import_runs)
+
+    results = {
+        "meta": {
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "interpreter_start_ms": bench_interpreter(args.import_runs),
+            "rule_counts": rule_counts(),
+        },
+        "hooks": hooks,
+        "accuracy": accuracy,
+        "payloads": payloads,
+        "rule_scaling": scaling,
+        "subprocess": cold,
+    }
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    if args.save_baseline:
+        DEFAULT_BASELINE.write_text(text + "\n", encoding="utf-8")
+        print(f"Baseline saved to: {DEFAULT_BASELINE}", file=sys.stderr)
+
+    print("", file=sys.stderr)
+    for hook, r in hooks.items():
+        cs = r["cold_start_ms"].get("p50", "-") if r["cold_start_ms"] else "-"
+        d = r["decision_us"]
+        print(
+            f"  {hook:13} import {r['import_ms']:7.2f} ms  cold start p50 {cs} ms  "
+            f"decision p50/p95/p99 {d['p50']}/{d['p95']}/{d['p99']} us",
+            file=sys.stderr,
+        )
+
+    base_us = scaling[str(RULE_SCALING[0])]
+    print(
+        "  rule scaling: " + ", ".join(f"+{c} rules {us:.0f} us ({us / base_us:.2f}x)" for c, us in scaling.items()),
+        file=sys.stderr,
+    )
+
+    failed = False
+    for hook, r in accuracy.items():
+        print(
+            f"  {hook:13} accuracy: {r['checked']} labelled, false positives {r['false_positive_rate']:.1%}, "
+            f"false negatives {r['false_negative_rate']:.1%}",
+            file=sys.stderr,
+        )
+        for kind in ("false_positives", "false_negatives", "mismatches"):
+            for name in r[kind]:
+                print(f"    ✗ {kind[:-1].replace('_', ' ')}: {name}", file=sys.stderr)
+                failed = True
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        old_counts = baseline.get("meta", {}).get("rule_counts", {})
+        for name, count in results["meta"]["rule_counts"].items():
+            if name in old_counts and old_counts[name] != count:
+                print(f"  NOTE: {name} changed {old_counts[name]} -> {count}", file=sys.stderr)
+        problems = compare(results, baseline, args.tolerance)
+        if problems:
+            print("\nRegressions vs baseline:", file=sys.stderr)
+            for line in problems:
+                print(f"  ✗ {line}", file=sys.stderr)
+            return 1
+        print("\n  ✓ No regressions vs baseline", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
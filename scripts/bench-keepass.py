@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+keepass_ops.py latency benchmark: end-to-end `add` with and without session mode.
+
+Creates a throwaway database with `keepassxc-cli db-create` in a temp directory
+(your KEEPASS_DB_PATH is never touched), then runs keepass_ops.cmd_add for new
+entries under a nested group, once per mode:
+
+- one-shot: KEEPASS_SESSION=0, one keepassxc-cli process (and KDF run) per command
+- session:  one `keepassxc-cli open` process per add, as one keepass_ops.py call
+
+Each add starts from a fresh state (the session is closed afterwards), so the
+numbers match separate `keepass_ops.py add` calls minus interpreter start and
+keyring lookup. Key derivations are counted as keepassxc-cli process starts.
+
+Usage:
+  bench-keepass.py [--runs N] [--groups Project/env] [--cli PATH] [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import secrets
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import keepass_ops  # noqa: E402
+
+
+def create_database(path: str, password: str) -> None:
+    proc = subprocess.run(
+        [keepass_ops.cli_path(), "db-create", "-p", path],
+        input=f"{password}\n{password}\n",
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"db-create failed: {proc.stderr.strip()}")
+
+
+def bench_mode(db_path: str, group: str, runs: int, session: bool) -> Dict[str, Any]:
+    os.environ["KEEPASS_SESSION"] = "1" if session else "0"
+    starts = {"n": 0}
+    real_run, real_init = keepass_ops.subprocess.run, keepass_ops.CliSession.__init__
+
+    def counting_run(*args: Any, **kwargs: Any) -> Any:
+        starts["n"] += 1
+        return real_run(*args, **kwargs)
+
+    def counting_init(self: Any, *args: Any, **kwargs: Any) -> None:
+        starts["n"] += 1
+        real_init(self, *args, **kwargs)
+
+    keepass_ops.subprocess.run = counting_run  # type: ignore[assignment]
+    keepass_ops.CliSession.__init__ = counting_init  # type: ignore[method-assign]
+    samples = []
+    failures = 0
+    stdin = sys.stdin
+    try:
+        for i in range(runs):
+            keepass_ops._session_disabled = False
+            sys.stdin = io.StringIO(secrets.token_urlsafe(16) + "\n")
+            t0 = time.perf_counter()
+            code = keepass_ops.cmd_add(db_path, f"{group}/{'session' if session else 'oneshot'} {i}", "bench", True)
+            keepass_ops.close_sessions()
+            samples.append((time.perf_counter() - t0) * 1000)
+            failures += code != 0
+    finally:
+        sys.stdin = stdin
+        keepass_ops.subprocess.run = real_run  # type: ignore[assignment]
+        keepass_ops.CliSession.__init__ = real_init  # type: ignore[method-assign]
+    return {
+        "median_ms": round(statistics.median(samples), 1),
+        "mean_ms": round(statistics.mean(samples), 1),
+        "cli_starts_per_add": round(starts["n"] / runs, 2),
+        "failures": failures,
+    }
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Benchmark keepass_ops add with and without session mode.")
+    p.add_argument("--runs", type=int, default=5, help="Adds per mode (default: 5).")
+    p.add_argument("--groups", default="Bench/prod/api", help="Group path for new entries (default: Bench/prod/api).")
+    p.add_argument("--json", action="store_true", help="Print results as JSON.")
+    p.add_argument("--cli", default=keepass_ops.cli_path(), help="keepassxc-cli to run, e.g. scripts/bench/fake-keepassxc-cli.py (default: $KEEPASS_CLI or keepassxc-cli).")
+    args = p.parse_args()
+    os.environ[keepass_ops.CLI_ENV] = args.cli
+
+    password = secrets.token_urlsafe(24)
+    keepass_ops.get_db_password = lambda: password  # type: ignore[assignment]
+    with tempfile.TemporaryDirectory(prefix="keepass-bench-") as tmp:
+        db_path = os.path.join(tmp, "bench.kdbx")
+        try:
+            create_database(db_path, password)
+        except (OSError, RuntimeError, subprocess.TimeoutExpired) as e:
+            print(f"Error: cannot create a test database with keepassxc-cli: {e}", file=sys.stderr)
+            return 2
+        results = {
+            "one-shot": bench_mode(db_path, args.groups, args.runs, session=False),
+            "session": bench_mode(db_path, args.groups, args.runs, session=True),
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for mode, r in results.items():
+            print(
+                f"  {mode:9} add median {r['median_ms']:8.1f} ms  mean {r['mean_ms']:8.1f} ms  "
+                f"keepassxc-cli starts/add {r['cli_starts_per_add']}  failures {r['failures']}"
+            )
+        before, after = results["one-shot"]["median_ms"], results["session"]["median_ms"]
+        if after:
+            print(f"  speedup: {before / after:.1f}x")
+    return 1 if any(r["failures"] for r in results.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the secret detectors of guard-secret-write: throughput and precision/recall.
+
+Runs the guard's DETECTOR (token formats and entropy check, guardlib/detect.py)
+with its built-in formats and allow patterns.
+
+- accuracy: every entry of scripts/bench/secret-corpus.jsonl is labeled with the
+  detector that should fire ("expect"), or null for clean text. Tokens are written
+  as {{alphabet:length}} and filled with seeded random characters, so the corpus
+  holds no token-shaped strings. It reports precision and recall over the
+  entries, and any entry found by another detector than expected.
+- throughput: MB/s of the detectors, and of the existing content rules for
+  comparison, on generated text of each --sizes size. Kinds: code, env (KEY=value
+  config), base64 (one long encoded run), and adversarial inputs that repeat
+  token prefixes or run characters. Time must grow linearly: a kind whose time
+  at the largest size is more than twice what the size ratio predicts is a
+  problem. The slowest kind at the largest size, scaled to the most the guard
+  scans (guardlib/scan.py max_chars), must also fit the hook's budget
+  (guardlib/runtime.py).
+- windows: the guard scans large content in windows (guardlib/scan.py). A CA
+  bundle of many certificates, base64 runs longer than max_length and a bundle
+  with a key appended are scanned both whole and in windows, and the two must
+  agree: no finding in the certificates, the key found.
+
+Exits 1 if precision or recall is below --min-precision/--min-recall, a detector
+name is wrong, time grows faster than linear, the worst case exceeds the hook
+budget, or windowed and whole-text results differ.
+
+Usage:
+  bench-secret-detect.py [--corpus FILE] [--sizes 256K,1M,4M] [--runs N] [--seed N] [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import statistics
+import string
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_CORPUS = Path(__file__).resolve().parent / "bench" / "secret-corpus.jsonl"
+sys.path.insert(0, str(REPO_ROOT / "hooks"))
+from guardlib import registry, runtime, scan  # noqa: E402
+
+UNITS = {"K": 1 << 10, "M": 1 << 20}
+ALPHABETS = {
+    "alnum": string.ascii_letters + string.digits,
+    "upper_digits": string.ascii_uppercase + string.digits,
+    "digits": string.digits,
+    "lower_hex": "0123456789abcdef",
+    "upper_hex": "0123456789ABCDEF",
+    "b64": string.ascii_letters + string.digits + "+/",
+    "b64url": string.ascii_letters + string.digits + "-_",
+}
+HOOK = "secret-write"
+PLACEHOLDER = re.compile(r"\{\{(\w+):(\d+)\}\}")
+
+
+def parse_size(text: str) -> int:
+    text = text.strip().upper()
+    return int(text[:-1]) * UNITS[text[-1]] if text[-1:] in UNITS else int(text)
+
+
+def fill(text: str, rng: random.Random) -> str:
+    """Replace each {{alphabet:length}} with random characters."""
+    return PLACEHOLDER.sub(lambda m: "".join(rng.choice(ALPHABETS[m.group(1)]) for _ in range(int(m.group(2)))), text)
+
+
+def load_corpus(path: Path, seed: int) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    entries = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                item = json.loads(line)
+                entries.append({"name": item["name"], "text": fill(item["text"], rng), "expect": item.get("expect")})
+    return entries
+
+
+def accuracy(detector: Any, entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    tp = fp = fn = tn = 0
+    wrong: List[str] = []
+    misses: List[str] = []
+    for entry in entries:
+        names = [name for name, _, _ in detector.findings(entry["text"])]
+        if entry["expect"] is None:
+            if names:
+                fp += 1
+                misses.append(f"{entry['name']}: false positive ({', '.join(names)})")
+            else:
+                tn += 1
+        elif names:
+            tp += 1
+            if entry["expect"] not in names:
+                wrong.append(f"{entry['name']}: found {', '.join(names)}, expected {entry['expect']}")
+        else:
+            fn += 1
+            misses.append(f"{entry['name']}: not found (expected {entry['expect']})")
+    return {
+        "entries": len(entries),
+        "tp": tp,
+        "fp": fp,
+        "fn": fn,
+        "tn": tn,
+        "precision": round(tp / (tp + fp), 3) if tp + fp else 1.0,
+        "recall": round(tp / (tp + fn), 3) if tp + fn else 1.0,
+        "misses": misses,
+        "wrong_detector": wrong,
+    }
+
+
+def _repeat(unit: str, size: int) -> str:
+    return (unit * (size // len(unit) + 1))[:size]
+
+
+def generate(kind: str, size: int, rng: random.Random) -> str:
+    """Secret-free text of one kind (adversarial kinds repeat near-misses)."""
+    if kind == "code":
+        return _repeat("".join(f"value_{i} = compute(item_{i}, factor={i % 97})  # generated\n" for i in range(200)), size)
+    if kind == "env":
+        return _repeat("".join(f"SERVICE_{i}_URL=https://svc-{i}.internal.example.org:8443/api\nSERVICE_{i}_TIMEOUT={i % 60}\n" for i in range(100)), size)
+    if kind == "base64":
+        return "data = \"" + "".join(rng.choice(ALPHABETS["b64"]) for _ in range(size - 10)) + "\"\n"
+    units = {
+        "adv-jwt-prefix": "-eyJ",
+        "adv-token-prefixes": "=ghp_=AKIA=glc_=xoxb-",
+        "adv-pem-prefix": "-----BEGIN ",
+        "adv-run-chars": "a",
+        "adv-short-runs": "abcdefghijklmnopqrs ",
+    }
+    return _repeat(units[kind], size)
+
+
+KINDS = ("code", "env", "base64", "adv-jwt-prefix", "adv-token-prefixes", "adv-pem-prefix", "adv-run-chars", "adv-short-runs")
+
+
+def p50_s(fn: Callable[[], Any], runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples)
+
+
+def throughput(guard: Any, sizes: List[int], runs: int, seed: int) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    rows = []
+    for kind in KINDS:
+        for size in sizes:
+            text = generate(kind, size, rng)
+            found = guard.DETECTOR.findings(text)
+            detect_s = p50_s(lambda: guard.DETECTOR.findings(text), runs)
+            rules_s = p50_s(lambda: guard.RULES.search("content", text), runs)
+            rows.append({
+                "kind": kind,
+                "bytes": size,
+                "findings": len(found),
+                "detect_ms": round(detect_s * 1000, 2),
+                "detect_mb_s": round(size / (1 << 20) / detect_s, 1) if detect_s else 0.0,
+                "rules_mb_s": round(size / (1 << 20) / rules_s, 1) if rules_s else 0.0,
+            })
+    return rows
+
+
+def pem(label: str, rng: random.Random, lines: int = 25) -> str:
+    body = "".join("".join(rng.choice(ALPHABETS["b64"]) for _ in range(64)) + "\n" for _ in range(lines))
+    return f"-----BEGIN {label}-----\n{body}-----END {label}-----\n"
+
+
+def windows(guard: Any, rng: random.Random) -> List[Dict[str, Any]]:
+    """Whole-text findings vs the guard's windowed scan, on texts larger than one window."""
+    bundle = ""
+    while len(bundle) < 2 * scan.CHUNK_SIZE + scan.OVERLAP:
+        bundle += f"# Certificate {len(bundle)}\n" + pem("CERTIFICATE", rng)
+    key = "".join(rng.choice(ALPHABETS["alnum"]) for _ in range(40))
+    cases = {
+        "ca-bundle": (bundle, False),
+        "base64-runs": ("\n".join(generate("base64", scan.CHUNK_SIZE + 3000 * i, rng) for i in range(3)), False),
+        "ca-bundle+key": (bundle + f"API_KEY={key}\n", True),
+    }
+    rows = []
+    for name, (text, secret) in cases.items():
+        whole = sorted({found for found, _, _ in guard.DETECTOR.findings(text)})
+        windowed = scan.scan([text], guard.DETECTOR.search).rule
+        rows.append({"case": name, "bytes": len(text), "whole": whole, "windowed": windowed, "secret": secret})
+    return rows
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Measure secret detector throughput and precision/recall.")
+    p.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS, help="Labeled corpus (JSON lines).")
+    p.add_argument("--sizes", default="256K,1M,4M", help="Text sizes for throughput (default: 256K,1M,4M).")
+    p.add_argument("--runs", type=int, default=5, help="Timed runs per text (default: 5).")
+    p.add_argument("--seed", type=int, default=1, help="Seed for corpus tokens and generated text (default: 1).")
+    p.add_argument("--min-precision", type=float, default=0.95, help="Minimum precision (default: 0.95).")
+    p.add_argument("--min-recall", type=float, default=0.95, help="Minimum recall (default: 0.95).")
+    p.add_argument("--json", action="store_true", help="Print results as JSON.")
+    args = p.parse_args()
+
+    guard = registry.load_hook(HOOK)
+    sizes = sorted(parse_size(s) for s in args.sizes.split(",") if s.strip())
+    acc = accuracy(guard.DETECTOR, load_corpus(args.corpus, args.seed))
+    rows = throughput(guard, sizes, args.runs, args.seed)
+    windowed = windows(guard, random.Random(args.seed))
+
+    problems: List[str] = list(acc["wrong_detector"])
+    if acc["precision"] < args.min_precision:
+        problems.append(f"precision {acc['precision']} < {args.min_precision}")
+    if acc["recall"] < args.min_recall:
+        problems.append(f"recall {acc['recall']} < {args.min_recall}")
+    if len(sizes) > 1:
+        for kind in KINDS:
+            times = {r["bytes"]: r["detect_ms"] for r in rows if r["kind"] == kind}
+            small, large = times[sizes[0]], times[sizes[-1]]
+            if small > 0.5 and large / small > 2 * sizes[-1] / sizes[0]:
+                problems.append(f"{kind}: {large} ms at {sizes[-1]} bytes vs {small} ms at {sizes[0]} (not linear)")
+            if any(r["findings"] for r in rows if r["kind"] == kind):
+                problems.append(f"{kind}: secret-free text has findings")
+    worst = min((r for r in rows if r["bytes"] == sizes[-1]), key=lambda r: r["detect_mb_s"])
+    budget_ms = runtime.settings(HOOK)[0] * 1000
+    limit = scan.max_chars()
+    worst_ms = round(limit / (1 << 20) / worst["detect_mb_s"] * 1000) if worst["detect_mb_s"] else float("inf")
+    budget = {"kind": worst["kind"], "max_chars": limit, "worst_ms": worst_ms, "budget_ms": round(budget_ms)}
+    if worst_ms > budget_ms:
+        problems.append(f"{worst['kind']}: {worst['detect_mb_s']} MB/s takes ~{worst_ms} ms for {limit} bytes, over the {HOOK} budget of {budget_ms:.0f} ms")
+    for row in windowed:
+        if bool(row["whole"]) != row["secret"] or (row["windowed"] is not None) != row["secret"]:
+            problems.append(f"{row['case']}: whole text found {row['whole'] or 'nothing'}, windows found {row['windowed'] or 'nothing'}")
+
+    if args.json:
+        print(json.dumps({"accuracy": acc, "throughput": rows, "budget": budget, "windows": windowed}, indent=2))
+    else:
+        print(f"  corpus: {acc['entries']} entries, precision {acc['precision']:.3f}, recall {acc['recall']:.3f} "
+              f"(tp {acc['tp']}, fp {acc['fp']}, fn {acc['fn']}, tn {acc['tn']})")
+        for line in acc["misses"]:
+            print(f"    - {line}")
+        print("")
+        print(f"  {'kind':20} {'bytes':>9} {'detect ms':>10} {'detect MB/s':>12} {'rules MB/s':>11}")
+        for row in rows:
+            print(f"  {row['kind']:20} {row['bytes']:>9} {row['detect_ms']:>10.2f} {row['detect_mb_s']:>12.1f} {row['rules_mb_s']:>11.1f}")
+        print(f"\n  worst case: {budget['kind']} at {limit} bytes ~{worst_ms} ms (budget {budget['budget_ms']} ms)")
+        print("")
+        print(f"  {'windows':20} {'bytes':>9}  whole / windowed")
+        for row in windowed:
+            print(f"  {row['case']:20} {row['bytes']:>9}  {', '.join(row['whole']) or '-'} / {row['windowed'] or '-'}")
+    if problems:
+        print("\nProblems:", file=sys.stderr)
+        for line in problems:
+            print(f"  ✗ {line}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Test double for keepassxc-cli: the subset of commands keepass_ops.py uses.
+
+The "database" is a JSON file (master password, groups, entries); unlocking it
+sleeps FAKE_KEEPASS_KDF seconds (default 0.2) in place of the key derivation.
+Like the real CLI, `open` reads the database once and every saving command
+writes back its whole in-memory copy, so unlocked concurrent writers lose each
+other's changes.
+
+Commands: db-create, open, ls [-R] [-f] [GROUP], show [-a ATTR] ENTRY,
+add [-u USER] [-p] ENTRY, edit [-p] ENTRY, mkdir GROUP, plus one that only the
+double has:
+
+  echo [-e] ARG...   print each argument as a JSON string on its own line
+                     (-e: also write each to stderr and fail, as an error would)
+
+With -q the password prompts are not printed, which is how keepass_ops.py runs
+one-shot commands; inside `open` they go to stderr like the real CLI's.
+
+Usage:
+  KEEPASS_CLI=scripts/bench/fake-keepassxc-cli.py keepass_ops.py ...
+  check-keepass-concurrency.py --cli scripts/bench/fake-keepassxc-cli.py
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+Database = Dict[str, Any]
+
+
+def load(path: str) -> Database:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save(path: str, db: Database) -> None:
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(db, f)
+    os.replace(tmp, path)
+
+
+def unlock(path: str, password: str) -> Database:
+    time.sleep(float(os.environ.get("FAKE_KEEPASS_KDF", "0.2")))
+    try:
+        db = load(path)
+    except (OSError, ValueError) as e:
+        raise SystemExit(f"Error while reading the database {path}: {e}")
+    if db.get("password") != password:
+        print("Error while reading the database: Invalid credentials were provided, please try again.", file=sys.stderr)
+        raise SystemExit(1)
+    return db
+
+
+def parent(path: str) -> str:
+    return path.rsplit("/", 1)[0] if "/" in path else ""
+
+
+def split_line(line: str) -> List[str]:
+    """The interactive shell's splitter: whitespace separates, backslash escapes, "" quotes."""
+    args: List[str] = []
+    current: List[str] = []
+    started = quoted = False
+    i = 0
+    while i < len(line):
+        ch = line[i]
+        if ch == "\\" and i + 1 < len(line):
+            current.append(line[i + 1])
+            started = True
+            i += 2
+            continue
+        if ch == '"':
+            quoted = not quoted
+            started = True
+        elif ch in " \t" and not quoted:
+            if started:
+                args.append("".join(current))
+                current, started = [], False
+        else:
+            current.append(ch)
+            started = True
+        i += 1
+    if started:
+        args.append("".join(current))
+    return args
+
+
+def listing(db: Database, group: str, recursive: bool, flat: bool, depth: int = 0) -> List[str]:
+    lines = []
+    children = [g for g in db["groups"] if g and parent(g) == group]
+    entries = [e for e in db["entries"] if parent(e) == group]
+    if not children and not entries and flat and group:
+        return [f"{group}/[empty]"]
+    for name in entries:
+        lines.append(name if flat else "  " * depth + name.rsplit("/", 1)[-1])
+    for name in children:
+        lines.append(f"{name}/" if flat else "  " * depth + name.rsplit("/", 1)[-1] + "/")
+        if recursive:
+            lines.extend(listing(db, name, recursive, flat, depth + 1))
+    return lines
+
+
+def execute(path: str, db: Database, argv: List[str], read: Callable[[str], str]) -> int:
+    """Run one command against db (saving to path); returns the exit code."""
+    command, args = argv[0], argv[1:]
+    if command == "echo":
+        error = args[:1] == ["-e"]
+        for arg in args[error:]:
+            print(json.dumps(arg, ensure_ascii=False))
+            if error:
+                print(f"echo: {arg}", file=sys.stderr)
+        return 1 if error else 0
+    quiet = "-q" in args
+    args = [a for a in args if a != "-q"]
+    flags = {a for a in args if a.startswith("-") and a not in ("-a", "-u")}
+    options: Dict[str, str] = {}
+    positional: List[str] = []
+    i = 0
+    while i < len(args):
+        if args[i] in ("-a", "-u") and i + 1 < len(args):
+            options[args[i]] = args[i + 1]
+            i += 2
+            continue
+        if not args[i].startswith("-"):
+            positional.append(args[i])
+        i += 1
+
+    def ask(prompt: str) -> str:
+        if not quiet:
+            sys.stderr.write(prompt)
+            sys.stderr.flush()
+        return read(prompt)
+
+    target = positional[-1].strip("/") if positional else ""
+    if command == "ls":
+        if target and target not in db["groups"]:
+            print(f"Cannot find group {target}.", file=sys.stderr)
+            return 1
+        for line in listing(db, target, "-R" in flags, "-f" in flags):
+            print(line)
+        return 0
+    if command == "show":
+        entry = db["entries"].get(target)
+        if entry is None:
+            print(f"Could not find entry with path {target}.", file=sys.stderr)
+            return 1
+        print(entry.get(options.get("-a", "Password"), ""))
+        return 0
+    if command == "mkdir":
+        if target in db["groups"] or parent(target) not in db["groups"]:
+            print(f"Could not add group {target}.", file=sys.stderr)
+            return 1
+        db["groups"].append(target)
+        save(path, db)
+        print(f"Successfully added group {target.rsplit('/', 1)[-1]}.")
+        return 0
+    if command in ("add", "edit"):
+        exists = target in db["entries"]
+        if command == "add" and (exists or parent(target) not in db["groups"]):
+            print(f"Could not create entry with path {target}.", file=sys.stderr)
+            return 1
+        if command == "edit" and not exists:
+            print(f"Could not find entry with path {target}.", file=sys.stderr)
+            return 1
+        entry = db["entries"].setdefault(target, {"UserName": "", "Password": ""})
+        if "-u" in options:
+            entry["UserName"] = options["-u"]
+        if "-p" in flags:
+            first = ask("Enter password for new entry: " if command == "add" else "Enter new password for entry: ")
+            if ask("Repeat password: ") != first:
+                print("Passwords do not match.", file=sys.stderr)
+                return 1
+            entry["Password"] = first
+        save(path, db)
+        print(f"Successfully {'added' if command == 'add' else 'edited'} entry {target.rsplit('/', 1)[-1]}.")
+        return 0
+    print(f"Unknown command {command}", file=sys.stderr)
+    return 1
+
+
+def read_line(_prompt: str = "") -> str:
+    return sys.stdin.readline().rstrip("\n")
+
+
+def main() -> int:
+    argv = sys.argv[1:]
+    if not argv:
+        print("Usage: fake-keepassxc-cli.py COMMAND [OPTIONS] DATABASE ...", file=sys.stderr)
+        return 1
+    command = argv[0]
+    positional = [a for a in argv[1:] if not a.startswith("-")]
+    if command == "db-create":
+        password = read_line()
+        if read_line() != password:
+            print("Passwords do not match.", file=sys.stderr)
+            return 1
+        save(positional[0], {"password": password, "groups": [""], "entries": {}})
+        return 0
+    if command == "echo":
+        return execute("", {}, argv, read_line)
+    if not positional:
+        print(f"Usage: {command} DATABASE", file=sys.stderr)
+        return 1
+    path = positional[0]
+    db = unlock(path, read_line())
+    if command != "open":
+        rest = argv[1:]
+        rest.remove(path)
+        return execute(path, db, [command, *rest], read_line)
+    prompt = os.path.splitext(os.path.basename(path))[0] + "> "
+    while True:
+        sys.stdout.write(prompt)
+        sys.stdout.flush()
+        line = sys.stdin.readline()
+        if not line:
+            return 0
+        args = split_line(line.rstrip("\n"))
+        if not args:
+            continue
+        if args[0] in ("quit", "exit"):
+            return 0
+        execute(path, db, args, read_line)
+        sys.stderr.flush()
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
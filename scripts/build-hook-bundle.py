@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Build the guard hooks into one precompiled, executable zip bundle.
+
+The bundle holds guardlib/, the guard scripts as importable modules
+(guard-mcp-write.py -> guard_mcp_write) and hook-client.py as __main__. Every
+module is stored as bytecode (unchecked-hash .pyc, so zipimport never compares
+timestamps) next to its source, which is only used if the bytecode does not match
+the running Python. The shebang runs it isolated and site-free:
+
+  .cursor/hooks/cursor-hooks.pyz secret-write < payload.json
+
+Config files (mcp.json, mcp-policy.json, guard-rules.json) are looked up next to
+the directory that holds the bundle, as for hooks/. Rebuild after changing hooks
+or upgrading Python.
+
+Usage:
+  build-hook-bundle.py [--output FILE] [--python INTERPRETER] [--no-source]
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import io
+import marshal
+import os
+import stat
+import sys
+import time
+import zipfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+HOOKS_DIR = REPO_ROOT / "hooks"
+DEFAULT_OUTPUT = HOOKS_DIR / "cursor-hooks.pyz"
+DEFAULT_INTERPRETER = "/usr/bin/env -S python3 -I -S"
+
+sys.path.insert(0, str(HOOKS_DIR))
+from guardlib import registry  # noqa: E402
+
+
+def bundle_members() -> list[tuple[str, Path]]:
+    """(name inside the bundle, source file) for every module in the bundle."""
+    members = [("__main__.py", HOOKS_DIR / "hook-client.py")]
+    for hook, script in sorted(registry.HOOK_SCRIPTS.items()):
+        members.append((f"guard_{hook.replace('-', '_')}.py", HOOKS_DIR / script))
+    for source in sorted((HOOKS_DIR / "guardlib").glob("*.py")):
+        members.append((f"guardlib/{source.name}", source))
+    return members
+
+
+def pyc_bytes(source: bytes, name: str) -> bytes:
+    """Unchecked hash-based .pyc for source, as zipimport expects it."""
+    code = compile(source, name, "exec", dont_inherit=True)
+    data = bytearray(importlib.util.MAGIC_NUMBER)
+    data.extend((0b01).to_bytes(4, "little"))  # hash-based, check_source off
+    data.extend(importlib.util.source_hash(source))
+    data.extend(marshal.dumps(code))
+    return bytes(data)
+
+
+def build(output: Path, interpreter: str, with_source: bool = True) -> int:
+    """Write the bundle; returns its size in bytes."""
+    buf = io.BytesIO()
+    now = time.localtime()[:6]
+    with zipfile.ZipFile(buf, "w", compression=zipfile.ZIP_STORED) as zf:
+        for name, path in bundle_members():
+            source = path.read_bytes()
+            zf.writestr(zipfile.ZipInfo(name[:-3] + ".pyc", now), pyc_bytes(source, name))
+            if with_source:
+                zf.writestr(zipfile.ZipInfo(name, now), source)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp = output.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(b"#!" + interpreter.encode("utf-8") + b"\n")
+        f.write(buf.getvalue())
+    tmp.chmod(tmp.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    os.replace(tmp, output)
+    return output.stat().st_size
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Build the guard hooks into one precompiled zip bundle.")
+    p.add_argument("--output", default=str(DEFAULT_OUTPUT), help=f"Bundle path (default: {DEFAULT_OUTPUT.relative_to(REPO_ROOT)}).")
+    p.add_argument("--python", default=DEFAULT_INTERPRETER, help=f"Shebang interpreter (default: {DEFAULT_INTERPRETER!r}).")
+    p.add_argument("--no-source", action="store_true", help="Store bytecode only (bundle then only runs on this Python version).")
+    args = p.parse_args()
+
+    output = Path(args.output)
+    size = build(output, args.python, with_source=not args.no_source)
+    print(f"Built {output} ({size / 1024:.1f} KiB, {len(bundle_members())} modules, Python {sys.version.split()[0]} bytecode)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
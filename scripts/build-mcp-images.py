@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Build the custom MCP images (docker/mcp-*) in parallel, skipping unchanged ones.
+
+Each docker/mcp-<name> directory with a Dockerfile is one image, mcp/<name>:latest.
+Its build context is hashed (relative paths, executable bits and contents of every
+file), and the hash is stored on the image as the label LABEL. Before building,
+one `docker image inspect` reads the label of every selected image; images whose
+label matches the current hash are skipped. The rest are built --jobs at a time
+and each one is timed. A failed build does not stop the others. Its output tail
+is printed, and the exit code is 1.
+
+The build command is a template (--build-cmd), with {image}, {context}, {hash},
+{label} and {name} replaced in each argument, so the scheduler runs without
+Docker too. --state FILE keeps the hashes in a JSON file instead of image labels.
+check-mcp-image-builds.py uses both.
+
+Usage:
+  build-mcp-images.py [NAME ...] [--jobs N] [--force] [--dry-run]
+                      [--docker-dir DIR] [--build-cmd TEMPLATE] [--state FILE]
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import shlex
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+DOCKER_DIR = os.path.join(os.path.dirname(SCRIPTS_DIR), "docker")
+LABEL = "org.cursor-mcp.context-hash"
+DEFAULT_BUILD_CMD = "docker build --label {label}={hash} -t {image} {context}"
+OUTPUT_TAIL = 30
+
+
+class Target:
+    """One docker/mcp-<name> build context."""
+
+    def __init__(self, name: str, context: str) -> None:
+        self.name = name
+        self.context = context
+        self.image = f"mcp/{name}:latest"
+        self.hash = context_hash(context)
+        self.status = "pending"
+        self.seconds = 0.0
+        self.output = ""
+
+
+def context_hash(context: str) -> str:
+    """sha256 over the sorted relative paths, executable bits and contents of a directory."""
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(context):
+        dirs.sort()
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            rel = os.path.relpath(path, context).replace(os.sep, "/")
+            executable = os.access(path, os.X_OK)
+            digest.update(f"{rel}\0{int(executable)}\0".encode("utf-8"))
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(block)
+            digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def discover(docker_dir: str) -> Dict[str, str]:
+    """name -> context directory for every docker/mcp-<name> with a Dockerfile."""
+    found = {}
+    for entry in sorted(os.listdir(docker_dir)):
+        path = os.path.join(docker_dir, entry)
+        if entry.startswith("mcp-") and os.path.isfile(os.path.join(path, "Dockerfile")):
+            found[entry[4:]] = path
+    return found
+
+
+def image_labels(images: List[str]) -> Dict[str, str]:
+    """image -> context-hash label ("" if unlabeled), one docker call; missing images are absent."""
+    template = "{{json .RepoTags}}\t{{with .Config.Labels}}{{index . \"" + LABEL + "\"}}{{end}}"
+    try:
+        proc = subprocess.run(
+            ["docker", "image", "inspect", "--format", template, *images],
+            capture_output=True,
+            text=True,
+        )
+    except OSError:
+        return {}
+    # Exit code 1 if some image is missing; the others are still printed.
+    labels = {}
+    for line in proc.stdout.splitlines():
+        tags, _, label = line.partition("\t")
+        try:
+            for tag in json.loads(tags) or ():
+                labels[tag] = label.strip()
+        except ValueError:
+            continue
+    return {image: labels[image] for image in images if image in labels}
+
+
+def load_state(path: str) -> Dict[str, str]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save_state(path: str, state: Dict[str, str]) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+def build_argv(template: str, target: Target) -> List[str]:
+    fields = {"{image}": target.image, "{context}": target.context, "{hash}": target.hash, "{label}": LABEL, "{name}": target.name}
+    argv = []
+    for arg in shlex.split(template):
+        for key, value in fields.items():
+            arg = arg.replace(key, value)
+        argv.append(arg)
+    return argv
+
+
+def build(target: Target, template: str) -> Target:
+    """Run one build; never raises."""
+    argv = build_argv(template, target)
+    print(f"  → {target.image} building", flush=True)
+    t0 = time.perf_counter()
+    try:
+        proc = subprocess.run(argv, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, errors="replace")
+        target.output = proc.stdout
+        target.status = "built" if proc.returncode == 0 else "failed"
+    except OSError as e:
+        target.output = f"{argv[0]}: {e}"
+        target.status = "failed"
+    target.seconds = time.perf_counter() - t0
+    mark = "✓" if target.status == "built" else "✗"
+    print(f"  {mark} {target.image} {target.status} in {target.seconds:.1f}s", flush=True)
+    return target
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Build changed MCP images from docker/mcp-* in parallel.")
+    p.add_argument("names", nargs="*", help="Images to consider, e.g. memory shrimp (default: all).")
+    p.add_argument("--jobs", type=int, default=min(4, os.cpu_count() or 1), help="Builds at once (default: min(4, CPUs)).")
+    p.add_argument("--force", action="store_true", help="Build even if the context hash matches.")
+    p.add_argument("--dry-run", action="store_true", help="Only show what would be built.")
+    p.add_argument("--docker-dir", default=DOCKER_DIR, help="Directory with the mcp-* build contexts.")
+    p.add_argument("--build-cmd", default=DEFAULT_BUILD_CMD, help=f"Build command template (default: {DEFAULT_BUILD_CMD!r}).")
+    p.add_argument("--state", default=None, help="Keep context hashes in this JSON file instead of image labels.")
+    args = p.parse_args()
+
+    if not os.path.isdir(args.docker_dir):
+        print(f"Error: Docker directory not found: {args.docker_dir}", file=sys.stderr)
+        return 1
+    contexts = discover(args.docker_dir)
+    unknown = [n for n in args.names if n not in contexts]
+    if unknown:
+        print(f"Error: unknown images: {', '.join(unknown)} (available: {', '.join(contexts)})", file=sys.stderr)
+        return 2
+    targets = [Target(name, contexts[name]) for name in (args.names or contexts)]
+    if not targets:
+        print(f"No mcp-* build contexts in {args.docker_dir}", file=sys.stderr)
+        return 1
+
+    t0 = time.perf_counter()
+    state: Optional[Dict[str, str]] = load_state(args.state) if args.state else None
+    current = state if state is not None else image_labels([t.image for t in targets])
+    todo = []
+    for target in targets:
+        if not args.force and current.get(target.image) == target.hash:
+            target.status = "unchanged"
+        else:
+            target.status = "missing" if target.image not in current else "changed"
+            todo.append(target)
+
+    print("")
+    print(f"=== Building MCP Docker Images ({len(todo)} of {len(targets)}, {args.jobs} at a time) ===")
+    print("")
+    for target in targets:
+        if target.status == "unchanged":
+            print(f"  = {target.image} unchanged ({target.hash[:12]})")
+    if args.dry_run:
+        for target in todo:
+            print(f"  + {target.image} would build ({target.status}): {' '.join(build_argv(args.build_cmd, target))}")
+        return 0
+
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        list(pool.map(lambda t: build(t, args.build_cmd), todo))
+    if state is not None:
+        state.update({t.image: t.hash for t in todo if t.status == "built"})
+        save_state(args.state, state)
+
+    print("")
+    print("=== Summary ===")
+    for target in targets:
+        took = f"{target.seconds:6.1f}s" if target.status in ("built", "failed") else "      -"
+        print(f"  {target.image:28} {target.status:9} {took}")
+    print(f"  total {time.perf_counter() - t0:.1f}s")
+    failed = [t for t in todo if t.status == "failed"]
+    for target in failed:
+        print(f"\n--- {target.image} (last {OUTPUT_TAIL} lines) ---", file=sys.stderr)
+        print("\n".join(target.output.splitlines()[-OUTPUT_TAIL:]), file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -23,6 +23,9 @@ $results = @()
 $availableImages = @()
 $missingImages = @()
 
+# One inventory query for all local images instead of one `docker images` per image
+$localImages = @(docker images --format "{{.Repository}}:{{.Tag}}" 2>$null)
+
 foreach ($server in $mcpServers) {
     Write-Host "Checking $($server.Name)..." -ForegroundColor Yellow
     
@@ -31,8 +34,7 @@ foreach ($server in $mcpServers) {
     
     # Check primary image
     try {
-        $testResult = docker images $server.Image --format "{{.Repository}}:{{.Tag}}" 2>&1
-        if ($LASTEXITCODE -eq 0 -and $testResult) {
+        if ($localImages -like "$($server.Image):*") {
             $found = $true
             $imageName = $server.Image
             Write-Host "  [OK] Found locally: $imageName" -ForegroundColor Green
@@ -53,8 +55,7 @@ foreach ($server in $mcpServers) {
     # Check alternative image if primary not found
     if (-not $found -and $server.AltImage) {
         try {
-            $testResult = docker images $server.AltImage --format "{{.Repository}}:{{.Tag}}" 2>&1
-            if ($LASTEXITCODE -eq 0 -and $testResult) {
+            if ($localImages -like "$($server.AltImage):*") {
                 $found = $true
                 $imageName = $server.AltImage
                 Write-Host "  [OK] Found locally (alt): $imageName" -ForegroundColor Green
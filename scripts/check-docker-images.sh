@@ -25,6 +25,13 @@ available_images=()
 missing_images=()
 results=()
 
+# One inventory query for all local images instead of one `docker images` per image
+local_images="$(docker images --format "{{.Repository}}:{{.Tag}}" 2>/dev/null || true)"
+
+has_local_image() {
+    grep -q "^$1:" <<< "$local_images"
+}
+
 for server_info in "${servers[@]}"; do
     IFS=':' read -r name primary_image alt_image <<< "$server_info"
     
@@ -33,7 +40,7 @@ for server_info in "${servers[@]}"; do
     image_name=""
     
     # Check primary image locally
-    if docker images "$primary_image" --format "{{.Repository}}:{{.Tag}}" 2>/dev/null | grep -q .; then
+    if has_local_image "$primary_image"; then
         found=true
         image_name="$primary_image"
         echo "  ✓ Found locally: $image_name"
@@ -48,7 +55,7 @@ for server_info in "${servers[@]}"; do
     
     # Check alternative image if primary not found
     if [ "$found" = false ] && [ -n "$alt_image" ]; then
-        if docker images "$alt_image" --format "{{.Repository}}:{{.Tag}}" 2>/dev/null | grep -q .; then
+        if has_local_image "$alt_image"; then
             found=true
             image_name="$alt_image"
             echo "  ✓ Found locally (alt): $image_name"
@@ -89,7 +96,7 @@ if [ ${#missing_images[@]} -gt 0 ]; then
     echo "Images requiring Dockerfile:"
     for name in "${missing_images[@]}"; do
         echo "  - $name"
-    fi
+    done
 fi
 
 # Export results to JSON
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Check for the hook time budgets and fallback decisions (hooks/guardlib/runtime.py).
+
+Runs hooks/hook-client.py with a temporary hook-runtime.json, state and cache
+directory, and checks that each hook answers with its configured fallback within
+its budget (plus interpreter start and --slack) when:
+
+- stdin is slow: the payload arrives only after twice the budget (server down)
+- evaluation is slow: a large .env Write is scanned in-process, and through a
+  running hook-server.py
+- evaluation raises: every hook gets the same configured fallback (in-process)
+
+It also checks that an ordinary payload still gets its normal decision, and that
+the latency histogram counts the timeouts and errors (hook-audit.py --latency).
+Exits 1 on any mismatch.
+
+Usage:
+  check-hook-deadline.py [--budget-ms N] [--slack-ms N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+HOOKS_DIR = REPO_ROOT / "hooks"
+CLIENT = HOOKS_DIR / "hook-client.py"
+SERVER = HOOKS_DIR / "hook-server.py"
+
+# Fallback under test per hook: one of each decision.
+FALLBACKS = {"mcp-write": "deny", "secret-write": "ask", "shell-secret": "allow"}
+EXPECTED = {
+    "mcp-write": ("permission", "deny", 2),
+    "secret-write": ("decision", "deny", 2),  # ask is a deny with a reason for preToolUse
+    "shell-secret": ("permission", "allow", 0),
+}
+ORDINARY = {
+    "mcp-write": ({"tool_name": "memory_store"}, "ask"),
+    "secret-write": ({"tool_name": "Write", "tool_input": {"path": "src/app.py", "content": "x = 1\n"}}, "allow"),
+    "shell-secret": ({"command": "echo A=1 >> .env"}, "ask"),
+}
+
+
+def run_client(hook: str, data: bytes, env: Dict[str, str], delay: float = 0.0) -> Tuple[Optional[dict], int, float]:
+    """(output object, exit code, wall seconds); with delay, stdin is written only after it."""
+    t0 = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, str(CLIENT), hook], stdin=subprocess.PIPE, stdout=subprocess.PIPE, env=env)
+    if delay:
+        try:
+            proc.wait(timeout=delay)  # a hook that gives up on stdin exits before the payload is sent
+        except subprocess.TimeoutExpired:
+            pass
+    try:
+        out, _ = proc.communicate(data, timeout=30)
+    except (BrokenPipeError, ValueError):
+        out = proc.stdout.read() if proc.stdout else b""
+        proc.wait()
+    wall = time.perf_counter() - t0
+    try:
+        return json.loads(out), proc.returncode, wall
+    except json.JSONDecodeError:
+        return None, proc.returncode, wall
+
+
+def verdict(result: Optional[dict], code: int, hook: str, cause: str = "budget") -> Optional[str]:
+    """None if result is hook's expected fallback, else what was wrong.
+
+    A fallback other than allow must explain itself: its message names the cause
+    ("budget" or "failed"), which also tells it apart from a real deny.
+    """
+    key, decision, exit_code = EXPECTED[hook]
+    if result is None or result.get(key) != decision or code != exit_code:
+        return f"got {result} (exit {code}), expected {key}: {decision} (exit {exit_code})"
+    message = result.get("reason") or result.get("user_message") or ""
+    if decision != "allow" and cause not in message:
+        return f"got {result}, expected a message about the {cause}"
+    return None
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Test hook time budgets and fallback decisions.")
+    p.add_argument("--budget-ms", type=int, default=100, help="Budget for every hook (default: 100).")
+    p.add_argument("--slack-ms", type=int, default=250, help="Allowed overshoot past the budget, for interpreter start (default: 250).")
+    args = p.parse_args()
+
+    problems: List[str] = []
+    budget = args.budget_ms / 1000
+    limit = budget + args.slack_ms / 1000
+    with tempfile.TemporaryDirectory(prefix="hook-deadline-") as tmp:
+        config = os.path.join(tmp, "hook-runtime.json")
+        with open(config, "w", encoding="utf-8") as f:
+            json.dump({"default": {"budget_ms": args.budget_ms}, **{h: {"fallback": d} for h, d in FALLBACKS.items()}}, f)
+        env = dict(os.environ)
+        env.update({
+            "CURSOR_HOOK_RUNTIME": config,
+            "CURSOR_HOOK_SOCKET": os.path.join(tmp, "hooks.sock"),
+            "XDG_STATE_HOME": os.path.join(tmp, "state"),
+            "XDG_CACHE_HOME": os.path.join(tmp, "cache"),
+        })
+
+        for hook, (payload, decision) in ORDINARY.items():
+            result, code, wall = run_client(hook, json.dumps(payload).encode(), env)
+            got = result and (result.get("permission") or result.get("decision"))
+            print(f"  ordinary      {hook:13} {got} in {wall * 1000:.0f} ms")
+            if got != decision:
+                problems.append(f"ordinary {hook}: got {result}, expected {decision}")
+
+        for hook, (payload, _) in ORDINARY.items():
+            result, code, wall = run_client(hook, json.dumps(payload).encode(), env, delay=2 * budget)
+            print(f"  slow stdin    {hook:13} {result and (result.get('permission') or result.get('decision'))} in {wall * 1000:.0f} ms")
+            wrong = verdict(result, code, hook)
+            if wrong:
+                problems.append(f"slow stdin {hook}: {wrong}")
+            if wall > limit:
+                problems.append(f"slow stdin {hook}: answered after {wall * 1000:.0f} ms (limit {limit * 1000:.0f})")
+
+        content = "".join(f"SERVICE_{i}_URL=https://svc-{i}.internal.example.org/api\n" for i in range(200_000))
+        big = json.dumps({"tool_name": "Write", "tool_input": {"path": ".env", "content": content}}).encode()
+        result, code, wall = run_client("secret-write", big, env)
+        print(f"  slow scan     {'secret-write':13} {result and result.get('decision')} in {wall * 1000:.0f} ms ({len(big) >> 20} MiB)")
+        wrong = verdict(result, code, "secret-write")
+        if wrong:
+            problems.append(f"slow scan: {wrong}")
+        if wall > limit:
+            problems.append(f"slow scan: answered after {wall * 1000:.0f} ms (limit {limit * 1000:.0f})")
+
+        server = subprocess.Popen([sys.executable, str(SERVER)], env=env, stderr=subprocess.DEVNULL)
+        try:
+            for _ in range(100):
+                if os.path.exists(env["CURSOR_HOOK_SOCKET"]):
+                    break
+                time.sleep(0.05)
+            result, code, wall = run_client("secret-write", big, env)
+            print(f"  slow scan     {'secret-write':13} {result and result.get('decision')} in {wall * 1000:.0f} ms (hook server)")
+            wrong = verdict(result, code, "secret-write")
+            if wrong:
+                problems.append(f"slow scan via server: {wrong}")
+            if wall > limit:
+                problems.append(f"slow scan via server: answered after {wall * 1000:.0f} ms (limit {limit * 1000:.0f})")
+        finally:
+            subprocess.run([sys.executable, str(SERVER), "--stop"], env=env, capture_output=True)
+            server.wait(timeout=10)
+
+        script = (
+            "import json, sys\n"
+            f"sys.path.insert(0, {str(HOOKS_DIR)!r})\n"
+            "from guardlib import registry\n"
+            "class Broken:\n"
+            "    def evaluate(raw, ctx):\n"
+            "        raise RuntimeError('broken')\n"
+            "print(json.dumps({h: registry.run_module(h, Broken, '{}') for h in registry.HOOK_SCRIPTS}))\n"
+        )
+        proc = subprocess.run([sys.executable, "-c", script], env=env, capture_output=True, text=True)
+        for hook, (out, exit_code) in json.loads(proc.stdout or "{}").items():
+            print(f"  error         {hook:13} {json.loads(out).get('permission') or json.loads(out).get('decision')}")
+            wrong = verdict(json.loads(out), exit_code, hook, "failed")
+            if wrong:
+                problems.append(f"error {hook}: {wrong}")
+
+        proc = subprocess.run([sys.executable, str(HOOKS_DIR / "hook-audit.py"), "--latency", "--json"], env=env, capture_output=True, text=True)
+        rows = {row["hook"]: row for row in json.loads(proc.stdout or "[]")}
+        for hook in FALLBACKS:
+            row = rows.get(hook, {})
+            timeouts = 2 if hook == "secret-write" else 1
+            print(f"  histogram     {hook:13} calls {row.get('calls', 0)}, timeouts {row.get('timeout', 0)}, errors {row.get('error', 0)}")
+            if row.get("timeout", 0) < timeouts or row.get("error", 0) < 1:
+                problems.append(f"histogram {hook}: {row or 'no entries'}, expected {timeouts}+ timeouts and 1+ errors")
+
+    if problems:
+        print("\nProblems:", file=sys.stderr)
+        for line in problems:
+            print(f"  ✗ {line}", file=sys.stderr)
+        return 1
+    print("\n  ✓ Budgets, fallback decisions and the latency histogram work", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
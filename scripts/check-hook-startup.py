@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Startup budget check for the hook entrypoint: fail when hooks get slower to start.
+
+Every tool call starts a fresh hook process, so imports cost more than rules. For
+each hook type this runs the entrypoint (hooks/hook-client.py, or a bundle built by
+build-hook-bundle.py) exactly as Cursor does, isolated and site-free, with the hook
+server out of the way, and measures:
+
+- modules: modules imported beyond a bare `python3 -I -S` (from -X importtime;
+  deterministic, so it catches new imports on any machine)
+- import_ms: summed import time of those modules (median of runs)
+- startup_ms: wall time of the hook process minus a bare interpreter (median)
+
+The budget (scripts/bench/startup-budget.json) caps each metric and lists modules
+that must never be imported on the hook path. Exits 1 when a budget is exceeded.
+
+Usage:
+  check-hook-startup.py [--entry FILE] [--budget FILE] [--runs N] [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_ENTRY = REPO_ROOT / "hooks" / "hook-client.py"
+DEFAULT_BUDGET = Path(__file__).resolve().parent / "bench" / "startup-budget.json"
+
+# One typical payload per hook type (each takes its common "allow" path).
+PAYLOADS = {
+    "mcp-write": {"tool_name": "get_file_contents", "tool_input": {"owner": "o", "repo": "r", "path": "README.md"}},
+    "secret-write": {"tool_name": "Write", "tool_input": {"path": "src/app.py", "content": "print('hello')\n"}},
+    "shell-secret": {"command": "echo 'A=1' >> .env.example"},
+}
+
+
+def _interpreter(entry: Path, *extra: str) -> List[str]:
+    return [sys.executable, "-I", "-S", *extra, str(entry)]
+
+
+def import_profile(cmd: List[str], data: bytes, env: Dict[str, str]) -> List[Tuple[str, int]]:
+    """(module, self microseconds) for every module -X importtime reports."""
+    proc = subprocess.run(cmd, input=data, capture_output=True, env=env, check=False)
+    modules = []
+    for line in proc.stderr.decode("utf-8", errors="replace").splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|", 2)
+        modules.append((name.strip(), int(self_us)))
+    return modules
+
+
+def wall_ms(cmd: List[str], data: bytes, env: Dict[str, str], runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        subprocess.run(cmd, input=data, capture_output=True, env=env, check=False)
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def measure(entry: Path, runs: int) -> Dict[str, Any]:
+    env = dict(os.environ)
+    env["CURSOR_HOOK_SOCKET"] = os.path.join(tempfile.mkdtemp(prefix="hook-startup-"), "none.sock")
+    env["XDG_CACHE_HOME"] = tempfile.mkdtemp(prefix="hook-startup-cache-")
+    env["CURSOR_HOOK_AUDIT"] = "0"
+
+    bare_cmd = [sys.executable, "-I", "-S", "-c", "pass"]
+    bare = {name for name, _ in import_profile([*bare_cmd[:3], "-X", "importtime", *bare_cmd[3:]], b"", env)}
+    bare_ms = wall_ms(bare_cmd, b"", env, runs)
+
+    hooks = {}
+    for hook, payload in PAYLOADS.items():
+        data = json.dumps(payload).encode("utf-8")
+        cmd = [*_interpreter(entry), hook]
+        subprocess.run(cmd, input=data, capture_output=True, env=env, check=False)  # warm rule/policy caches
+        import_samples = []
+        modules: List[str] = []
+        for _ in range(runs):
+            profile = [(n, us) for n, us in import_profile([*_interpreter(entry, "-X", "importtime"), hook], data, env) if n not in bare]
+            modules = [n for n, _ in profile]
+            import_samples.append(sum(us for _, us in profile) / 1000)
+        hooks[hook] = {
+            "modules": len(modules),
+            "import_ms": round(statistics.median(import_samples), 2),
+            "startup_ms": round(wall_ms(cmd, data, env, runs) - bare_ms, 2),
+            "module_names": modules,
+        }
+    return {"entry": str(entry), "python": sys.version.split()[0], "bare_interpreter_ms": round(bare_ms, 2), "hooks": hooks}
+
+
+def check(result: Dict[str, Any], budget: Dict[str, Any]) -> List[str]:
+    """Budget violations, as human-readable lines."""
+    problems = []
+    forbidden = set(budget.get("forbidden_modules", ()))
+    for hook, r in result["hooks"].items():
+        limits = {**budget.get("default", {}), **budget.get("hooks", {}).get(hook, {})}
+        for metric in ("modules", "import_ms", "startup_ms"):
+            limit = limits.get(metric)
+            if limit is not None and r[metric] > limit:
+                problems.append(f"{hook}: {metric} {r[metric]} > budget {limit}")
+        for name in r["module_names"]:
+            if name in forbidden:
+                problems.append(f"{hook}: imports forbidden module {name!r}")
+    return problems
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Check hook import and startup time against a budget.")
+    p.add_argument("--entry", default=str(DEFAULT_ENTRY), help="Entrypoint script or bundle (default: hooks/hook-client.py).")
+    p.add_argument("--budget", default=str(DEFAULT_BUDGET), help="Budget JSON (default: scripts/bench/startup-budget.json).")
+    p.add_argument("--runs", type=int, default=9, help="Runs per measurement (default: 9).")
+    p.add_argument("--json", action="store_true", help="Print the full result as JSON.")
+    args = p.parse_args()
+
+    with open(args.budget, "r", encoding="utf-8") as f:
+        budget = json.load(f)
+    result = measure(Path(args.entry), args.runs)
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"Entry: {result['entry']} (Python {result['python']}, bare interpreter {result['bare_interpreter_ms']} ms)")
+        for hook, r in result["hooks"].items():
+            print(f"  {hook:13} modules {r['modules']:3}  import {r['import_ms']:6.2f} ms  startup +{r['startup_ms']:6.2f} ms")
+
+    problems = check(result, budget)
+    if problems:
+        print("\nOver budget:", file=sys.stderr)
+        for line in problems:
+            print(f"  ✗ {line}", file=sys.stderr)
+        return 1
+    print("\n  ✓ Within startup budget", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
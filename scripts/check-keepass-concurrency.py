@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Concurrency check for keepass_ops.py writers: no lost entries, fewer saves.
+
+Creates a throwaway database with `keepassxc-cli db-create` in a temp directory
+(your KEEPASS_DB_PATH is never touched) and starts a burst of parallel
+`keepass_ops.py` processes against it, once per mode:
+
+- unlocked: KEEPASS_LOCK=0, every writer on its own (shows what gets lost)
+- locked:   the default; writers take turns under the advisory lock
+- queued:   --queue; one writer collects the burst and applies it in one lock hold
+
+Each burst adds one new entry per writer under a new group and rotates the
+password of one shared entry from several writers. Afterwards the database is
+listed fresh and every expected entry is looked up. Saves (keepassxc-cli add,
+edit and mkdir) and unlocks (session opens and one-shot runs) are counted from
+the writers' KEEPASS_PROFILE_LOG records.
+
+Without KeePassXC, --cli scripts/bench/fake-keepassxc-cli.py runs the same burst
+against the JSON-file stand-in (it saves the same way: whole database per write).
+
+Exits 1 if the locked or queued mode loses an entry or a writer fails, 2 if the
+test database cannot be created, and 77 (SKIP) if keepassxc-cli is not installed
+and neither --cli nor $KEEPASS_CLI names another one.
+
+Usage:
+  check-keepass-concurrency.py [--writers N] [--updaters N] [--cli PATH] [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import secrets
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPTS_DIR)
+import keepass_ops  # noqa: E402
+
+PASSWORD_ENV = "KEEPASS_CONCURRENCY_TEST_PASSWORD"
+SAVING_COMMANDS = ("add", "edit", "mkdir")
+# Exit code for "not run" (the automake test convention), so a missing KeePassXC is not a pass.
+SKIPPED = 77
+MODES = {
+    "unlocked": ({"KEEPASS_LOCK": "0"}, []),
+    "locked": ({}, []),
+    "queued": ({}, ["--queue"]),
+}
+
+
+def create_database(path: str, password: str) -> None:
+    proc = subprocess.run(
+        [keepass_ops.cli_path(), "db-create", "-p", path],
+        input=f"{password}\n{password}\n",
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"db-create failed: {proc.stderr.strip()}")
+
+
+def child_main(argv: List[str]) -> int:
+    """A writer: keepass_ops.py with the test database's password instead of the keyring."""
+    password = os.environ[PASSWORD_ENV]
+    keepass_ops.get_db_password = lambda: password  # type: ignore[assignment]
+    sys.argv = ["keepass_ops.py", *argv]
+    return keepass_ops.main()
+
+
+def run_burst(db_path: str, password: str, mode: str, writers: int, updaters: int, tmp: str) -> Dict[str, Any]:
+    extra_env, flags = MODES[mode]
+    group = f"Concurrency/{mode}"
+    shared = f"{group}/Shared"
+    # The shared entry exists before the burst (created without contention).
+    env = {**os.environ, PASSWORD_ENV: password, "KEEPASS_DB_PATH": db_path, "KEEPASS_INDEX_PATH": os.path.join(tmp, "index.json")}
+    seed = subprocess.run([sys.executable, __file__, "--child", "add", shared, "--password-from-stdin"], input="initial\n", capture_output=True, text=True, env=env)
+    if seed.returncode != 0:
+        raise RuntimeError(f"could not create {shared}: {seed.stderr.strip()}")
+
+    log = os.path.join(tmp, f"{mode}.jsonl")
+    env = {**env, **extra_env, keepass_ops.PROFILE_LOG_ENV: log}
+    jobs = []
+    for i in range(writers):
+        jobs.append(("add", f"{group}/new/Entry {i}", secrets.token_urlsafe(12)))
+    for i in range(updaters):
+        jobs.append(("update", shared, f"rotated-{i}"))
+    t0 = time.perf_counter()
+    procs = [
+        subprocess.Popen(
+            [sys.executable, __file__, "--child", *flags, op, path, "--password-from-stdin"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            env=env,
+        )
+        for op, path, _ in jobs
+    ]
+    for proc, (_, _, value) in zip(procs, jobs):
+        proc.stdin.write(value + "\n")
+        proc.stdin.close()
+    failures = []
+    for proc, (op, path, _) in zip(procs, jobs):
+        proc.wait()
+        if proc.returncode != 0:
+            failures.append(f"{op} {path}: {proc.stderr.read().strip()}")
+    wall_ms = (time.perf_counter() - t0) * 1000
+
+    # Check with a fresh one-shot process, not anyone's cached view.
+    keepass_ops._session_disabled = True
+    code, listing, err = keepass_ops.run_cli(db_path, password, "ls", "-R", "-f")
+    if code != 0:
+        raise RuntimeError(f"ls failed: {err.strip()}")
+    index = keepass_ops.PathIndex.from_listing(listing)
+    lost = [path for op, path, _ in jobs if op == "add" and not index.has_entry(path)]
+    _, shared_value, _ = keepass_ops.run_cli(db_path, password, "show", "-a", "Password", shared)
+    rotated = {value for op, _, value in jobs if op == "update"}
+
+    records = []
+    if os.path.exists(log):
+        with open(log, "r", encoding="utf-8") as f:
+            records = [json.loads(line) for line in f if line.strip()]
+    saves = sum(1 for r in records if r["phase"] == "cli" and r.get("command") in SAVING_COMMANDS and r["status"] == "ok")
+    unlocks = sum(1 for r in records if r["phase"] == "session.open" or (r["phase"] == "cli" and r.get("mode") == "oneshot"))
+    return {
+        "writes": len(jobs),
+        "lost_entries": lost,
+        "shared_value_ok": shared_value.strip() in rotated if updaters else True,
+        "failures": failures,
+        "saves": saves,
+        "unlocks": unlocks,
+        "wall_ms": round(wall_ms, 1),
+    }
+
+
+def main() -> int:
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        return child_main(sys.argv[2:])
+    p = argparse.ArgumentParser(description="Run parallel keepass_ops writers and check for lost entries and save counts.")
+    p.add_argument("--writers", type=int, default=8, help="Parallel adds of new entries per mode (default: 8).")
+    p.add_argument("--updaters", type=int, default=4, help="Parallel updates of one shared entry per mode (default: 4).")
+    p.add_argument("--json", action="store_true", help="Print results as JSON.")
+    p.add_argument("--cli", default=None, help="keepassxc-cli to run, e.g. scripts/bench/fake-keepassxc-cli.py (default: $KEEPASS_CLI or keepassxc-cli).")
+    args = p.parse_args()
+    if args.cli is None and not os.environ.get(keepass_ops.CLI_ENV) and shutil.which("keepassxc-cli") is None:
+        print("SKIP: keepassxc-cli not found; pass --cli scripts/bench/fake-keepassxc-cli.py to run without KeePassXC.", file=sys.stderr)
+        return SKIPPED
+    os.environ[keepass_ops.CLI_ENV] = args.cli or keepass_ops.cli_path()  # the writers inherit it
+    if keepass_ops.fcntl is None:
+        print("Error: advisory locks need fcntl (Linux, WSL or macOS).", file=sys.stderr)
+        return 2
+
+    password = secrets.token_urlsafe(24)
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="keepass-concurrency-") as tmp:
+        db_path = os.path.join(tmp, "concurrency.kdbx")
+        try:
+            create_database(db_path, password)
+        except (OSError, RuntimeError, subprocess.TimeoutExpired) as e:
+            print(f"Error: cannot create a test database with keepassxc-cli: {e}", file=sys.stderr)
+            return 2
+        for mode in MODES:
+            results[mode] = run_burst(db_path, password, mode, args.writers, args.updaters, tmp)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for mode, r in results.items():
+            print(
+                f"  {mode:9} writes {r['writes']:3}  lost {len(r['lost_entries']):3}  failures {len(r['failures']):3}  "
+                f"saves {r['saves']:3}  unlocks {r['unlocks']:3}  wall {r['wall_ms']:8.1f} ms"
+            )
+    problems = []
+    for mode in ("locked", "queued"):
+        r = results[mode]
+        problems += [f"{mode}: lost {path}" for path in r["lost_entries"]]
+        problems += [f"{mode}: {line}" for line in r["failures"]]
+        if not r["shared_value_ok"]:
+            problems.append(f"{mode}: shared entry does not hold any of the written passwords")
+    if problems:
+        print("\nProblems:", file=sys.stderr)
+        for line in problems:
+            print(f"  ✗ {line}", file=sys.stderr)
+        return 1
+    print("\n  ✓ No lost entries with the lock; queued saves "
+          f"{results['queued']['saves']} vs locked {results['locked']['saves']}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
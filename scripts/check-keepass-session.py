@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Check for the keepassxc-cli session framing in keepass_ops.py (CliSession).
+
+Runs against scripts/bench/fake-keepassxc-cli.py (or --cli), whose echo command
+prints back each argument it parsed, so the check sees exactly what the session
+sent and what it read back:
+
+- quoting: arguments with spaces, tabs, quotes, backslashes, prompt-like text,
+  non-ASCII and empty strings reach the CLI unchanged
+- framing: output larger than one pipe read, and output followed by an error on
+  stderr, end at the prompt; the next command's output is its own
+- password prompts: add/edit -p are answered from run()'s answers, in session
+  and in one-shot mode (KEEPASS_SESSION=0), with the same results
+- the session is not dropped (no fallback to one process per command)
+
+Exits 1 on any mismatch.
+
+Usage:
+  check-keepass-session.py [--cli PATH]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from typing import List
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPTS_DIR)
+import keepass_ops  # noqa: E402
+
+FAKE_CLI = os.path.join(SCRIPTS_DIR, "bench", "fake-keepassxc-cli.py")
+PASSWORD = "master pass\\with \"quotes\""
+ARGS = [
+    "plain", "two words", "tab\there", 'quo"te', "back\\slash", "trailing\\", "",
+    "ends with > ", "db> ", "-q", "ünïcödé ✓", "Group/Env/API Key",
+]
+
+
+def decoded(out: str) -> List[str]:
+    return [json.loads(line) for line in out.splitlines()]
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Test keepass_ops.py session framing against an echoing keepassxc-cli double.")
+    p.add_argument("--cli", default=FAKE_CLI, help="keepassxc-cli to test (default: scripts/bench/fake-keepassxc-cli.py).")
+    args = p.parse_args()
+
+    problems: List[str] = []
+
+    def expect(label: str, got: object, want: object) -> None:
+        ok = got == want
+        print(f"  {'✓' if ok else '✗'} {label}")
+        if not ok:
+            problems.append(f"{label}: got {got!r}, expected {want!r}")
+
+    with tempfile.TemporaryDirectory(prefix="keepass-session-") as tmp:
+        db_path = os.path.join(tmp, "db.kdbx")
+        os.environ.update({
+            keepass_ops.CLI_ENV: args.cli,
+            "KEEPASS_INDEX_PATH": os.path.join(tmp, "index.json"),
+            "FAKE_KEEPASS_KDF": "0",
+        })
+        subprocess.run([args.cli, "db-create", "-p", db_path], input=f"{PASSWORD}\n{PASSWORD}\n", text=True, check=True)
+
+        session = keepass_ops.CliSession(db_path, PASSWORD, idle_timeout=0)
+        try:
+            code, out, err = session.run("echo", *ARGS)
+            expect("arguments arrive unchanged", (code, decoded(out), err), (0, ARGS, ""))
+
+            big = [f"{i:05d} " + "x" * 200 for i in range(1000)]
+            code, out, err = session.run("echo", *big)
+            expect(f"{len(out) >> 10} KiB of output ends at the prompt", (code, decoded(out)), (0, big))
+
+            code, out, err = session.run("echo", "-e", "first", "second")
+            expect("stderr is drained before the prompt", (code, decoded(out), err), (1, ["first", "second"], "echo: first\necho: second"))
+            code, out, err = session.run("echo", "next")
+            expect("the next command reads only its own output", (code, decoded(out), err), (0, ["next"], ""))
+
+            expect("mkdir in the session", session.run("mkdir", "Apps")[0], 0)
+            for command, answer in (("add", "new pass"), ("edit", 'changed "pass"')):
+                flags = ["-u", "ci", "-p"] if command == "add" else ["-p"]
+                expect(f"{command} in the session", session.run(command, *flags, "Apps/API Key", answers=(answer, answer))[0], 0)
+                expect(f"show after {command}", session.run("show", "-a", "Password", "Apps/API Key")[1].rstrip("\n"), answer)
+            pid = session.proc.pid
+            expect("session still open", (session.proc.poll(), session.proc.pid), (None, pid))
+        finally:
+            session.close()
+
+        os.environ["KEEPASS_SESSION"] = "0"
+        ok, message = keepass_ops.add_entry(db_path, PASSWORD, "Apps/prod/Token", "ci", "one-shot pass")
+        expect("add in one-shot mode", (ok, message), (True, "Added: Apps/prod/Token"))
+        expect("show in one-shot mode", keepass_ops.get_attribute(db_path, PASSWORD, "Apps/prod/Token", "Password"), (True, "one-shot pass"))
+        del os.environ["KEEPASS_SESSION"]
+        keepass_ops.close_sessions()
+        expect("show in a new session", keepass_ops.get_attribute(db_path, PASSWORD, "Apps/prod/Token", "Password"), (True, "one-shot pass"))
+        expect("no fallback to one-shot", keepass_ops._session_disabled, False)
+        keepass_ops.close_sessions()
+
+    if problems:
+        print("\nProblems:", file=sys.stderr)
+        for line in problems:
+            print(f"  ✗ {line}", file=sys.stderr)
+        return 1
+    print("\n  ✓ Session quoting, framing and password prompts work", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
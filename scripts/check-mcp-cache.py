@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Check for mcp-cache-proxy.py with a stub server: hits, pass-through writes, TTL and LRU.
+
+Runs mcp-stub-server.py (every call takes --delay seconds) behind the proxy with
+a throwaway mcp.json and cache directory, then acts as Cursor would. The stub ends
+every result with "call #N", so a cached answer is recognizable:
+
+- a repeated read is answered from the cache (same text, no upstream delay),
+  also when its arguments come in another key order
+- failing calls (isError) are never cached
+- a write (create_issue) passes through and clears the cache
+- behind a server of a kind in STATEFUL_TOOLS (playwright), a read such as
+  browser_snapshot is not cached unless --cache names it
+- entries expire after --ttl and the least recently used go beyond --max-entries
+- the stats file counts what happened
+- without --server, the name is the mcp.json entry that wraps the command with
+  the proxy; with no such entry, nothing is cached
+
+Exits 1 on any mismatch.
+
+Usage:
+  check-mcp-cache.py [--delay S] [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Tuple
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPTS_DIR)
+import mcp_stdio  # noqa: E402
+
+PROXY = os.path.join(SCRIPTS_DIR, "mcp-cache-proxy.py")
+STUB = os.path.join(SCRIPTS_DIR, "mcp-stub-server.py")
+TTL = 1.0
+MAX_ENTRIES = 3
+
+
+def call(process: mcp_stdio.McpProcess, tool: str, arguments: Dict[str, Any]) -> Tuple[str, float]:
+    """One tools/call; returns (result text, milliseconds)."""
+    t0 = time.perf_counter()
+    result = process.request("tools/call", {"name": tool, "arguments": arguments}, 10)
+    return result["content"][0]["text"], (time.perf_counter() - t0) * 1000
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Test mcp-cache-proxy.py against a stub MCP server.")
+    p.add_argument("--delay", type=float, default=0.05, help="Stub delay per response in seconds (default: 0.05).")
+    p.add_argument("--json", action="store_true", help="Print results as JSON.")
+    args = p.parse_args()
+
+    problems: List[str] = []
+
+    def expect(condition: bool, what: str) -> None:
+        if not condition:
+            problems.append(what)
+
+    with tempfile.TemporaryDirectory(prefix="mcp-cache-check-") as tmp:
+        upstream = [sys.executable, STUB, "--name", "stub", "--delay", str(args.delay)]
+        config_path = os.path.join(tmp, "mcp.json")
+        with open(config_path, "w", encoding="utf-8") as f:
+            servers = {name: {"command": upstream[0], "args": upstream[1:]} for name in ("stub", "playwright")}
+            json.dump({"mcpServers": servers}, f)
+        stats_path = os.path.join(tmp, "stats.json")
+        env = {**os.environ, mcp_stdio.MCP_CONFIG_ENV: config_path, "XDG_CACHE_HOME": tmp}
+        argv = [
+            sys.executable, PROXY, "--server", "stub", "--ttl", str(TTL), "--max-entries", str(MAX_ENTRIES),
+            "--stats", stats_path, "--", *upstream,
+        ]
+        process = mcp_stdio.McpProcess(argv, env)
+        miss_ms: List[float] = []
+        hit_ms: List[float] = []
+        try:
+            process.initialize(30)
+            first, ms = call(process, "search", {"query": "a", "limit": 5})
+            miss_ms.append(ms)
+            again, ms = call(process, "search", {"limit": 5, "query": "a"})
+            hit_ms.append(ms)
+            expect(again == first, f"repeated read not cached: {first!r} then {again!r}")
+
+            read, ms = call(process, "get_file_contents", {"path": "README.md"})
+            miss_ms.append(ms)
+            reread, ms = call(process, "get_file_contents", {"path": "README.md"})
+            hit_ms.append(ms)
+            expect(reread == read, "repeated get_file_contents not cached")
+
+            failed = [process.request("tools/call", {"name": "fail", "arguments": {}}, 10)["content"][0]["text"] for _ in range(2)]
+            expect(failed[0] != failed[1], "an isError result was cached")
+
+            write, _ = call(process, "create_issue", {"title": "t"})
+            expect(write.startswith("create_issue"), f"write not passed through: {write!r}")
+            after, _ = call(process, "search", {"query": "a", "limit": 5})
+            expect(after != first, "cache not cleared by a write")
+
+            for query in ("b", "c", "d"):
+                call(process, "search", {"query": query})
+            evicted, _ = call(process, "search", {"query": "a", "limit": 5})
+            expect(evicted != after, f"least recently used entry not evicted beyond {MAX_ENTRIES} entries")
+
+            kept, _ = call(process, "search", {"query": "d"})
+            time.sleep(TTL + 0.2)
+            expired, _ = call(process, "search", {"query": "d"})
+            expect(expired != kept, f"entry served after its {TTL:g}s TTL")
+        except (mcp_stdio.McpError, KeyError, IndexError) as e:
+            problems.append(f"session failed: {e} {process.stderr_tail()}")
+        finally:
+            process.close(timeout=5)
+
+        stateful_stats = os.path.join(tmp, "stateful-stats.json")
+        process = mcp_stdio.McpProcess([
+            sys.executable, PROXY, "--server", "playwright", "--cache", "search", "--stats", stateful_stats, "--", *upstream,
+        ], env)
+        try:
+            process.initialize(30)
+            snapshots = [call(process, "browser_snapshot", {})[0] for _ in range(2)]
+            expect(snapshots[0] != snapshots[1], "a stateful read (playwright browser_snapshot) was cached")
+            searches = [call(process, "search", {"query": "a"})[0] for _ in range(2)]
+            expect(searches[0] == searches[1], "a read opted in with --cache was not cached")
+        except (mcp_stdio.McpError, KeyError, IndexError) as e:
+            problems.append(f"stateful session failed: {e} {process.stderr_tail()}")
+        finally:
+            process.close(timeout=5)
+
+        # Without --server: the entry that wraps the stub with the proxy names it; with none, calls pass through.
+        unnamed = [sys.executable, STUB, "--name", "unnamed", "--delay", "0"]
+        wrapped = {"command": sys.executable, "args": [PROXY, "--", *unnamed]}
+        for label, servers, want_cached in (("mcp.json entry", {"wrapped": wrapped}, True), ("no mcp.json entry", {}, False)):
+            unnamed_config = os.path.join(tmp, "unnamed-mcp.json")
+            with open(unnamed_config, "w", encoding="utf-8") as f:
+                json.dump({"mcpServers": servers}, f)
+            process = mcp_stdio.McpProcess([sys.executable, PROXY, "--", *unnamed], {**env, mcp_stdio.MCP_CONFIG_ENV: unnamed_config})
+            try:
+                process.initialize(30)
+                reads = [call(process, "search", {"query": "a"})[0] for _ in range(2)]
+                expect((reads[0] == reads[1]) == want_cached, f"{label}: repeated read {'not ' if want_cached else ''}cached")
+            except (mcp_stdio.McpError, KeyError, IndexError) as e:
+                problems.append(f"{label}: session failed: {e} {process.stderr_tail()}")
+            finally:
+                process.close(timeout=5)
+        expect(os.path.exists(os.path.join(tmp, "cursor-mcp", "cache-stats-wrapped.json")), "stats not filed under the mcp.json name")
+
+        try:
+            with open(stateful_stats, "r", encoding="utf-8") as f:
+                expect(json.load(f).get("stateful") == 2, "stateful reads not counted")
+        except (OSError, ValueError) as e:
+            problems.append(f"no stats file for the stateful server: {e}")
+        try:
+            with open(stats_path, "r", encoding="utf-8") as f:
+                stats = json.load(f)
+        except (OSError, ValueError) as e:
+            stats = {}
+            problems.append(f"no stats file: {e}")
+
+    # Hits: search a, get_file_contents, search d (before expiry).
+    expected = {"hits": 3, "writes": 1, "evictions": 2, "expired": 1}
+    for key, value in expected.items():
+        expect(stats.get(key) == value, f"stats {key}: {stats.get(key)} (expected {value})")
+    expect(stats.get("saved_ms", 0) >= 3 * args.delay * 1000 * 0.8, f"saved_ms too low: {stats.get('saved_ms')}")
+
+    result = {
+        "miss_ms": [round(ms, 2) for ms in miss_ms],
+        "hit_ms": [round(ms, 2) for ms in hit_ms],
+        "stats": stats,
+    }
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"  upstream (miss): {', '.join(f'{ms:.1f}' for ms in miss_ms)} ms")
+        print(f"  cached (hit):    {', '.join(f'{ms:.2f}' for ms in hit_ms)} ms")
+        if stats:
+            print(
+                f"  stats: hits {stats['hits']}, misses {stats['misses']}, writes {stats['writes']}, "
+                f"evictions {stats['evictions']}, expired {stats['expired']}, saved {stats['saved_ms']:.0f} ms"
+            )
+    if problems:
+        print("\nProblems:", file=sys.stderr)
+        for line in problems:
+            print(f"  ✗ {line}", file=sys.stderr)
+        return 1
+    print("\n  ✓ Reads cached, writes and stateful reads pass through and invalidate, TTL and LRU work", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
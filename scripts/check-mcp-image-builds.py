@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Check for build-mcp-images.py without Docker: parallelism, skip-unchanged, failures.
+
+Copies docker/mcp-* to a temp directory and runs build-mcp-images.py with a build
+command that only sleeps --build-seconds (a stand-in for `docker build`) and with
+--state in place of image labels:
+
+- first run: every image builds, --jobs at a time (wall time ~ one build per
+  round, not the sum)
+- second run: nothing changed, nothing builds
+- one file changed: only that image builds
+- a failing build: exit code 1, the other images still build
+
+Exits 1 on any mismatch.
+
+Usage:
+  check-mcp-image-builds.py [--build-seconds S] [--jobs N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Tuple
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+BUILD = os.path.join(SCRIPTS_DIR, "build-mcp-images.py")
+DOCKER_DIR = os.path.join(os.path.dirname(SCRIPTS_DIR), "docker")
+
+
+def run(docker_dir: str, state: str, jobs: int, build_cmd: str) -> Tuple[int, float, List[str]]:
+    """One build-mcp-images.py run: (exit code, wall seconds, images it built)."""
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, BUILD, "--docker-dir", docker_dir, "--state", state, "--jobs", str(jobs), "--build-cmd", build_cmd],
+        capture_output=True,
+        text=True,
+    )
+    wall = time.perf_counter() - t0
+    built = sorted(line.split()[1] for line in proc.stdout.splitlines() if line.strip().startswith("✓"))
+    return proc.returncode, wall, built
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Test build-mcp-images.py with a fake build command.")
+    p.add_argument("--build-seconds", type=float, default=0.5, help="Duration of each fake build (default: 0.5).")
+    p.add_argument("--jobs", type=int, default=4, help="Parallel builds (default: 4).")
+    args = p.parse_args()
+
+    problems: List[str] = []
+    sleep_cmd = f"{sys.executable} -c 'import time; time.sleep({args.build_seconds})'"
+    with tempfile.TemporaryDirectory(prefix="mcp-build-check-") as tmp:
+        docker_dir = os.path.join(tmp, "docker")
+        shutil.copytree(DOCKER_DIR, docker_dir)
+        state = os.path.join(tmp, "state.json")
+        images = sorted(f"mcp/{name[4:]}:latest" for name in os.listdir(docker_dir) if name.startswith("mcp-"))
+
+        code, wall, built = run(docker_dir, state, args.jobs, sleep_cmd)
+        rounds = math.ceil(len(images) / args.jobs)
+        sequential = len(images) * args.build_seconds
+        print(f"  first run:   built {len(built)}/{len(images)} in {wall:.2f}s (sequential would be {sequential:.1f}s)")
+        if code != 0 or built != images:
+            problems.append(f"first run: exit {code}, built {built}")
+        if wall > rounds * args.build_seconds + 1.0:
+            problems.append(f"first run took {wall:.2f}s for {rounds} rounds of {args.build_seconds}s; builds did not overlap")
+
+        code, wall, built = run(docker_dir, state, args.jobs, sleep_cmd)
+        print(f"  unchanged:   built {len(built)} in {wall:.2f}s")
+        if code != 0 or built:
+            problems.append(f"unchanged run: exit {code}, built {built}")
+
+        changed = images[0].split("/")[1].split(":")[0]
+        with open(os.path.join(docker_dir, f"mcp-{changed}", "Dockerfile"), "a", encoding="utf-8") as f:
+            f.write("\n# changed\n")
+        code, wall, built = run(docker_dir, state, args.jobs, sleep_cmd)
+        print(f"  one changed: built {', '.join(built) or 'nothing'} in {wall:.2f}s")
+        if code != 0 or built != [images[0]]:
+            problems.append(f"after changing mcp-{changed}: exit {code}, built {built}")
+
+        with open(state, "w", encoding="utf-8") as f:
+            json.dump({}, f)
+        failing = f"{sys.executable} -c 'import sys; sys.exit(\"{{name}}\" == \"{changed}\")'"
+        code, wall, built = run(docker_dir, state, args.jobs, failing)
+        print(f"  one failing: exit {code}, built {len(built)}/{len(images)}")
+        if code != 1 or built != images[1:]:
+            problems.append(f"failing build: exit {code}, built {built}")
+        with open(state, "r", encoding="utf-8") as f:
+            if images[0] in json.load(f):
+                problems.append("a failed build was recorded as up to date")
+
+    if problems:
+        print("\nProblems:", file=sys.stderr)
+        for line in problems:
+            print(f"  ✗ {line}", file=sys.stderr)
+        return 1
+    print("\n  ✓ Parallel builds, skip-unchanged and failure handling work", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
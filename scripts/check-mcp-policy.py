@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Check for the MCP write policy (hooks/guardlib/mcp_policy.py) through guard-mcp-write.py.
+
+Runs the hook once per call, as Cursor does, with a throwaway mcp.json,
+mcp-policy.json and cache directory:
+
+- catalog: github's read tools are allowed and its writes ask
+- overrides: "*" beats the catalog entry of every server, whether the payload
+  names the server ("server") or is matched by its command line; a server's
+  own override beats "*"
+- fallback: tools missing from the table are classified by the heuristic and
+  remembered, and the remembered decisions survive a new hook process (the
+  heuristic digest is stable between processes)
+
+Exits 1 on any mismatch.
+
+Usage:
+  check-mcp-policy.py
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+HOOK = REPO_ROOT / "hooks" / "guard-mcp-write.py"
+GITHUB = {"command": "docker", "args": ["run", "-i", "--rm", "-e", "GITHUB_PERSONAL_ACCESS_TOKEN", "mcp/github"]}
+OVERRIDES = {
+    "*": {"run_workflow": "deny", "delete_file": "deny", "get_me": "ask"},
+    "github": {"delete_file": "ask"},
+}
+BY_COMMAND = {"command": "docker run -i --rm -e GITHUB_PERSONAL_ACCESS_TOKEN mcp/github"}
+BY_NAME = {"server": "github"}
+# (label, payload fields, tool, expected permission)
+CASES = [
+    ("catalog read", BY_COMMAND, "get_file_contents", "allow"),
+    ("catalog write", BY_COMMAND, "create_issue", "ask"),
+    ('"*" deny over a catalog write (command)', BY_COMMAND, "run_workflow", "deny"),
+    ('"*" deny over a catalog write (server name)', BY_NAME, "run_workflow", "deny"),
+    ('"*" ask over a catalog read', BY_NAME, "get_me", "ask"),
+    ('"*" for an unknown server', {"server": "elsewhere"}, "run_workflow", "deny"),
+    ('server override over "*"', BY_NAME, "delete_file", "ask"),
+    ("fallback: likely write", BY_NAME, "store_widget", "ask"),
+    ("fallback: read", BY_NAME, "describe_widget", "allow"),
+]
+
+
+def decide(env: Dict[str, str], fields: Dict[str, Any], tool: str) -> str:
+    payload = json.dumps({**fields, "tool_name": tool, "tool_input": {}})
+    proc = subprocess.run([sys.executable, str(HOOK)], input=payload, capture_output=True, text=True, env=env)
+    try:
+        return json.loads(proc.stdout).get("permission", "?")
+    except json.JSONDecodeError:
+        return f"no output ({proc.stderr.strip()[-200:]})"
+
+
+def main() -> int:
+    problems: List[str] = []
+
+    def expect(label: str, got: object, want: object) -> None:
+        ok = got == want
+        print(f"  {'✓' if ok else '✗'} {label}")
+        if not ok:
+            problems.append(f"{label}: got {got!r}, expected {want!r}")
+
+    with tempfile.TemporaryDirectory(prefix="mcp-policy-check-") as tmp:
+        config, overrides = os.path.join(tmp, "mcp.json"), os.path.join(tmp, "mcp-policy.json")
+        with open(config, "w", encoding="utf-8") as f:
+            json.dump({"mcpServers": {"github": GITHUB}}, f)
+        with open(overrides, "w", encoding="utf-8") as f:
+            json.dump(OVERRIDES, f)
+        env = {
+            **os.environ,
+            "CURSOR_MCP_CONFIG": config,
+            "CURSOR_MCP_POLICY": overrides,
+            "XDG_CACHE_HOME": tmp,
+            "CURSOR_HOOK_AUDIT": "0",
+        }
+        for label, fields, tool, want in CASES:
+            expect(f"{label}: {tool} -> {want}", decide(env, fields, tool), want)
+
+        memo = os.path.join(tmp, "cursor-hooks", "mcp-policy.memo")
+        size = os.path.getsize(memo) if os.path.exists(memo) else 0
+        expect("fallback decisions remembered", size > 0, True)
+        decide(env, BY_NAME, "store_widget")
+        expect("remembered decision reused by a new process", os.path.getsize(memo) if size else 0, size)
+
+    if problems:
+        print("\nProblems:", file=sys.stderr)
+        for line in problems:
+            print(f"  ✗ {line}", file=sys.stderr)
+        return 1
+    print("\n  ✓ Catalog, overrides and remembered fallback decisions work", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Check for mcp-pool.py with stub servers: warm hand-out, stdio contract, health checks.
+
+Writes a throwaway mcp.json whose entries run mcp-stub-server.py through
+`mcp-pool.py connect NAME -- ...` (your mcp.json is never touched), starts the
+pool on a temp socket and then acts as Cursor would:
+
+- cold: the upstream stub command started directly, time to the initialize result
+- pooled: the same through `connect` with the pool running, for --sessions
+  sessions in a row (initialize, tools/list, tools/call, close)
+- fallback: `connect` with no pool running still works (runs the command itself)
+- handshake: a client asking for another protocolVersion and capabilities than
+  the warm-up gets a server that saw its own initialize, and the sessions after
+  it are warm again (the pool warms with the client's parameters)
+- health: a stub that exits after its second request (the first health ping)
+  is detected and replaced
+- foreign socket: a listener running as another user (nobody) on the pool
+  socket gets nothing, and `connect` falls back to the command itself. Setting
+  up that user needs root; otherwise the case is reported as skipped.
+
+The stub sleeps --startup-delay seconds before answering, like a container start.
+Exits 1 if a session fails, the pool hands out a cold instance after warm-up, a
+client gets an initialize result for another protocol version, the crashing
+stub is not recycled, or a session is sent to another user's socket.
+
+Usage:
+  check-mcp-pool.py [--sessions N] [--startup-delay S] [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPTS_DIR)
+import mcp_stdio  # noqa: E402
+
+POOL = os.path.join(SCRIPTS_DIR, "mcp-pool.py")
+STUB = os.path.join(SCRIPTS_DIR, "mcp-stub-server.py")
+
+
+def stub_argv(name: str, startup_delay: float, *extra: str) -> List[str]:
+    return [sys.executable, STUB, "--name", name, "--startup-delay", str(startup_delay), *extra]
+
+
+# Another client than the warm-up (mcp_stdio.initialize_params()).
+OTHER_CLIENT = {"protocolVersion": "2025-03-26", "capabilities": {"roots": {"listChanged": True}}, "clientInfo": {"name": "check", "version": "1"}}
+
+
+def session(argv: List[str], env: Dict[str, str], params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """One Cursor-like session: initialize, tools/list, one tools/call; times the handshake."""
+    process = mcp_stdio.McpProcess(argv, env)
+    try:
+        info = process.initialize(60, params)
+        initialize_ms = (time.perf_counter() - process.started) * 1000
+        tools = process.request("tools/list", None, 10).get("tools") or []
+        call = process.request("tools/call", {"name": "search", "arguments": {"query": "pool"}}, 10)
+        text = call["content"][0]["text"]
+        return {
+            "ok": text.startswith("search") and len(tools) > 0,
+            "initialize_ms": initialize_ms,
+            "server": info.get("serverInfo", {}).get("name"),
+            "protocol": info.get("protocolVersion"),
+        }
+    except (mcp_stdio.McpError, KeyError, IndexError) as e:
+        return {"ok": False, "error": f"{e} {process.stderr_tail()}"}
+    finally:
+        process.close(timeout=5)
+
+
+def load_pool_module() -> Any:
+    spec = importlib.util.spec_from_file_location("mcp_pool", POOL)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)  # type: ignore[union-attr]
+    return module
+
+
+mcp_pool = load_pool_module()
+
+
+def pool_status(env: Dict[str, str]) -> Dict[str, Any]:
+    try:
+        ok, payload = mcp_pool.request("status", env["MCP_POOL_SOCK"])
+    except OSError:
+        return {}
+    return json.loads(payload) if ok else {}
+
+
+def wait_ready(env: Dict[str, str], server: str, count: int, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if pool_status(env).get(server, {}).get("ready", 0) >= count:
+            return True
+        time.sleep(0.1)
+    return False
+
+
+FOREIGN_UID = 65534  # nobody
+
+
+def foreign_listener(path: str, log: str) -> None:
+    """As another user: answer like a pool on path and record whatever a client sends to log."""
+    os.setgid(FOREIGN_UID)
+    os.setuid(FOREIGN_UID)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen(4)
+    while True:
+        conn, _ = server.accept()
+        conn.sendall(b"OK\n")
+        conn.settimeout(2)
+        try:
+            data = conn.recv(65536)
+        except OSError:
+            data = b""
+        with open(log, "ab") as f:
+            f.write(data)
+        conn.close()
+
+
+def foreign_socket(connect_argv: List[str]) -> Optional[Dict[str, Any]]:
+    """A session through `connect` while another user listens on the pool socket; None without root."""
+    if not hasattr(os, "getuid") or os.getuid() != 0:
+        return None
+    directory = tempfile.mkdtemp(prefix="mcp-pool-foreign-")
+    os.chmod(directory, 0o777)
+    path, log = os.path.join(directory, "pool.sock"), os.path.join(directory, "received")
+    pid = os.fork()
+    if not pid:
+        try:
+            foreign_listener(path, log)
+        finally:
+            os._exit(1)
+    try:
+        for _ in range(100):
+            if os.path.exists(path):
+                break
+            time.sleep(0.05)
+        result = session([sys.executable, *connect_argv], {**os.environ, "MCP_POOL_SOCK": path})
+        try:
+            with open(log, "rb") as f:
+                result["received"] = len(f.read())
+        except FileNotFoundError:
+            result["received"] = 0
+        return result
+    finally:
+        os.kill(pid, signal.SIGKILL)
+        os.waitpid(pid, 0)
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Test mcp-pool.py against stub MCP servers.")
+    p.add_argument("--sessions", type=int, default=5, help="Pooled sessions in a row (default: 5).")
+    p.add_argument("--startup-delay", type=float, default=1.0, help="Stub start-up time in seconds (default: 1.0).")
+    p.add_argument("--json", action="store_true", help="Print results as JSON.")
+    args = p.parse_args()
+
+    problems: List[str] = []
+    with tempfile.TemporaryDirectory(prefix="mcp-pool-check-") as tmp:
+        upstream = stub_argv("stub", args.startup_delay)
+        crashing = stub_argv("stub-crash", 0.0, "--exit-after", "2")
+        config = {
+            "mcpServers": {
+                "stub": {"command": sys.executable, "args": [POOL, "connect", "stub", "--", *upstream]},
+                "stub-crash": {"command": sys.executable, "args": [POOL, "connect", "stub-crash", "--", *crashing]},
+            }
+        }
+        config_path = os.path.join(tmp, "mcp.json")
+        with open(config_path, "w", encoding="utf-8") as f:
+            json.dump(config, f)
+        env = {**os.environ, "MCP_POOL_SOCK": os.path.join(tmp, "pool.sock")}
+        connect_argv = config["mcpServers"]["stub"]["args"]
+
+        cold = session(upstream, env)
+        fallback = session([sys.executable, *connect_argv], env)
+        if not fallback["ok"]:
+            problems.append(f"fallback without a pool failed: {fallback.get('error')}")
+        foreign = foreign_socket(connect_argv)
+        if foreign is not None and (not foreign["ok"] or foreign["received"]):
+            problems.append(
+                f"another user's socket: session {'ok' if foreign['ok'] else 'failed: ' + str(foreign.get('error'))}, "
+                f"{foreign['received']} bytes sent to it"
+            )
+
+        pool = subprocess.Popen(
+            [sys.executable, POOL, "serve", "--config", config_path, "--size", "2", "--health-interval", "0.5", "--max-idle", "60"],
+            env=env,
+            stderr=subprocess.DEVNULL,
+        )
+        pooled: List[Dict[str, Any]] = []
+        other: List[Dict[str, Any]] = []
+        try:
+            if not wait_ready(env, "stub", 2, args.startup_delay * 2 + 10):
+                problems.append("pool did not get 2 ready stub instances")
+            for _ in range(args.sessions):
+                # Sessions come no faster than a start-up, so the refill keeps up.
+                wait_ready(env, "stub", 1, args.startup_delay * 2 + 10)
+                pooled.append(session([sys.executable, *connect_argv], env))
+            warm_status = pool_status(env).get("stub", {})
+            other.append(session([sys.executable, *connect_argv], env, OTHER_CLIENT))
+            if not wait_ready(env, "stub", 2, args.startup_delay * 2 + 10):
+                problems.append("pool did not warm 2 instances with the other client's handshake")
+            other.append(session([sys.executable, *connect_argv], env, OTHER_CLIENT))
+            time.sleep(2.0)  # a few health-check rounds for stub-crash
+            status = pool_status(env)
+        finally:
+            subprocess.run([sys.executable, POOL, "stop"], env=env, capture_output=True)
+            try:
+                pool.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                pool.kill()
+
+    failed = [s for s in pooled if not s["ok"]]
+    problems += [f"pooled session failed: {s.get('error')}" for s in failed]
+    stub_status = status.get("stub", {})
+    if stub_status.get("cold"):
+        problems.append(f"{stub_status['cold']} pooled sessions got a cold instance")
+    for i, s in enumerate(other):
+        if not s["ok"] or s["protocol"] != OTHER_CLIENT["protocolVersion"]:
+            problems.append(f"other-client session {i + 1}: {s.get('error') or 'initialize answered for ' + str(s['protocol'])}")
+    if stub_status.get("mismatched") != 1 or stub_status.get("warm", 0) - warm_status.get("warm", 0) != 2:
+        problems.append(f"other client: expected 1 mismatched then 1 warm session, got {stub_status}")
+    if not status.get("stub-crash", {}).get("unhealthy"):
+        problems.append("crashing stub instances were not detected by the health check")
+
+    warm_ms = sorted(s["initialize_ms"] for s in pooled if s["ok"])
+    result = {
+        "cold_initialize_ms": round(cold.get("initialize_ms", 0.0), 1),
+        "fallback_initialize_ms": round(fallback.get("initialize_ms", 0.0), 1),
+        "foreign_socket": foreign and {"ok": foreign["ok"], "bytes_received": foreign["received"]},
+        "pooled_initialize_ms_median": round(warm_ms[len(warm_ms) // 2], 1) if warm_ms else None,
+        "other_client_initialize_ms": [round(s.get("initialize_ms", 0.0), 1) for s in other],
+        "sessions": len(pooled),
+        "failed_sessions": len(failed),
+        "pool_status": status,
+    }
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"  cold start (direct):     initialize {result['cold_initialize_ms']:8.1f} ms")
+        print(f"  no pool (fallback):      initialize {result['fallback_initialize_ms']:8.1f} ms")
+        if foreign is None:
+            print("  another user's socket:   skipped (needs root to listen as another user)")
+        else:
+            print(f"  another user's socket:   {'ok' if foreign['ok'] else 'failed'}, {foreign['received']} bytes sent to it")
+        print(f"  pooled ({len(pooled)} sessions):    initialize {result['pooled_initialize_ms_median'] or 0:8.1f} ms median")
+        print(f"  other client (fresh, then warm): initialize {' / '.join(f'{ms:.1f}' for ms in result['other_client_initialize_ms'])} ms")
+        for name, s in status.items():
+            print(
+                f"  {name:12} sessions {s['sessions']} (warm {s['warm']}, cold {s['cold']}, mismatched {s['mismatched']})  "
+                f"unhealthy {s['unhealthy']}  failed starts {s['start_failures']}"
+            )
+    if problems:
+        print("\nProblems:", file=sys.stderr)
+        for line in problems:
+            print(f"  ✗ {line}", file=sys.stderr)
+        return 1
+    print("\n  ✓ Warm sessions, fallback, handshake matching and health checks work", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
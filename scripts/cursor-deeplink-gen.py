@@ -6,6 +6,15 @@ Author intent:
 - Generate Cursor deeplinks in either app format (cursor://...) or web format (https://cursor.com/link/...)
 - Ensure query params are correctly URL-encoded.
 - Enforce / warn about 8,000-character URL length limit (after encoding).
+- Bulk mode: one link per commands/*.md, rules/*.mdc, skills/*/SKILL.md and
+  mcp.json server, encoded once each across a worker pool, streamed as JSONL or
+  markdown. With --manifest, links are cached by content hash and only changed
+  sources are re-encoded.
+- --fit: shrink links over the limit before building them (lengths are computed
+  without encoding): whitespace normalization, dropped default fields for MCP
+  configs (always encoded as compact JSON), and as a last resort ordered prompt
+  parts. A link that still does not fit is reported with the steps tried and how
+  far over the limit it is.
 
 Docs:
 - https://cursor.com/docs/integrations/deeplinks.md
@@ -16,15 +25,27 @@ from __future__ import annotations
 
 import argparse
 import base64
+import glob
+import hashlib
 import json
+import os
+import string
 import sys
-from typing import Any, Dict, Tuple
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Tuple
 from urllib.parse import urlencode
 
 
 APP_BASE = "cursor://anysphere.cursor-deeplink"
 WEB_BASE = "https://cursor.com/link"
 MAX_URL_LEN = 8000
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BULK_KINDS = ("command", "rule", "skill", "mcp")
+# Bump when the link format or fit results change (bases, skill prompt wording, transforms), so cached links are rebuilt.
+MANIFEST_VERSION = 2
+RESULT_KEYS = ("kind", "name", "source", "app", "web", "app_len", "web_len", "fits", "before", "saved", "tried", "parts", "error")
+SKILL_PROMPT = "Create the file .cursor/skills/{name}/SKILL.md with exactly this content:\n\n{text}"
 
 
 def _json_loads(s: str) -> Any:
@@ -42,40 +63,39 @@ def _read_text_file(path: str) -> str:
         raise SystemExit(f"File not found: {path}") from e
 
 
-def _make_url(base: str, path: str, params: Dict[str, str]) -> str:
+def _make_links(path: str, params: Dict[str, str]) -> Tuple[str, str]:
+    """(app, web) for one payload; the query is encoded once and shared by both."""
     # urlencode uses application/x-www-form-urlencoded:
     # - spaces -> '+'
     # - '+' encoded as %2B (important for base64)
     query = urlencode(params)
-    return f"{base}{path}?{query}" if query else f"{base}{path}"
+    suffix = f"{path}?{query}" if query else path
+    return f"{APP_BASE}{suffix}", f"{WEB_BASE}{suffix}"
 
 
 def gen_prompt_links(text: str) -> Tuple[str, str]:
-    app = _make_url(APP_BASE, "/prompt", {"text": text})
-    web = _make_url(WEB_BASE, "/prompt", {"text": text})
-    return app, web
+    return _make_links("/prompt", {"text": text})
 
 
 def gen_command_links(name: str, text: str) -> Tuple[str, str]:
-    app = _make_url(APP_BASE, "/command", {"name": name, "text": text})
-    web = _make_url(WEB_BASE, "/command", {"name": name, "text": text})
-    return app, web
+    return _make_links("/command", {"name": name, "text": text})
 
 
 def gen_rule_links(name: str, text: str) -> Tuple[str, str]:
-    app = _make_url(APP_BASE, "/rule", {"name": name, "text": text})
-    web = _make_url(WEB_BASE, "/rule", {"name": name, "text": text})
-    return app, web
+    return _make_links("/rule", {"name": name, "text": text})
 
 
 def _extract_mcp_transport_config(config_obj: Any, name: str) -> Dict[str, Any]:
     """
     Accepts either:
-    A) transport config object: {"command": "...", "args": [...] , ...}
+    A) transport config object: {"command": "...", "args": [...] , ...} or {"url": "..."}
     B) mcp.json-style object:  {"postgres": {"command": "...", "args": [...]}}
        In this case, we pick config_obj[name].
+    C) a whole mcp.json: {"mcpServers": {"postgres": {...}}}
     """
-    if isinstance(config_obj, dict) and "command" in config_obj:
+    if isinstance(config_obj, dict) and isinstance(config_obj.get("mcpServers"), dict):
+        config_obj = config_obj["mcpServers"]
+    if isinstance(config_obj, dict) and ("command" in config_obj or "url" in config_obj):
         # Looks like a single transport config
         return config_obj
 
@@ -84,7 +104,7 @@ def _extract_mcp_transport_config(config_obj: Any, name: str) -> Dict[str, Any]:
 
     raise SystemExit(
         "MCP config must be either a transport config object "
-        '(e.g. {"command":"npx","args":[...]}) '
+        '(e.g. {"command":"npx","args":[...]} or {"url":"https://..."}) '
         f'or an mcp.json-style mapping containing key "{name}".'
     )
 
@@ -102,11 +122,380 @@ def gen_mcp_install_links(name: str, config_json: str) -> Tuple[str, str, str]:
     cfg_str = json.dumps(transport_cfg, separators=(",", ":"), ensure_ascii=False)
     cfg_b64 = base64.b64encode(cfg_str.encode("utf-8")).decode("ascii")
 
-    app = _make_url(APP_BASE, "/mcp/install", {"name": name, "config": cfg_b64})
-    web = _make_url(WEB_BASE, "/mcp/install", {"name": name, "config": cfg_b64})
+    app, web = _make_links("/mcp/install", {"name": name, "config": cfg_b64})
     return app, web, cfg_str
 
 
+# Bytes quote_plus keeps as one character (space becomes '+'); any other byte is %XX.
+_ONE_CHAR_BYTES = (string.ascii_letters + string.digits + "_.-~ ").encode("ascii")
+# Transforms tried by fit_links, in order, until the link fits.
+FIT_TRANSFORMS = {
+    "prompt": ("whitespace", "split"),
+    "command": ("whitespace",),
+    "rule": ("whitespace",),
+    "skill": ("whitespace", "split"),
+    "mcp": ("drop-defaults",),
+}
+PART_HEADER = "[Part {i}/{n} of one prompt. Wait for part {n} before acting.]\n\n"
+
+
+def encoded_len(value: str) -> int:
+    """len(quote_plus(value)), without building the encoded string."""
+    data = value.encode("utf-8")
+    return len(data) + 2 * len(data.translate(None, _ONE_CHAR_BYTES))
+
+
+def link_len(path: str, params: Dict[str, str]) -> int:
+    """Length of the longer link _make_links would build for these params."""
+    query = sum(encoded_len(k) + 1 + encoded_len(v) for k, v in params.items()) + len(params) - 1
+    return max(len(APP_BASE), len(WEB_BASE)) + len(path) + (1 + query if params else 0)
+
+
+def normalize_whitespace(text: str) -> str:
+    """LF line ends, no trailing blanks, at most one empty line in a row; indentation is kept."""
+    out: List[str] = []
+    for line in text.replace("\r\n", "\n").split("\n"):
+        line = line.rstrip()
+        if line or (out and out[-1]):
+            out.append(line)
+    return "\n".join(out).strip("\n") + "\n"
+
+
+def _drop_defaults(cfg_str: str) -> str:
+    """Drop fields Cursor fills in anyway: empty args/env/headers, type stdio, disabled false."""
+    cfg = json.loads(cfg_str)
+    cfg = {k: v for k, v in cfg.items() if not (k in ("args", "env", "headers") and not v) and not (k == "disabled" and v is False)}
+    if cfg.get("type") == "stdio" and "command" in cfg:
+        del cfg["type"]
+    return json.dumps(cfg, separators=(",", ":"), ensure_ascii=False, sort_keys=True)
+
+
+_TRANSFORMS = {"whitespace": normalize_whitespace, "drop-defaults": _drop_defaults}
+
+
+def _fit_params(kind: str, name: str, payload: str) -> Tuple[str, Dict[str, str]]:
+    if kind == "mcp":
+        return "/mcp/install", {"name": name, "config": base64.b64encode(payload.encode("utf-8")).decode("ascii")}
+    if kind == "skill":
+        return "/prompt", {"text": SKILL_PROMPT.format(name=name, text=payload)}
+    if kind == "prompt":
+        return "/prompt", {"text": payload}
+    return f"/{kind}", {"name": name, "text": payload}
+
+
+def split_prompt(text: str) -> List[str]:
+    """Ordered prompt parts whose links each fit MAX_URL_LEN, cut at line ends where possible."""
+    room = MAX_URL_LEN - link_len("/prompt", {"text": ""}) - encoded_len(PART_HEADER.format(i=9999, n=9999))
+    pieces: List[str] = []
+    for line in text.splitlines(keepends=True):
+        if encoded_len(line) <= room:
+            pieces.append(line)
+            continue
+        start, used = 0, 0
+        for i, ch in enumerate(line):
+            n = encoded_len(ch)
+            if used + n > room:
+                pieces.append(line[start:i])
+                start, used = i, 0
+            used += n
+        pieces.append(line[start:])
+    parts: List[str] = []
+    current: List[str] = []
+    used = 0
+    for piece in pieces:
+        n = encoded_len(piece)
+        if current and used + n > room:
+            parts.append("".join(current))
+            current, used = [], 0
+        current.append(piece)
+        used += n
+    if current:
+        parts.append("".join(current))
+    return [PART_HEADER.format(i=i, n=len(parts)) + part for i, part in enumerate(parts, 1)]
+
+
+def fit_links(kind: str, name: str, payload: Any) -> Dict[str, Any]:
+    """Links for one item shrunk to MAX_URL_LEN by FIT_TRANSFORMS[kind], applied in order.
+
+    payload is the text, or the transport config dict for "mcp". Lengths are
+    computed with link_len, so no URL is built until the last transform that was
+    needed; transforms after the link fits are skipped, and one that does not
+    shorten the link is not kept. Prompts (and skills) still
+    too long are split into ordered parts, one link each. Returns the links, the
+    length before and after, the transforms tried in order and the bytes each
+    saved.
+    """
+    current = json.dumps(payload, separators=(",", ":"), ensure_ascii=False) if kind == "mcp" else payload
+    before = length = link_len(*_fit_params(kind, name, current))
+    saved: Dict[str, int] = {}
+    tried: List[str] = []
+    texts = None
+    for transform in FIT_TRANSFORMS[kind]:
+        if length <= MAX_URL_LEN:
+            break
+        tried.append(transform)
+        if transform == "split":
+            texts = split_prompt(_fit_params(kind, name, current)[1]["text"])
+            break
+        candidate = _TRANSFORMS[transform](current)
+        new_length = link_len(*_fit_params(kind, name, candidate))
+        saved[transform] = max(0, length - new_length)
+        if new_length < length:
+            current, length = candidate, new_length
+    if texts is None:
+        links = [_make_links(*_fit_params(kind, name, current))]
+    else:
+        links = [_make_links("/prompt", {"text": text}) for text in texts]
+    length = max(len(url) for pair in links for url in pair)
+    return {"links": links, "payload": current, "before": before, "length": length, "fits": length <= MAX_URL_LEN, "saved": saved, "tried": tried}
+
+
+def over_limit(length: int, tried: List[str]) -> str:
+    """Why a link still does not fit: how far over MAX_URL_LEN, after which transforms."""
+    return f"still {length - MAX_URL_LEN} over {MAX_URL_LEN} after {', '.join(tried) or 'no transform'}"
+
+
+def fit_report(fitted: Dict[str, Any]) -> str:
+    """One line: length before -> after, bytes saved per transform, number of parts."""
+    steps = [f"{t} -{n}" for t, n in fitted["saved"].items()]
+    if len(fitted["links"]) > 1:
+        steps.append(f"split into {len(fitted['links'])} parts")
+    status = "fits" if fitted["fits"] else over_limit(fitted["length"], fitted["tried"])
+    return f"fit: {fitted['before']} -> {fitted['length']} ({', '.join(steps) or 'no transform needed'}); {status}"
+
+
+def collect_bulk_items(root: str, kinds: Tuple[str, ...] = BULK_KINDS) -> List[Dict[str, Any]]:
+    """Everything in the repo that can be published as a deeplink, in a stable order.
+
+    Items are small dicts (kind, name, source, and text or config) so they can be
+    hashed here and sent to worker processes.
+    """
+    items: List[Dict[str, Any]] = []
+    if "command" in kinds:
+        for path in sorted(glob.glob(os.path.join(root, "commands", "*.md"))):
+            items.append({"kind": "command", "name": os.path.splitext(os.path.basename(path))[0], "source": path})
+    if "rule" in kinds:
+        for path in sorted(glob.glob(os.path.join(root, "rules", "*.mdc")) + glob.glob(os.path.join(root, "rules", "*.md"))):
+            items.append({"kind": "rule", "name": os.path.splitext(os.path.basename(path))[0], "source": path})
+    if "skill" in kinds:
+        for path in sorted(glob.glob(os.path.join(root, "skills", "*", "SKILL.md"))):
+            items.append({"kind": "skill", "name": os.path.basename(os.path.dirname(path)), "source": path})
+    mcp_path = os.path.join(root, "mcp.json")
+    if "mcp" in kinds and os.path.exists(mcp_path):
+        servers = _json_loads(_read_text_file(mcp_path)).get("mcpServers", {})
+        for name, cfg in servers.items():
+            items.append({"kind": "mcp", "name": name, "source": mcp_path, "config": cfg})
+    for item in items:
+        if item["kind"] != "mcp":
+            try:
+                with open(item["source"], "r", encoding="utf-8") as f:
+                    item["text"] = f.read()
+            except (OSError, UnicodeDecodeError) as e:
+                item["error"] = str(e)
+    return items
+
+
+def item_hash(item: Dict[str, Any]) -> str:
+    """Content address of an item: everything its links are built from."""
+    payload = item.get("config") if item["kind"] == "mcp" else item.get("text")
+    key = json.dumps([MANIFEST_VERSION, APP_BASE, WEB_BASE, item["kind"], item["name"], payload, item.get("fit", False)], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def build_bulk_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Encode one item into its app/web links plus the per-item length check.
+
+    Cursor has no skill deeplink, so a skill becomes a prompt link that asks the
+    agent to create .cursor/skills/<name>/SKILL.md with the file's content.
+    Items marked "fit" go through fit_links; a split prompt keeps its first part
+    in app/web and lists every part under "parts".
+    """
+    kind, name = item["kind"], item["name"]
+    if "error" in item:
+        return {"kind": kind, "name": name, "source": item["source"], "error": item["error"], "fits": False}
+    try:
+        if item.get("fit"):
+            return _fitted_bulk_result(item, fit_links(kind, name, item["config"] if kind == "mcp" else item["text"]))
+        if kind == "mcp":
+            app, web, _ = gen_mcp_install_links(name, json.dumps(item["config"]))
+        elif kind == "command":
+            app, web = gen_command_links(name, item["text"])
+        elif kind == "rule":
+            app, web = gen_rule_links(name, item["text"])
+        else:
+            app, web = gen_prompt_links(SKILL_PROMPT.format(name=name, text=item["text"]))
+    except SystemExit as e:
+        return {"kind": kind, "name": name, "source": item["source"], "error": str(e), "fits": False}
+    longest = max(len(app), len(web))
+    return {
+        "kind": kind,
+        "name": name,
+        "source": item["source"],
+        "app": app,
+        "web": web,
+        "app_len": len(app),
+        "web_len": len(web),
+        "fits": longest <= MAX_URL_LEN,
+    }
+
+
+def _fitted_bulk_result(item: Dict[str, Any], fitted: Dict[str, Any]) -> Dict[str, Any]:
+    links = fitted["links"]
+    r = {
+        "kind": item["kind"],
+        "name": item["name"],
+        "source": item["source"],
+        "app": links[0][0],
+        "web": links[0][1],
+        "app_len": max(len(app) for app, _ in links),
+        "web_len": max(len(web) for _, web in links),
+        "fits": fitted["fits"],
+        "before": fitted["before"],
+        "saved": fitted["saved"],
+        "tried": fitted["tried"],
+    }
+    if len(links) > 1:
+        r["parts"] = [{"app": app, "web": web} for app, web in links]
+    return r
+
+
+def iter_bulk_links(items: List[Dict[str, Any]], jobs: int) -> Iterator[Dict[str, Any]]:
+    """Build results in item order, streamed as they complete (worker pool if jobs > 1)."""
+    if jobs <= 1 or len(items) <= 1:
+        yield from map(build_bulk_item, items)
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        yield from pool.map(build_bulk_item, items, chunksize=max(1, len(items) // (jobs * 4)))
+
+
+def _print_bulk_result(r: Dict[str, Any], only: str | None, fmt: str, root: str) -> None:
+    source = os.path.relpath(r["source"], root)
+    if fmt == "jsonl":
+        other = {"app": "web", "web": "app"}.get(only or "")
+        record = {k: r[k] for k in RESULT_KEYS if k in r and (other is None or not k.startswith(other))}
+        if other and "parts" in record:
+            record["parts"] = [{only: part[only]} for part in record["parts"]]
+        record["source"] = source
+        print(json.dumps(record, ensure_ascii=False), flush=True)
+        return
+    print(f"### {r['kind']}: {r['name']} (`{source}`)\n")
+    if "error" in r:
+        print(f"- ERROR: {r['error']}\n", flush=True)
+        return
+    for i, part in enumerate(r.get("parts") or [r], 1):
+        label = f" (part {i}/{len(r['parts'])})" if "parts" in r else ""
+        if only != "app":
+            print(f"- WEB{label}: {part['web']}")
+        if only != "web":
+            print(f"- APP{label}: {part['app']}")
+    if "saved" in r:
+        steps = [f"{t} -{n}" for t, n in r["saved"].items()]
+        print(f"- fit: {r['before']} -> {max(r['web_len'], r['app_len'])}" + (f" ({', '.join(steps)})" if steps else ""))
+    if r["fits"]:
+        print(f"- length: web {r['web_len']}, app {r['app_len']}\n", flush=True)
+    else:
+        print(f"- WARNING: length web {r['web_len']}, app {r['app_len']} > {MAX_URL_LEN} (Cursor deeplink max)", flush=True)
+        if "tried" in r:
+            print(f"- fit: {over_limit(max(r['web_len'], r['app_len']), r['tried'])}", flush=True)
+        print("", flush=True)
+
+
+def load_manifest(path: str) -> Dict[str, Any]:
+    """Previous manifest, or an empty one if missing, unreadable or from another version."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return manifest if isinstance(manifest, dict) and manifest.get("version") == MANIFEST_VERSION else {}
+
+
+def _write_manifest(path: str, manifest: Dict[str, Any]) -> None:
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True, ensure_ascii=False)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+def run_bulk(
+    root: str,
+    kinds: Tuple[str, ...],
+    jobs: int,
+    only: str | None,
+    fmt: str,
+    manifest_path: str | None = None,
+    force: bool = False,
+    fit: bool = False,
+) -> int:
+    """Print every link; with a manifest, reuse links whose source hash is unchanged.
+
+    The manifest maps content hash -> links and "kind:name" -> hash. Sources whose
+    hash changed are reported as stale, sources that no longer exist as orphaned;
+    both are dropped from the manifest.
+    """
+    t0 = time.perf_counter()
+    items = collect_bulk_items(root, kinds)
+    t_collect = time.perf_counter()
+    old = load_manifest(manifest_path) if manifest_path else {}
+    cached: Dict[str, Any] = {} if force else old.get("entries", {})
+    for item in items:
+        if fit:
+            item["fit"] = True
+        item["hash"] = item_hash(item)
+    t_hash = time.perf_counter()
+
+    fresh = iter_bulk_links([it for it in items if it["hash"] not in cached], jobs)
+    entries: Dict[str, Any] = {}
+    sources: Dict[str, str] = {}
+    too_long, failed = [], []
+    reused = 0
+    for item in items:
+        if item["hash"] in cached:
+            r = {**cached[item["hash"]], "source": item["source"]}
+            reused += 1
+        else:
+            r = next(fresh)
+        _print_bulk_result(r, only, fmt, root)
+        key = f"{r['kind']}:{r['name']}"
+        if "error" in r:
+            failed.append(key)
+            continue
+        if not r["fits"]:
+            over = max(r["web_len"], r["app_len"]) - MAX_URL_LEN
+            too_long.append(f"{key} (+{over}" + (f" after {', '.join(r['tried']) or 'no transform'})" if "tried" in r else ")"))
+        sources[key] = item["hash"]
+        entries[item["hash"]] = {**r, "source": os.path.relpath(r["source"], root)}
+    t_encode = time.perf_counter()
+
+    print(f"  {len(items)} items, {len(too_long)} over {MAX_URL_LEN} chars" + (f": {', '.join(too_long)}" if too_long else ""), file=sys.stderr)
+    if failed:
+        print(f"  {len(failed)} failed: {', '.join(failed)}", file=sys.stderr)
+    if manifest_path:
+        old_sources: Dict[str, str] = old.get("sources", {})
+        stale = sorted(k for k, h in old_sources.items() if k in sources and sources[k] != h)
+        orphaned = sorted(k for k in old_sources if k not in sources and k.split(":", 1)[0] in kinds and k not in failed)
+        # Kinds not built in this run keep their manifest entries.
+        for k, h in old_sources.items():
+            if k.split(":", 1)[0] not in kinds and h in old.get("entries", {}):
+                sources[k] = h
+                entries[h] = old["entries"][h]
+        _write_manifest(manifest_path, {"version": MANIFEST_VERSION, "sources": sources, "entries": entries, "stale": stale, "orphaned": orphaned})
+        t_end = time.perf_counter()
+        print(
+            f"  manifest {manifest_path}: {len(items) - reused} encoded, {reused} reused, "
+            f"{len(stale)} stale{': ' + ', '.join(stale) if stale else ''}, "
+            f"{len(orphaned)} orphaned{': ' + ', '.join(orphaned) if orphaned else ''}",
+            file=sys.stderr,
+        )
+        print(
+            f"  build: collect {(t_collect - t0) * 1000:.1f} ms, hash {(t_hash - t_collect) * 1000:.1f} ms, "
+            f"encode {(t_encode - t_hash) * 1000:.1f} ms, manifest {(t_end - t_encode) * 1000:.1f} ms, total {(t_end - t0) * 1000:.1f} ms",
+            file=sys.stderr,
+        )
+    return 1 if too_long or failed else 0
+
+
 def _print_links(app: str, web: str, only: str | None, as_md: bool) -> None:
     def warn(url: str) -> str:
         if len(url) > MAX_URL_LEN:
@@ -144,6 +533,15 @@ def _print_links(app: str, web: str, only: str | None, as_md: bool) -> None:
     print(warn(app), file=sys.stderr)
 
 
+def _print_fitted(fitted: Dict[str, Any], only: str | None, as_md: bool) -> None:
+    links = fitted["links"]
+    for i, (app, web) in enumerate(links, 1):
+        if len(links) > 1:
+            print(f"{'## ' if as_md else ''}Part {i}/{len(links)}")
+        _print_links(app, web, only, as_md)
+    print(f"  {fit_report(fitted)}", file=sys.stderr)
+
+
 def main(argv: list[str] | None = None) -> int:
     p = argparse.ArgumentParser(
         prog="cursor-deeplink-gen",
@@ -151,27 +549,46 @@ def main(argv: list[str] | None = None) -> int:
     )
     p.add_argument("--only", choices=["web", "app"], default=None, help="Print only one link format.")
     p.add_argument("--md", action="store_true", help="Emit markdown-friendly output labels.")
+    p.add_argument("--fit", action="store_true", help=f"Shrink links over {MAX_URL_LEN} chars (whitespace, MCP defaults; split prompts).")
+    # Same options after the subcommand (as in the docs: `prompt --text ... --md`).
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--only", choices=["web", "app"], default=argparse.SUPPRESS, help=argparse.SUPPRESS)
+    common.add_argument("--md", action="store_true", default=argparse.SUPPRESS, help=argparse.SUPPRESS)
+    common.add_argument("--fit", action="store_true", default=argparse.SUPPRESS, help=argparse.SUPPRESS)
     sub = p.add_subparsers(dest="cmd", required=True)
 
-    sp = sub.add_parser("prompt", help="Generate a prompt deeplink.")
+    sp = sub.add_parser("prompt", parents=[common], help="Generate a prompt deeplink.")
     sp.add_argument("--text", required=True, help="Prompt text (plain language).")
 
-    sc = sub.add_parser("command", help="Generate a command deeplink.")
+    sc = sub.add_parser("command", parents=[common], help="Generate a command deeplink.")
     sc.add_argument("--name", required=True, help="Command name (e.g., debug-api).")
     sc.add_argument("--text", required=True, help="Command content (markdown/plain).")
 
-    sr = sub.add_parser("rule", help="Generate a rule deeplink.")
+    sr = sub.add_parser("rule", parents=[common], help="Generate a rule deeplink.")
     sr.add_argument("--name", required=True, help="Rule name (file base name).")
     sr.add_argument("--text", required=True, help="Rule content (markdown/plain).")
 
-    sm = sub.add_parser("mcp-install", help="Generate an MCP install deeplink.")
+    sm = sub.add_parser("mcp-install", parents=[common], help="Generate an MCP install deeplink.")
     sm.add_argument("--name", required=True, help="Server name (e.g., postgres).")
     mx = sm.add_mutually_exclusive_group(required=True)
     mx.add_argument("--config-json", help="JSON string: transport config OR mcp.json-style mapping.")
     mx.add_argument("--config-file", help="Path to JSON file: transport config OR mcp.json-style mapping.")
 
+    sb = sub.add_parser("bulk", parents=[common], help="Generate links for all commands, rules, skills and mcp.json servers.")
+    sb.add_argument("--root", default=REPO_ROOT, help="Repo root holding commands/, rules/, skills/ and mcp.json (default: this repo).")
+    sb.add_argument("--kinds", default=",".join(BULK_KINDS), help=f"Comma-separated subset of {','.join(BULK_KINDS)} (default: all).")
+    sb.add_argument("--format", choices=["jsonl", "md"], default=None, help="Output: one JSON object per line (default) or markdown (also with --md).")
+    sb.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Worker processes (default: CPU count; 1 = no pool).")
+    sb.add_argument("--manifest", default=None, help="Manifest JSON: reuse links of unchanged sources, record stale/orphaned links.")
+    sb.add_argument("--force", action="store_true", help="With --manifest: re-encode everything (the manifest is still rewritten).")
+
     args = p.parse_args(argv)
 
+    if args.fit and args.cmd in ("prompt", "command", "rule"):
+        fitted = fit_links(args.cmd, getattr(args, "name", ""), args.text)
+        _print_fitted(fitted, args.only, args.md)
+        return 0 if fitted["fits"] else 1
+
     if args.cmd == "prompt":
         app, web = gen_prompt_links(args.text)
         _print_links(app, web, args.only, args.md)
@@ -189,12 +606,25 @@ def main(argv: list[str] | None = None) -> int:
 
     if args.cmd == "mcp-install":
         cfg = args.config_json if args.config_json is not None else _read_text_file(args.config_file)
+        if args.fit:
+            fitted = fit_links("mcp", args.name, _extract_mcp_transport_config(_json_loads(cfg), args.name))
+            _print_fitted(fitted, args.only, args.md)
+            print(f"  MCP transport config (stringified): {fitted['payload']}", file=sys.stderr)
+            return 0 if fitted["fits"] else 1
         app, web, cfg_str = gen_mcp_install_links(args.name, cfg)
         _print_links(app, web, args.only, args.md)
         # Helpful debug on stderr (doesn't pollute link output)
         print(f"  MCP transport config (stringified): {cfg_str}", file=sys.stderr)
         return 0
 
+    if args.cmd == "bulk":
+        kinds = tuple(k.strip() for k in args.kinds.split(",") if k.strip())
+        unknown = [k for k in kinds if k not in BULK_KINDS]
+        if unknown:
+            raise SystemExit(f"Unknown kinds: {', '.join(unknown)} (expected {', '.join(BULK_KINDS)})")
+        fmt = args.format or ("md" if args.md else "jsonl")
+        return run_bulk(os.path.abspath(args.root), kinds, args.jobs, args.only, fmt, args.manifest, args.force, args.fit)
+
     raise SystemExit("Unknown command")
 
 
@@ -7,9 +7,17 @@
 ENTRY_TITLE="$1"
 ATTRIBUTE="$2"
 DB_PATH="${KEEPASS_DB_PATH:-/mnt/c/Users/janja/OneDrive/Dokumenty/Inne/cursor.kdbx}"
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+
+# Metoda 0: Jeśli działa keepass-agent.py, weź hasło z agenta (bez uruchamiania powershell.exe)
+DB_PASSWORD=""
+if command -v python3 >/dev/null 2>&1 && [ -f "$SCRIPT_DIR/keepass-agent.py" ]; then
+    DB_PASSWORD=$(python3 "$SCRIPT_DIR/keepass-agent.py" get 2>/dev/null)
+fi
 
 # Metoda 1: Pobierz hasło bazy z PowerShell SecretManagement (główna metoda - działa z WSL przez PowerShell)
-DB_PASSWORD=$(powershell.exe -Command "
+if [ -z "$DB_PASSWORD" ]; then
+    DB_PASSWORD=$(powershell.exe -Command "
     try {
         if (Get-Module -ListAvailable -Name Microsoft.PowerShell.SecretManagement) {
             (Get-Secret -Name KeePassXC-Cursor-DB -Vault LocalStore -AsPlainText -ErrorAction Stop)
@@ -18,6 +26,7 @@ DB_PASSWORD=$(powershell.exe -Command "
         \$null
     }
 " 2>/dev/null)
+fi
 
 # Metoda 2: Jeśli SecretManagement nie działa, spróbuj secret-tool (jeśli dostępny i D-Bus działa)
 if [ -z "$DB_PASSWORD" ] && command -v secret-tool >/dev/null 2>&1; then
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+KeePass credential agent: keep the KeePassXC DB password in memory, like ssh-agent.
+
+The password is looked up in the keyring (keepass_ops.keyring_password: PowerShell
+SecretManagement, then secret-tool) on the first request, kept for --ttl seconds
+and served over a Unix socket. keepass_ops.py, get-keepass-secret.sh and
+setup-env-vars.sh use the agent when it is running, so the keyring (often a
+powershell.exe start from WSL) is queried once per TTL instead of once per call.
+
+Only connections from the agent's own user are served: the peer's uid is checked
+with SO_PEERCRED (Linux) or LOCAL_PEERCRED (macOS), and the socket lives in a 0700
+directory with mode 0600.
+
+Protocol: one command line per connection; the reply is "OK <payload>" or "ERR <message>".
+  get     DB password (fetched from the keyring if not cached)
+  status  locked/cached state and seconds until the cached password expires
+  flush   forget the cached password (next get queries the keyring again)
+  lock    forget the password and refuse get until unlock
+  unlock  allow get again
+  stop    shut the agent down
+
+Usage:
+  keepass-agent.py [--ttl SECONDS] [--socket PATH] [--daemon]   # run the agent
+  keepass-agent.py get|status|flush|lock|unlock|stop [--socket PATH]
+
+With --daemon the agent detaches and prints a line for eval, as ssh-agent does:
+  eval "$(~/.cursor/scripts/keepass-agent.py --daemon)"
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import keepass_ops  # noqa: E402
+import unix_peer  # noqa: E402
+
+DEFAULT_TTL = 600
+COMMANDS = ("get", "status", "flush", "lock", "unlock", "stop")
+
+
+class Vault:
+    """The cached password (a bytearray, zeroed when dropped) and its lock state."""
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self.locked = False
+        self._secret: Optional[bytearray] = None
+        self._expires = 0.0
+        self._lock = threading.Lock()
+
+    def _drop(self) -> None:
+        if self._secret is not None:
+            for i in range(len(self._secret)):
+                self._secret[i] = 0
+        self._secret = None
+
+    def get(self) -> tuple[bool, str]:
+        with self._lock:
+            if self.locked:
+                return False, "agent is locked"
+            if self._secret is not None and time.monotonic() >= self._expires:
+                self._drop()
+            if self._secret is None:
+                password = keepass_ops.keyring_password()
+                if not password:
+                    return False, "no password in keyring (run save-keepass-password-to-keyring.sh)"
+                self._secret = bytearray(password.encode("utf-8"))
+                self._expires = time.monotonic() + self.ttl
+            return True, self._secret.decode("utf-8")
+
+    def status(self) -> str:
+        with self._lock:
+            left = max(0, int(self._expires - time.monotonic())) if self._secret is not None else 0
+            return f"locked={int(self.locked)} cached={int(self._secret is not None)} expires_in={left}"
+
+    def flush(self) -> None:
+        with self._lock:
+            self._drop()
+
+    def set_locked(self, locked: bool) -> None:
+        with self._lock:
+            self.locked = locked
+            if locked:
+                self._drop()
+
+    def expire(self) -> None:
+        with self._lock:
+            if self._secret is not None and time.monotonic() >= self._expires:
+                self._drop()
+
+
+class AgentHandler(socketserver.BaseRequestHandler):
+    def handle(self) -> None:
+        uid = unix_peer.peer_uid(self.request)
+        if uid is None or uid != os.getuid():
+            self.request.sendall(b"ERR permission denied\n")
+            return
+        data = b""
+        while b"\n" not in data and len(data) < 256:
+            chunk = self.request.recv(256)
+            if not chunk:
+                break
+            data += chunk
+        command = data.decode("utf-8", errors="replace").strip()
+        vault: Vault = self.server.vault  # type: ignore[attr-defined]
+        if command == "get":
+            ok, payload = vault.get()
+        elif command == "status":
+            ok, payload = True, vault.status()
+        elif command == "flush":
+            vault.flush()
+            ok, payload = True, "flushed"
+        elif command in ("lock", "unlock"):
+            vault.set_locked(command == "lock")
+            ok, payload = True, command + "ed"
+        elif command == "stop":
+            vault.flush()
+            ok, payload = True, "stopping"
+            threading.Thread(target=self.server.shutdown).start()
+        else:
+            ok, payload = False, f"unknown command {command!r}"
+        self.request.sendall(f"{'OK' if ok else 'ERR'} {payload}\n".encode("utf-8"))
+
+
+class AgentServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, vault: Vault) -> None:
+        self.vault = vault
+        super().__init__(path, AgentHandler)
+
+    def service_actions(self) -> None:
+        self.vault.expire()
+
+
+def default_ttl() -> float:
+    """$KEEPASS_AGENT_TTL in seconds, or DEFAULT_TTL if unset or not a positive number."""
+    try:
+        ttl = float(os.environ.get("KEEPASS_AGENT_TTL", DEFAULT_TTL))
+    except ValueError:
+        return DEFAULT_TTL
+    return ttl if ttl > 0 else DEFAULT_TTL
+
+
+def serve(path: str, ttl: float, daemon: bool) -> int:
+    if os.path.exists(path):
+        try:
+            keepass_ops.agent_request("status", path)
+            print(f"Error: keepass-agent already running on {path}", file=sys.stderr)
+            return 1
+        except OSError:
+            os.unlink(path)  # stale socket from a crashed agent
+    directory = os.path.dirname(path)
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    if not unix_peer.private_dir(directory):
+        # An existing directory others can enter would let them swap the socket.
+        print(f"Error: {directory} must be owned by you and closed to others (chmod 700)", file=sys.stderr)
+        return 1
+    old_umask = os.umask(0o177)
+    try:
+        server = AgentServer(path, Vault(ttl))
+    finally:
+        os.umask(old_umask)
+
+    if daemon:
+        if os.fork():
+            print(f"{keepass_ops.AGENT_SOCK_ENV}={path}; export {keepass_ops.AGENT_SOCK_ENV};")
+            return 0
+        os.setsid()
+        devnull = os.open(os.devnull, os.O_RDWR)
+        for fd in (0, 1, 2):
+            os.dup2(devnull, fd)
+    else:
+        print(f"keepass-agent listening on {path} (ttl {ttl:.0f}s)", file=sys.stderr)
+    try:
+        server.serve_forever(poll_interval=0.5)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.vault.flush()
+        server.server_close()
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Hold the KeePassXC DB password in memory and serve it to the same user.")
+    parser.add_argument("command", nargs="?", choices=COMMANDS, help="Send a command to the running agent instead of starting one.")
+    parser.add_argument("--socket", default=None, help=f"Socket path (default: ${keepass_ops.AGENT_SOCK_ENV} or runtime dir).")
+    parser.add_argument("--ttl", type=float, default=default_ttl(), help=f"Seconds to keep the password (default: $KEEPASS_AGENT_TTL or {DEFAULT_TTL}).")
+    parser.add_argument("--daemon", action="store_true", help="Detach and print the environment line for eval.")
+    args = parser.parse_args()
+    if not hasattr(socket, "AF_UNIX"):
+        print("Error: keepass-agent needs Unix sockets (Linux, WSL or macOS).", file=sys.stderr)
+        return 1
+    path = args.socket or keepass_ops.agent_socket_path()
+    if args.command is None:
+        return serve(path, args.ttl, args.daemon)
+    try:
+        ok, payload = keepass_ops.agent_request(args.command, path)
+    except OSError:
+        print(f"No keepass-agent running on {path}", file=sys.stderr)
+        return 2
+    if not ok:
+        print(f"Error: {payload}", file=sys.stderr)
+        return 1
+    print(payload)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,23 +2,157 @@
 """
 KeePassXC CLI helper: get, add, update entries with check-before-add.
 
-Uses keyring for DB password (PowerShell SecretManagement or secret-tool).
-Requires keepassxc-cli on PATH. No extra dependencies (stdlib only).
+Uses keyring for DB password (PowerShell SecretManagement or secret-tool), or
+keepass-agent.py when it is running (no keyring lookup per call). Requires
+keepassxc-cli on PATH (override: KEEPASS_CLI). No extra dependencies (stdlib only).
+
+Session mode (default on Linux/WSL/macOS): the database is opened once with
+`keepassxc-cli open` and every command of this run goes through that one
+interactive process, so the key derivation (KDF) runs once instead of once per
+command. The process is closed after KEEPASS_SESSION_IDLE seconds without a
+command (default 60) and at exit. KEEPASS_SESSION=0 (or --no-session) runs one
+keepassxc-cli process per command instead; so does any session failure.
+
+Check-before-add uses a path index: a prefix tree of group and entry names (no
+secrets) stored next to the database as .<db name>.index.json. It is rebuilt from
+one `ls -R -f` when the database's mtime/size and hash no longer match, so
+existence and group checks normally start no keepassxc-cli process.
+
+Writes (add, update, batch writes) hold an advisory lock on .<db name>.lock so
+concurrent writers cannot overwrite each other's saves. With --queue
+(KEEPASS_QUEUE=1) the lock holder also collects the writes of callers arriving
+within KEEPASS_QUEUE_WINDOW seconds and applies them in one unlock, merging
+repeated updates of an entry into one save.
+
+--profile prints a per-phase timing breakdown (agent, keyring, session open, each
+keepassxc-cli command) to stderr; with KEEPASS_PROFILE_LOG=FILE the same records
+are appended to FILE as JSON lines. Timeouts are recorded with status "timeout".
 
 Usage:
   keepass_ops.py get <path_or_title> [--attr ATTRIBUTE]
   keepass_ops.py add <path> [--username USER] [--password-from-stdin]
   keepass_ops.py update <path> [--password-from-stdin]
   keepass_ops.py list [<group_path>]
+  keepass_ops.py get-many NAME=Group/Env/Title[#Attribute] ... [--from FILE] [--format env|json]
+  keepass_ops.py batch [--stop-on-error] < ops.jsonl
+
+batch reads one JSON operation per line and prints one JSON result per line:
+  {"op": "get", "path": "MyApp/prod/API Key", "attr": "Password", "id": "api"}
+  {"op": "add", "path": "MyApp/prod/Token", "username": "ci", "password": "..."}
+  {"op": "update", "path": "MyApp/prod/Token", "password": "..."}
+  {"op": "list", "group": "MyApp/prod"}
+All operations of a batch (and all specs of get-many) share one DB password lookup
+and one unlocked session.
 """
 
 from __future__ import annotations
 
 import argparse
+import atexit
+import hashlib
+import json
 import os
+import select
+import socket
 import subprocess
 import sys
-from typing import Optional
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+from unix_peer import peer_uid, private_dir
+
+try:
+    import fcntl
+except ImportError:  # native Windows: no advisory locks
+    fcntl = None  # type: ignore[assignment]
+
+CLI_ENV = "KEEPASS_CLI"
+CLI_TIMEOUT = 30
+SESSION_START_TIMEOUT = 60
+AGENT_SOCK_ENV = "KEEPASS_AGENT_SOCK"
+# The agent may have to query the keyring first (PowerShell 10s + secret-tool 5s).
+AGENT_TIMEOUT = 20
+POWERSHELL_TIMEOUT = 10
+SECRET_TOOL_TIMEOUT = 5
+PROFILE_LOG_ENV = "KEEPASS_PROFILE_LOG"
+
+# Timing records of this run; None unless --profile asked for them.
+_profile: Optional[list[dict[str, Any]]] = None
+_profile_command: Optional[str] = None
+
+
+def record(phase: str, ms: float, status: str = "ok", **fields: Any) -> None:
+    """Add one timing record: kept for --profile, appended as JSON to $KEEPASS_PROFILE_LOG.
+
+    status is "ok", "error", "miss" (source has no password / not running),
+    "unavailable" (program not installed) or "timeout".
+    """
+    entry = {"phase": phase, "ms": round(ms, 2), "status": status, **fields}
+    if _profile is not None:
+        _profile.append(entry)
+    log_path = os.environ.get(PROFILE_LOG_ENV)
+    if log_path:
+        line = {"ts": round(time.time(), 3), "pid": os.getpid(), "op": _profile_command, **entry}
+        try:
+            with open(log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(line) + "\n")
+        except OSError:
+            pass
+
+
+class timed:
+    """Time a block as one record; the block may set .status and add .fields.
+
+    Exceptions are recorded as "timeout" (subprocess/socket/session timeouts) or
+    "error" and re-raised.
+    """
+
+    def __init__(self, phase: str, **fields: Any) -> None:
+        self.phase = phase
+        self.status = "ok"
+        self.fields = fields
+
+    def __enter__(self) -> "timed":
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> bool:
+        status = self.status
+        if exc_type is not None:
+            status = "timeout" if issubclass(exc_type, (subprocess.TimeoutExpired, socket.timeout, SessionTimeout)) else "error"
+        record(self.phase, (time.perf_counter() - self._t0) * 1000, status, **self.fields)
+        return False
+
+
+def print_profile() -> None:
+    """Per-phase timing breakdown of this run, on stderr."""
+    records = _profile or []
+    phases: dict[str, dict[str, Any]] = {}
+    for r in records:
+        p = phases.setdefault(r["phase"], {"calls": 0, "total": 0.0, "max": 0.0, "status": {}})
+        p["calls"] += 1
+        p["total"] += r["ms"]
+        p["max"] = max(p["max"], r["ms"])
+        if r["status"] != "ok":
+            p["status"][r["status"]] = p["status"].get(r["status"], 0) + 1
+    print(f"\nkeepass_ops profile ({_profile_command}):", file=sys.stderr)
+    print(f"  {'phase':22} {'calls':>5} {'total ms':>10} {'max ms':>10}  events", file=sys.stderr)
+    for name, p in phases.items():
+        events = " ".join(f"{k}x{v}" for k, v in sorted(p["status"].items()))
+        print(f"  {name:22} {p['calls']:5} {p['total']:10.1f} {p['max']:10.1f}  {events}", file=sys.stderr)
+    clis = [r for r in records if r["phase"] == "cli"]
+    if clis:
+        print("  keepassxc-cli commands:", file=sys.stderr)
+        for r in clis:
+            extra = f" ({r['status']})" if r["status"] != "ok" else ""
+            print(f"    {r['command']:10} {r['mode']:8} {r['ms']:10.1f} ms{extra}", file=sys.stderr)
+
+
+def cli_path() -> str:
+    """keepassxc-cli executable: $KEEPASS_CLI (e.g. scripts/bench/fake-keepassxc-cli.py) or from PATH."""
+    return os.environ.get(CLI_ENV) or "keepassxc-cli"
 
 
 def get_db_path() -> str:
@@ -28,106 +162,898 @@ def get_db_path() -> str:
     )
 
 
+def runtime_dir() -> str:
+    """Per-user directory for sockets: $XDG_RUNTIME_DIR, else /tmp/keepass-agent-<uid>."""
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    return os.environ.get("XDG_RUNTIME_DIR") or os.path.join(os.environ.get("TMPDIR") or "/tmp", f"keepass-agent-{uid}")
+
+
+def agent_socket_path() -> str:
+    """keepass-agent.py socket: $KEEPASS_AGENT_SOCK, else a per-user runtime path."""
+    path = os.environ.get(AGENT_SOCK_ENV)
+    if path:
+        return path
+    return os.path.join(runtime_dir(), "keepass-agent.sock")
+
+
+def agent_request(command: str, path: Optional[str] = None) -> tuple[bool, str]:
+    """Send one command to keepass-agent.py. Returns (ok, payload); raises OSError if not running."""
+    if not hasattr(socket, "AF_UNIX"):
+        raise OSError("Unix sockets not supported")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(AGENT_TIMEOUT)
+        sock.connect(path or agent_socket_path())
+        sock.sendall(command.encode("utf-8") + b"\n")
+        sock.shutdown(socket.SHUT_WR)
+        chunks = []
+        while True:
+            chunk = sock.recv(4096)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    status, _, payload = b"".join(chunks).decode("utf-8").rstrip("\n").partition(" ")
+    if status not in ("OK", "ERR"):
+        raise ConnectionError("Malformed response from keepass-agent.")
+    return status == "OK", payload
+
+
 def get_db_password() -> Optional[str]:
+    """DB password from keepass-agent.py if it is running, else from the keyring."""
+    with timed("password") as total:
+        t0 = time.perf_counter()
+        try:
+            ok, payload = agent_request("get")
+            record("agent", (time.perf_counter() - t0) * 1000, "ok" if ok and payload else "error")
+            if ok and payload:
+                total.fields["source"] = "agent"
+                return payload
+            print(f"Note: keepass-agent: {payload}; using keyring.", file=sys.stderr)
+        except socket.timeout:
+            record("agent", (time.perf_counter() - t0) * 1000, "timeout", timeout_s=AGENT_TIMEOUT)
+            print(f"Note: keepass-agent did not answer within {AGENT_TIMEOUT}s; using keyring.", file=sys.stderr)
+        except OSError:
+            record("agent", (time.perf_counter() - t0) * 1000, "miss")  # agent not running
+        password = keyring_password()
+        total.fields["source"] = "keyring" if password else "none"
+        if not password:
+            total.status = "miss"
+        return password
+
+
+def _keyring_lookup(phase: str, cmd: list[str], timeout: float) -> Optional[str]:
+    """Run one keyring command; records ok/miss/unavailable/timeout for the phase."""
+    t0 = time.perf_counter()
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    except FileNotFoundError:
+        record(phase, (time.perf_counter() - t0) * 1000, "unavailable")
+        return None
+    except subprocess.TimeoutExpired:
+        record(phase, (time.perf_counter() - t0) * 1000, "timeout", timeout_s=timeout)
+        return None
+    value = result.stdout.strip() if result.stdout else ""
+    found = result.returncode == 0 and bool(value)
+    record(phase, (time.perf_counter() - t0) * 1000, "ok" if found else "miss")
+    return value if found else None
+
+
+def keyring_password() -> Optional[str]:
     """Retrieve KeePassXC DB password from keyring (SecretManagement or secret-tool)."""
     # 1. PowerShell SecretManagement
-    try:
-        result = subprocess.run(
-            [
-                "powershell.exe",
-                "-NoProfile",
-                "-Command",
-                "try { (Get-Secret -Name KeePassXC-Cursor-DB -Vault LocalStore -AsPlainText -ErrorAction Stop) } catch { $null }",
-            ],
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
-        if result.returncode == 0 and result.stdout and result.stdout.strip():
-            return result.stdout.strip()
-    except (FileNotFoundError, subprocess.TimeoutExpired):
-        pass
+    password = _keyring_lookup(
+        "keyring.powershell",
+        [
+            "powershell.exe",
+            "-NoProfile",
+            "-Command",
+            "try { (Get-Secret -Name KeePassXC-Cursor-DB -Vault LocalStore -AsPlainText -ErrorAction Stop) } catch { $null }",
+        ],
+        POWERSHELL_TIMEOUT,
+    )
+    if password:
+        return password
 
     # 2. secret-tool (Linux/WSL)
+    return _keyring_lookup(
+        "keyring.secret-tool",
+        ["secret-tool", "lookup", "service", "keepassxc", "attribute", "cursor-db"],
+        SECRET_TOOL_TIMEOUT,
+    )
+
+
+class SessionError(RuntimeError):
+    """The interactive keepassxc-cli session could not be started or broke."""
+
+
+class SessionTimeout(SessionError):
+    """keepassxc-cli did not show its prompt again in time."""
+
+
+def _quote(arg: str) -> str:
+    """Escape one argument for keepassxc-cli's interactive command splitter."""
+    if "\n" in arg or "\r" in arg:
+        raise SessionError("argument contains a newline")
+    out = []
+    for ch in arg:
+        if ch in ('\\', '"', " ", "\t"):
+            out.append("\\")
+        out.append(ch)
+    return "".join(out) or '""'
+
+
+class CliSession:
+    """One `keepassxc-cli open` process; commands are framed by its shell prompt.
+
+    After unlocking, keepassxc-cli prints "<name>> " and waits for a command line.
+    A command is complete when that prompt appears again at the end of stdout.
+    Errors go to stderr, which is drained before the prompt is returned (the CLI
+    writes them first). Password prompts on stderr ("...: ") are answered from the
+    values passed to run().
+    """
+
+    def __init__(self, db_path: str, db_password: str, idle_timeout: float) -> None:
+        self.db_path = db_path
+        self.idle_timeout = idle_timeout
+        self.prompt = b""
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        try:
+            self.proc = subprocess.Popen(
+                [cli_path(), "open", "-q", db_path],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                bufsize=0,
+            )
+        except OSError as e:
+            raise SessionError(str(e)) from e
+        try:
+            self._send(db_password + "\n")
+            self._read_until_prompt(SESSION_START_TIMEOUT, (), learn_prompt=True)
+        except SessionError:
+            self.close()
+            raise
+        # The CLI keeps the database in memory; it is stale once another process saves.
+        self.db_stat = db_stat(db_path)
+        self._arm_timer()
+
+    def _send(self, text: str) -> None:
+        try:
+            self.proc.stdin.write(text.encode("utf-8"))
+            self.proc.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            raise SessionError(f"keepassxc-cli exited: {e}") from e
+
+    def _read_until_prompt(self, timeout: float, answers: tuple[str, ...], learn_prompt: bool = False) -> tuple[bytes, bytes]:
+        out = bytearray()
+        err = bytearray()
+        pending = list(answers)
+        answered_at = 0
+        deadline = time.monotonic() + timeout
+        fds = {self.proc.stdout.fileno(): out, self.proc.stderr.fileno(): err}
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise SessionTimeout(f"no response within {timeout:.0f}s")
+            ready, _, _ = select.select(list(fds), [], [], remaining)
+            for fd in ready:
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    raise SessionError(f"keepassxc-cli exited: {bytes(err).decode('utf-8', 'replace').strip()}")
+                fds[fd].extend(chunk)
+            if pending and len(err) > answered_at and err.rstrip(b" ").endswith(b":"):
+                answered_at = len(err)
+                self._send(pending.pop(0) + "\n")
+            if learn_prompt:
+                if out.endswith(b"> "):
+                    self.prompt = bytes(out[out.rfind(b"\n") + 1:])
+                    break
+            elif out.endswith(self.prompt):
+                del out[-len(self.prompt):]
+                break
+        # stderr is written before the prompt, so anything left is already in the pipe.
+        while select.select([self.proc.stderr], [], [], 0)[0]:
+            chunk = os.read(self.proc.stderr.fileno(), 65536)
+            if not chunk:
+                break
+            err.extend(chunk)
+        return bytes(out), bytes(err)
+
+    def run(self, *args: str, answers: tuple[str, ...] = ()) -> tuple[int, str, str]:
+        """Run one command in the open database. Returns (returncode, stdout, stderr)."""
+        line = " ".join(_quote(a) for a in args) + "\n"
+        with self._lock:
+            if self.proc.poll() is not None:
+                raise SessionError("session closed")
+            self._cancel_timer()
+            try:
+                self._send(line)
+                out, err = self._read_until_prompt(CLI_TIMEOUT, answers)
+            except SessionError:
+                self.close()
+                raise
+            self._arm_timer()
+        err_text = err.decode("utf-8", errors="replace")
+        # Drop the answered password prompts; what remains is an error message.
+        err_lines = [ln for ln in err_text.splitlines() if ln.strip() and not ln.rstrip().endswith(":")]
+        return (1 if err_lines else 0), out.decode("utf-8", errors="replace"), "\n".join(err_lines)
+
+    def _arm_timer(self) -> None:
+        if self.idle_timeout > 0:
+            self._timer = threading.Timer(self.idle_timeout, self._close_if_idle)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _close_if_idle(self) -> None:
+        if self._lock.acquire(blocking=False):  # a running command re-arms the timer
+            try:
+                self.close()
+            finally:
+                self._lock.release()
+
+    def close(self) -> None:
+        """Quit keepassxc-cli (drops the unlocked database from memory)."""
+        self._cancel_timer()
+        if self.proc.poll() is None:
+            try:
+                self.proc.stdin.write(b"quit\n")
+                self.proc.stdin.close()
+                self.proc.wait(timeout=2)
+            except (OSError, subprocess.TimeoutExpired):
+                self.proc.kill()
+                self.proc.wait()
+
+
+_sessions: dict[str, CliSession] = {}
+_session_disabled = False
+
+
+def db_stat(db_path: str) -> Optional[tuple[int, int]]:
+    """(mtime_ns, size) of the database file, or None if it cannot be read."""
     try:
-        result = subprocess.run(
-            ["secret-tool", "lookup", "service", "keepassxc", "attribute", "cursor-db"],
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
-        if result.returncode == 0 and result.stdout:
-            return result.stdout.strip()
-    except FileNotFoundError:
-        pass
+        st = os.stat(db_path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
 
-    return None
+
+def session_enabled() -> bool:
+    return not _session_disabled and os.name == "posix" and os.environ.get("KEEPASS_SESSION", "1") != "0"
+
+
+def get_session(db_path: str, db_password: str) -> Optional[CliSession]:
+    """Open session for db_path (started on first use); None if sessions are off or failed."""
+    global _session_disabled
+    if not session_enabled():
+        return None
+    session = _sessions.get(db_path)
+    if session is not None and session.proc.poll() is None:
+        if session.db_stat == db_stat(db_path):
+            return session
+        session.close()  # saved by another process: reopen to see its changes
+    try:
+        idle = float(os.environ.get("KEEPASS_SESSION_IDLE", "60"))
+    except ValueError:
+        idle = 60.0
+    try:
+        with timed("session.open"):
+            session = CliSession(db_path, db_password, idle)
+    except SessionError as e:
+        print(f"Note: keepassxc-cli session unavailable ({e}); using one process per command.", file=sys.stderr)
+        _session_disabled = True
+        return None
+    _sessions[db_path] = session
+    return session
+
+
+def close_sessions() -> None:
+    for session in list(_sessions.values()):
+        session.close()
+    _sessions.clear()
+
+
+atexit.register(close_sessions)
 
 
 def run_cli(
     db_path: str,
     db_password: str,
+    command: str,
     *args: str,
-    stdin: Optional[str] = None,
+    entry_password: Optional[str] = None,
 ) -> tuple[int, str, str]:
-    """Run keepassxc-cli with password on stdin. Returns (returncode, stdout, stderr)."""
-    cmd = ["keepassxc-cli", "--no-password", *args, db_path]
-    proc = subprocess.run(
-        cmd,
-        input=stdin or db_password,
-        capture_output=True,
-        text=True,
-        timeout=30,
-    )
+    """Run one keepassxc-cli command. Returns (returncode, stdout, stderr).
+
+    Uses the open session when available; otherwise starts keepassxc-cli with the
+    DB password (and entry_password, for add/edit -p) on stdin.
+    """
+    session = get_session(db_path, db_password)
+    if session is not None:
+        answers = (entry_password, entry_password) if entry_password is not None else ()
+        t0 = time.perf_counter()
+        try:
+            result = session.run(command, *args, answers=answers)
+            session.db_stat = db_stat(db_path)  # our own save does not make the session stale
+            record("cli", (time.perf_counter() - t0) * 1000, "ok" if result[0] == 0 else "error", command=command, mode="session")
+            return result
+        except SessionError as e:
+            timeout = isinstance(e, SessionTimeout)
+            record("cli", (time.perf_counter() - t0) * 1000, "timeout" if timeout else "error", command=command, mode="session", **({"timeout_s": CLI_TIMEOUT} if timeout else {}))
+            _sessions.pop(db_path, None)
+            print(f"Note: keepassxc-cli session failed ({e}); retrying without session.", file=sys.stderr)
+    cmd = [cli_path(), command, "-q", db_path, *args]
+    stdin = db_password + "\n"
+    if entry_password is not None:
+        stdin += entry_password + "\n" + entry_password + "\n"
+    t0 = time.perf_counter()
+    try:
+        proc = subprocess.run(
+            cmd,
+            input=stdin,
+            capture_output=True,
+            text=True,
+            timeout=CLI_TIMEOUT,
+        )
+    except subprocess.TimeoutExpired:
+        record("cli", (time.perf_counter() - t0) * 1000, "timeout", command=command, mode="oneshot", timeout_s=CLI_TIMEOUT)
+        return 124, "", f"keepassxc-cli {command} timed out after {CLI_TIMEOUT}s"
+    record("cli", (time.perf_counter() - t0) * 1000, "ok" if proc.returncode == 0 else "error", command=command, mode="oneshot")
     return proc.returncode, proc.stdout or "", proc.stderr or ""
 
 
+INDEX_VERSION = 1
+INDEX_PATH_ENV = "KEEPASS_INDEX_PATH"
+_EMPTY_GROUP = "[empty]"
+
+
+class PathIndex:
+    """Prefix tree of group and entry names (never attributes or secret values).
+
+    Each node is {"groups": {name: node}, "entries": {title, ...}}; paths are
+    Group/Sub/Title relative to the root group and compared exactly.
+    """
+
+    def __init__(self, root: Optional[dict[str, Any]] = None) -> None:
+        self.root = root if root is not None else {"groups": {}, "entries": set()}
+
+    @staticmethod
+    def _split(path: str) -> list[str]:
+        return [p for p in path.strip("/").split("/") if p]
+
+    def _node(self, parts: list[str], create: bool = False) -> Optional[dict[str, Any]]:
+        node = self.root
+        for name in parts:
+            child = node["groups"].get(name)
+            if child is None:
+                if not create:
+                    return None
+                child = node["groups"][name] = {"groups": {}, "entries": set()}
+            node = child
+        return node
+
+    def has_group(self, path: str) -> bool:
+        return self._node(self._split(path)) is not None
+
+    def has_entry(self, path: str) -> bool:
+        parts = self._split(path)
+        node = self._node(parts[:-1]) if parts else None
+        return node is not None and parts[-1] in node["entries"]
+
+    def add_group(self, path: str) -> None:
+        self._node(self._split(path), create=True)
+
+    def add_entry(self, path: str) -> None:
+        parts = self._split(path)
+        self._node(parts[:-1], create=True)["entries"].add(parts[-1])  # type: ignore[index]
+
+    def missing_groups(self, path: str) -> list[str]:
+        """Prefixes of a group path that do not exist yet, outermost first."""
+        parts = self._split(path)
+        node: Optional[dict[str, Any]] = self.root
+        missing = []
+        for i, name in enumerate(parts):
+            node = node["groups"].get(name) if node is not None else None
+            if node is None:
+                missing.append("/".join(parts[: i + 1]))
+        return missing
+
+    @classmethod
+    def from_listing(cls, listing: str) -> "PathIndex":
+        """Build from `keepassxc-cli ls -R -f` output (groups end with "/")."""
+        index = cls()
+        for line in listing.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            if line.endswith("/"):
+                index.add_group(line)
+            elif line.rsplit("/", 1)[-1] != _EMPTY_GROUP:
+                index.add_entry(line)
+        return index
+
+    def to_json(self) -> dict[str, Any]:
+        def dump(node: dict[str, Any]) -> dict[str, Any]:
+            return {"groups": {k: dump(v) for k, v in node["groups"].items()}, "entries": sorted(node["entries"])}
+
+        return dump(self.root)
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> "PathIndex":
+        def load(node: dict[str, Any]) -> dict[str, Any]:
+            return {"groups": {k: load(v) for k, v in node.get("groups", {}).items()}, "entries": set(node.get("entries", ()))}
+
+        return cls(load(data))
+
+
+# db_path -> (index, mtime_ns, size) for the index loaded in this process
+_indexes: dict[str, tuple[PathIndex, int, int]] = {}
+
+
+def index_path(db_path: str) -> str:
+    """Index file: $KEEPASS_INDEX_PATH, else .<db name>.index.json next to the database."""
+    override = os.environ.get(INDEX_PATH_ENV)
+    if override:
+        return override
+    directory, name = os.path.split(os.path.abspath(db_path))
+    return os.path.join(directory, f".{name}.index.json")
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def save_index(db_path: str, index: PathIndex) -> None:
+    """Stamp the index with the database's current mtime/size/hash and persist it.
+
+    Call after this process changed the database, so its own writes do not
+    invalidate the index. A read-only directory only loses persistence.
+    """
+    st = os.stat(db_path)
+    _indexes[db_path] = (index, st.st_mtime_ns, st.st_size)
+    index_rec = {
+        "version": INDEX_VERSION,
+        "db_mtime_ns": st.st_mtime_ns,
+        "db_size": st.st_size,
+        "db_sha256": _file_sha256(db_path),
+        "tree": index.to_json(),
+    }
+    path = index_path(db_path)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(index_rec, f, separators=(",", ":"))
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"Note: could not write path index {path}: {e}", file=sys.stderr)
+
+
+def _read_index(db_path: str, st: os.stat_result) -> Optional[PathIndex]:
+    """Persisted index if it matches the database (same mtime and size, or same hash)."""
+    try:
+        with open(index_path(db_path), "r", encoding="utf-8") as f:
+            index_rec = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(index_rec, dict) or index_rec.get("version") != INDEX_VERSION:
+        return None
+    index = PathIndex.from_json(index_rec.get("tree") or {})
+    if index_rec.get("db_mtime_ns") == st.st_mtime_ns and index_rec.get("db_size") == st.st_size:
+        return index
+    if index_rec.get("db_size") == st.st_size and index_rec.get("db_sha256") == _file_sha256(db_path):
+        save_index(db_path, index)  # touched (e.g. synced) but unchanged: restamp
+        return index
+    return None
+
+
+def load_index(db_path: str, db_password: str) -> tuple[Optional[PathIndex], str]:
+    """(index, "") for the database, rebuilt with one `ls -R -f` if stale; (None, error) on failure."""
+    try:
+        st = os.stat(db_path)
+    except OSError as e:
+        return None, f"Cannot read database {db_path}: {e}"
+    cached = _indexes.get(db_path)
+    if cached is not None and cached[1:] == (st.st_mtime_ns, st.st_size):
+        return cached[0], ""
+    index = _read_index(db_path, st)
+    if index is not None:
+        _indexes[db_path] = (index, st.st_mtime_ns, st.st_size)
+        return index, ""
+    code, out, err = run_cli(db_path, db_password, "ls", "-R", "-f")
+    if code != 0:
+        return None, err.strip() or "ls -R failed"
+    index = PathIndex.from_listing(out)
+    save_index(db_path, index)
+    return index, ""
+
+
+LOCK_TIMEOUT = 120
+QUEUE_WINDOW = 0.2
+
+
+class LockTimeout(RuntimeError):
+    """Another writer held the database lock for too long."""
+
+
+def lock_path(db_path: str) -> str:
+    """Lock file shared by all writers: .<db name>.lock next to the database."""
+    directory, name = os.path.split(os.path.abspath(db_path))
+    return os.path.join(directory, f".{name}.lock")
+
+
+class WriteLock:
+    """Advisory exclusive lock (flock) that serializes writers of one database.
+
+    keepassxc-cli rewrites the whole file on every change, so two writers that
+    opened the database before each other's save would drop each other's entries.
+    No-op without fcntl (native Windows) or with KEEPASS_LOCK=0.
+    """
+
+    def __init__(self, db_path: str) -> None:
+        self.path = lock_path(db_path)
+        self._fd: Optional[int] = None
+
+    def acquire(self, timeout: float) -> bool:
+        """Try for up to timeout seconds (0 = once). Returns True when held."""
+        if fcntl is None or os.environ.get("KEEPASS_LOCK") == "0":
+            return True
+        if self._fd is None:
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                fcntl.flock(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return True
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    return False
+                time.sleep(0.02)
+
+    def release(self) -> None:
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self) -> "WriteLock":
+        try:
+            timeout = float(os.environ.get("KEEPASS_LOCK_TIMEOUT", LOCK_TIMEOUT))
+        except ValueError:
+            timeout = LOCK_TIMEOUT
+        t0 = time.perf_counter()
+        held = self.acquire(timeout)
+        record("lock.wait", (time.perf_counter() - t0) * 1000, "ok" if held else "timeout", **({} if held else {"timeout_s": timeout}))
+        if not held:
+            self.release()
+            raise LockTimeout(f"database is locked by another writer ({self.path}) for more than {timeout:.0f}s")
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.release()
+
+
+def apply_write(db_path: str, db_password: str, op: dict[str, Any]) -> tuple[bool, str]:
+    """Run one add/update op ({"op", "path", "password", "username"}); caller holds the lock."""
+    if op.get("op") == "add":
+        return add_entry(db_path, db_password, op["path"], op.get("username"), op["password"])
+    return update_entry(db_path, db_password, op["path"], op["password"])
+
+
+def coalesce_writes(ops: list[dict[str, Any]]) -> list[tuple[dict[str, Any], list[int]]]:
+    """Merge a burst of writes into fewer saves: (op to run, indices of the ops it answers).
+
+    An update folds into the preceding add/update of the same entry (the last
+    password wins); everything else, including a second add, runs in order.
+    apply_writes() re-runs the members of a merged op that fails one by one.
+    """
+    plan: list[tuple[dict[str, Any], list[int]]] = []
+    last_for_path: dict[str, int] = {}
+    for i, op in enumerate(ops):
+        path = op["path"].strip("/")
+        j = last_for_path.get(path)
+        if op["op"] == "update" and j is not None:
+            plan[j][0]["password"] = op["password"]
+            plan[j][1].append(i)
+            continue
+        last_for_path[path] = len(plan)
+        plan.append(({**op, "path": path}, [i]))
+    return plan
+
+
+def apply_writes(db_path: str, db_password: str, ops: list[dict[str, Any]]) -> list[tuple[bool, str]]:
+    """Apply a burst of writes with coalesce_writes(); (ok, message) per op, in order.
+
+    When a merged op fails, its members run again one by one, so an update is not
+    reported as failed because the add it was folded into failed.
+    """
+    results: list[tuple[bool, str]] = [(False, "")] * len(ops)
+
+    def answer(i: int, path: str, ok: bool, message: str) -> None:
+        verb = "Added" if ops[i]["op"] == "add" else "Updated"
+        results[i] = (ok, f"{verb}: {path}" if ok else message)
+
+    plan = coalesce_writes(ops)
+    record("queue.batch", 0, writes=len(ops), applied=len(plan))
+    for op, members in plan:
+        ok, message = apply_write(db_path, db_password, op)
+        if ok or len(members) == 1:
+            for i in members:
+                answer(i, op["path"], ok, message)
+            continue
+        for i in members:
+            answer(i, op["path"], *apply_write(db_path, db_password, {**ops[i], "path": op["path"]}))
+    return results
+
+
+def queue_socket_path(db_path: str) -> str:
+    digest = hashlib.sha256(os.path.abspath(db_path).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(runtime_dir(), f"keepass-queue-{digest}.sock")
+
+
+def _read_line(sock: socket.socket) -> bytes:
+    data = b""
+    while not data.endswith(b"\n"):
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        data += chunk
+    return data
+
+
+def _lead_writes(db_path: str, own: dict[str, Any]) -> tuple[bool, str]:
+    """As lock holder: collect writes from other callers for QUEUE_WINDOW, apply them, answer each."""
+    path = queue_socket_path(db_path)
+    try:
+        os.unlink(path)  # we hold the lock, so any socket left is from a dead leader
+    except FileNotFoundError:
+        pass
+    try:
+        window = float(os.environ.get("KEEPASS_QUEUE_WINDOW", QUEUE_WINDOW))
+    except ValueError:
+        window = QUEUE_WINDOW
+    ops, conns = [own], [None]
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o177)
+    try:
+        server.bind(path)
+    finally:
+        os.umask(old_umask)
+    try:
+        server.listen(128)
+        deadline = time.monotonic() + window
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining > 0:
+                server.settimeout(remaining)
+            else:
+                server.setblocking(False)  # drain callers already waiting, then stop
+            try:
+                conn, _ = server.accept()
+            except (socket.timeout, BlockingIOError):
+                if remaining > 0:
+                    continue
+                break
+            conn.setblocking(True)
+            conn.settimeout(5)
+            try:
+                if peer_uid(conn) not in (None, os.getuid()):
+                    raise ValueError("permission denied")
+                op = json.loads(_read_line(conn))
+                if op.get("op") not in ("add", "update") or not op.get("path") or not op.get("password"):
+                    raise ValueError("bad write request")
+            except (OSError, ValueError) as e:
+                try:
+                    conn.sendall(json.dumps({"ok": False, "error": str(e)}).encode("utf-8") + b"\n")
+                except OSError:
+                    pass
+                conn.close()
+                continue
+            ops.append(op)
+            conns.append(conn)
+    finally:
+        server.close()
+        os.unlink(path)
+
+    password = get_db_password()
+    if password:
+        results = apply_writes(db_path, password, ops)
+    else:
+        results = [(False, "Could not retrieve DB password from keyring.")] * len(ops)
+    for conn, (ok, message) in zip(conns[1:], results[1:]):
+        try:
+            conn.sendall(json.dumps({"ok": ok, "message" if ok else "error": message}).encode("utf-8") + b"\n")
+        except OSError:
+            pass
+        conn.close()
+    return results[0]
+
+
+def queued_write(db_path: str, op: dict[str, Any]) -> tuple[bool, str]:
+    """Hand an add/update to the current writer, or become it.
+
+    The lock holder listens on a per-database socket; callers arriving meanwhile
+    send their write there and wait for its result, so a burst shares one unlock
+    and one lock hold, and repeated updates of an entry cost one save.
+    """
+    path = queue_socket_path(db_path)
+    directory = os.path.dirname(path)
+    try:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+    except OSError:
+        pass
+    if not private_dir(directory):
+        # Anyone who can create the socket there would receive the passwords.
+        print(f"Note: {directory} is not a private directory of yours; writing without the queue.", file=sys.stderr)
+        return locked_write(db_path, op)
+    lock = WriteLock(db_path)
+    try:
+        timeout = float(os.environ.get("KEEPASS_LOCK_TIMEOUT", LOCK_TIMEOUT))
+    except ValueError:
+        timeout = LOCK_TIMEOUT
+    t0 = time.perf_counter()
+    deadline = time.monotonic() + timeout
+    warned = False
+    while True:
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(1)
+                sock.connect(path)
+                if peer_uid(sock) != os.getuid():
+                    raise PermissionError(f"{path} is not served by this user")
+                sock.sendall(json.dumps(op).encode("utf-8") + b"\n")
+                sock.settimeout(timeout)
+                reply = _read_line(sock)
+            if reply:
+                result = json.loads(reply)
+                record("queue.wait", (time.perf_counter() - t0) * 1000, "ok" if result.get("ok") else "error", role="follower")
+                return bool(result.get("ok")), result.get("message") or result.get("error") or ""
+            # Closed without reading our request (the leader stopped accepting): retry.
+        except (ConnectionRefusedError, FileNotFoundError, ConnectionResetError, socket.timeout):
+            pass
+        except PermissionError as e:
+            # Not our leader: send it nothing, and wait for the lock instead.
+            if not warned:
+                print(f"Note: {e}; waiting for the write lock instead.", file=sys.stderr)
+                warned = True
+        if lock.acquire(0):
+            record("queue.wait", (time.perf_counter() - t0) * 1000, "ok", role="leader")
+            try:
+                return _lead_writes(db_path, op)
+            finally:
+                lock.release()
+        if time.monotonic() >= deadline:
+            lock.release()
+            record("queue.wait", (time.perf_counter() - t0) * 1000, "timeout", timeout_s=timeout)
+            return False, f"no writer answered and the database stayed locked for {timeout:.0f}s"
+        time.sleep(0.02)
+
+
+def write_entry(db_path: str, op: dict[str, Any]) -> tuple[bool, str]:
+    """add/update under the write lock, or through the write queue (--queue / KEEPASS_QUEUE=1)."""
+    if os.environ.get("KEEPASS_QUEUE") == "1" and hasattr(socket, "AF_UNIX") and fcntl is not None:
+        return queued_write(db_path, op)
+    return locked_write(db_path, op)
+
+
+def locked_write(db_path: str, op: dict[str, Any]) -> tuple[bool, str]:
+    """add/update under the write lock, on its own."""
+    password = get_db_password()
+    if not password:
+        return False, "Could not retrieve DB password from keyring."
+    try:
+        with WriteLock(db_path):
+            return apply_write(db_path, password, op)
+    except LockTimeout as e:
+        return False, str(e)
+
+
+def _no_password(hint: str = "") -> int:
+    print(f"Error: Could not retrieve DB password from keyring.{hint}", file=sys.stderr)
+    return 1
+
+
+def get_attribute(db_path: str, db_password: str, path_or_title: str, attr: str) -> tuple[bool, str]:
+    """(True, value) or (False, error) for one attribute of an entry."""
+    code, out, err = run_cli(db_path, db_password, "show", "-a", attr, path_or_title)
+    if code != 0:
+        return False, err.strip() or f"show failed for {path_or_title}"
+    return True, out.rstrip("\n")
+
+
+def list_entries(db_path: str, db_password: str, group_path: Optional[str]) -> tuple[bool, str]:
+    """(True, `ls -R` output) or (False, error)."""
+    args = ["ls", "-R"] if group_path is None else ["ls", "-R", group_path]
+    code, out, err = run_cli(db_path, db_password, *args)
+    if code != 0:
+        return False, err.strip() or "ls failed"
+    return True, out.rstrip()
+
+
 def cmd_get(db_path: str, path_or_title: str, attr: str) -> int:
     """Get an attribute (e.g. Password) for an entry."""
     password = get_db_password()
     if not password:
-        print("Error: Could not retrieve DB password from keyring. Run save-keepass-password-to-keyring.sh first.", file=sys.stderr)
-        return 1
-    args = ["show", "-a", attr, path_or_title]
-    code, out, err = run_cli(db_path, password, *args)
-    if code != 0:
-        if err:
-            print(err, file=sys.stderr)
-        return code
-    print(out.rstrip())
-    return 0
+        return _no_password(" Run save-keepass-password-to-keyring.sh first.")
+    ok, text = get_attribute(db_path, password, path_or_title, attr)
+    print(text, file=sys.stdout if ok else sys.stderr)
+    return 0 if ok else 1
 
 
 def cmd_list(db_path: str, group_path: Optional[str]) -> int:
     """List entries in root or in a group."""
     password = get_db_password()
     if not password:
-        print("Error: Could not retrieve DB password from keyring.", file=sys.stderr)
-        return 1
-    args = ["ls", "-R"] if group_path is None else ["ls", "-R", group_path]
-    code, out, err = run_cli(db_path, password, *args)
-    if code != 0:
-        if err:
-            print(err, file=sys.stderr)
-        return code
-    print(out.rstrip())
-    return 0
+        return _no_password()
+    ok, text = list_entries(db_path, password, group_path)
+    print(text, file=sys.stdout if ok else sys.stderr)
+    return 0 if ok else 1
+
 
+def ensure_group_exists(db_path: str, db_password: str, group_path: str, index: Optional[PathIndex] = None) -> bool:
+    """Ensure group exists; create missing levels with mkdir. Returns True on success.
 
-def ensure_group_exists(db_path: str, db_password: str, group_path: str) -> bool:
-    """Ensure group exists; create with mkdir if not. Returns True on success."""
-    parts = group_path.strip("/").split("/")
-    for i in range(1, len(parts) + 1):
-        parent = "/".join(parts[:i])
-        code, out, err = run_cli(db_path, db_password, "ls", parent)
-        if code != 0:
-            code_mk, _, err_mk = run_cli(db_path, db_password, "mkdir", parent)
-            if code_mk != 0:
-                print(f"Error creating group {parent}: {err_mk}", file=sys.stderr)
-                return False
+    Existing levels are looked up in the path index, so only mkdir starts a command.
+    """
+    if index is None:
+        index, error = load_index(db_path, db_password)
+        if index is None:
+            print(f"Error: {error}", file=sys.stderr)
+            return False
+    for parent in index.missing_groups(group_path):
+        code_mk, _, err_mk = run_cli(db_path, db_password, "mkdir", parent)
+        if code_mk != 0:
+            print(f"Error creating group {parent}: {err_mk}", file=sys.stderr)
+            return False
+        index.add_group(parent)
+        save_index(db_path, index)
     return True
 
 
+def add_entry(db_path: str, db_password: str, entry_path: str, username: Optional[str], entry_password: str) -> tuple[bool, str]:
+    """Add a new entry (check-before-add against the path index). Returns (ok, message)."""
+    entry_path = entry_path.strip("/")
+    if "/" not in entry_path:
+        return False, "Entry path must be Group/Env/EntryTitle (e.g. MyApp/prod/API Key)."
+    group_path = entry_path.rsplit("/", 1)[0]
+    index, error = load_index(db_path, db_password)
+    if index is None:
+        return False, error
+    if index.has_entry(entry_path):
+        return False, f"Entry already exists. Use 'update' to change: {entry_path}"
+    if not ensure_group_exists(db_path, db_password, group_path, index):
+        return False, f"Could not create group {group_path}"
+    code, out, err = run_cli(db_path, db_password, "add", "-u", username or "api", "-p", entry_path, entry_password=entry_password)
+    if code != 0:
+        return False, (err or out).strip()
+    index.add_entry(entry_path)
+    save_index(db_path, index)
+    return True, f"Added: {entry_path}"
+
+
+def update_entry(db_path: str, db_password: str, entry_path: str, entry_password: str) -> tuple[bool, str]:
+    """Change an existing entry's password (entry must exist). Returns (ok, message)."""
+    entry_path = entry_path.strip("/")
+    index, error = load_index(db_path, db_password)
+    if index is None:
+        return False, error
+    if not index.has_entry(entry_path):
+        return False, f"Entry not found. Use 'add' to create: {entry_path}"
+    code, out, err = run_cli(db_path, db_password, "edit", "-p", entry_path, entry_password=entry_password)
+    if code != 0:
+        return False, (err or out).strip()
+    save_index(db_path, index)
+    return True, f"Updated: {entry_path}"
+
+
 def cmd_add(
     db_path: str,
     entry_path: str,
@@ -135,70 +1061,138 @@ def cmd_add(
     password_stdin: bool,
 ) -> int:
     """Add a new entry. Path = Group/Subgroup/EntryTitle. Check-before-add: if entry exists, error."""
-    password = get_db_password()
-    if not password:
-        print("Error: Could not retrieve DB password from keyring.", file=sys.stderr)
-        return 1
-    if "/" not in entry_path:
-        print("Error: Entry path must be Group/Env/EntryTitle (e.g. MyApp/prod/API Key).", file=sys.stderr)
-        return 1
-    parts = entry_path.rsplit("/", 1)
-    group_path = parts[0]
-    entry_title = parts[1]
-    # Check if entry already exists
-    code_loc, out_loc, _ = run_cli(db_path, password, "locate", entry_title)
-    if code_loc == 0 and out_loc.strip():
-        for line in out_loc.strip().splitlines():
-            if entry_path in line or entry_title in line:
-                print(f"Error: Entry already exists. Use 'update' to change: {entry_path}", file=sys.stderr)
-                return 1
-    if not ensure_group_exists(db_path, password, group_path):
-        return 1
-    entry_password: Optional[str] = None
-    if password_stdin:
-        entry_password = sys.stdin.read().strip()
+    entry_password = sys.stdin.read().strip() if password_stdin else ""
     if not entry_password:
         print("Error: --password-from-stdin required for add (pipe password, e.g. echo 'secret' | keepass_ops.py add ... --password-from-stdin).", file=sys.stderr)
         return 1
-    args = ["add", "-u", username or "api", "-p", entry_path]
-    code, out, err = run_cli(db_path, password, *args, stdin=password + "\n" + entry_password + "\n")
-    if code != 0:
-        # keepassxc-cli add prompts: first DB password, then entry password. We pass both.
-        print(err or out, file=sys.stderr)
-        return code
-    print("Added:", entry_path)
+    ok, message = write_entry(db_path, {"op": "add", "path": entry_path, "username": username, "password": entry_password})
+    if not ok:
+        print(f"Error: {message}", file=sys.stderr)
+        return 1
+    print(message)
     return 0
 
 
 def cmd_update(db_path: str, entry_path: str, password_stdin: bool) -> int:
     """Update an existing entry's password. Check-before: entry must exist."""
-    password = get_db_password()
-    if not password:
-        print("Error: Could not retrieve DB password from keyring.", file=sys.stderr)
-        return 1
-    code_show, _, err_show = run_cli(db_path, password, "show", entry_path)
-    if code_show != 0:
-        print(f"Error: Entry not found. Use 'add' to create: {entry_path}", file=sys.stderr)
-        if err_show:
-            print(err_show, file=sys.stderr)
-        return 1
-    entry_password: Optional[str] = None
-    if password_stdin:
-        entry_password = sys.stdin.read().strip()
+    entry_password = sys.stdin.read().strip() if password_stdin else ""
     if not entry_password:
         print("Error: --password-from-stdin required for update.", file=sys.stderr)
         return 1
-    args = ["edit", "-p", entry_path]
-    code, out, err = run_cli(db_path, password, *args, stdin=password + "\n" + entry_password + "\n")
-    if code != 0:
-        print(err or out, file=sys.stderr)
-        return code
-    print("Updated:", entry_path)
+    ok, message = write_entry(db_path, {"op": "update", "path": entry_path, "password": entry_password})
+    if not ok:
+        print(f"Error: {message}", file=sys.stderr)
+        return 1
+    print(message)
     return 0
 
 
+def run_operation(db_path: str, db_password: str, op: dict[str, Any]) -> dict[str, Any]:
+    """Run one batch operation; returns its result record (without secrets passed in)."""
+    kind = op.get("op")
+    path = op.get("path")
+    if kind == "list":
+        ok, text = list_entries(db_path, db_password, op.get("group"))
+        return {"ok": ok, "output" if ok else "error": text}
+    if not isinstance(path, str) or not path:
+        return {"ok": False, "error": "missing \"path\""}
+    if kind == "get":
+        ok, text = get_attribute(db_path, db_password, path, op.get("attr") or "Password")
+        return {"ok": ok, "value" if ok else "error": text}
+    if kind in ("add", "update"):
+        entry_password = op.get("password")
+        if not isinstance(entry_password, str) or not entry_password:
+            return {"ok": False, "error": f"missing \"password\" for {kind}"}
+        try:
+            with WriteLock(db_path):
+                ok, message = apply_write(db_path, db_password, op)
+        except LockTimeout as e:
+            ok, message = False, str(e)
+        return {"ok": ok, "message" if ok else "error": message}
+    return {"ok": False, "error": f"unknown op {kind!r} (expected get, list, add, update)"}
+
+
+def cmd_batch(db_path: str, stop_on_error: bool) -> int:
+    """Run JSON-lines operations from stdin with one unlock; one JSON result line per operation."""
+    password = get_db_password()
+    if not password:
+        return _no_password()
+    failed = 0
+    for index, line in enumerate(sys.stdin):
+        if not line.strip():
+            continue
+        try:
+            op = json.loads(line)
+            if not isinstance(op, dict):
+                raise ValueError("operation must be a JSON object")
+        except ValueError as e:
+            op, result = {}, {"ok": False, "error": f"invalid JSON: {e}"}
+        else:
+            result = run_operation(db_path, password, op)
+        result_rec = {"line": index + 1, "op": op.get("op")}
+        for key in ("id", "path"):
+            if key in op:
+                result_rec[key] = op[key]
+        result_rec.update(result)
+        print(json.dumps(result_rec, ensure_ascii=False), flush=True)
+        if not result["ok"]:
+            failed += 1
+            if stop_on_error:
+                break
+    return 1 if failed else 0
+
+
+def parse_spec(spec: str) -> tuple[str, str, str]:
+    """NAME=Group/Env/Title[#Attribute] -> (NAME, path, attribute)."""
+    name, sep, target = spec.partition("=")
+    if not sep or not name or not target:
+        raise ValueError(f"expected NAME=PATH[#ATTRIBUTE], got {spec!r}")
+    path, _, attr = target.partition("#")
+    return name.strip(), path.strip(), attr.strip() or "Password"
+
+
+def _env_quote(value: str) -> str:
+    return "'" + value.replace("'", "'\\''") + "'"
+
+
+def cmd_get_many(db_path: str, specs: list[str], spec_file: Optional[str], fmt: str) -> int:
+    """Print several attributes as NAME='value' lines (sourceable) or one JSON object."""
+    if spec_file:
+        with open(spec_file, "r", encoding="utf-8") as f:
+            specs = [s.strip() for s in f if s.strip() and not s.lstrip().startswith("#")] + list(specs)
+    try:
+        parsed = [parse_spec(s) for s in specs]
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    if not parsed:
+        print("Error: no NAME=PATH specs given.", file=sys.stderr)
+        return 1
+    password = get_db_password()
+    if not password:
+        return _no_password()
+    values: dict[str, str] = {}
+    missing = 0
+    for name, path, attr in parsed:
+        ok, text = get_attribute(db_path, password, path, attr)
+        if ok:
+            values[name] = text
+        else:
+            missing += 1
+            print(f"Error: {name} ({path} #{attr}): {text}", file=sys.stderr)
+    if fmt == "json":
+        print(json.dumps(values, indent=2, ensure_ascii=False))
+    else:
+        for name, value in values.items():
+            print(f"{name}={_env_quote(value)}")
+    return 1 if missing else 0
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="KeePassXC get/add/update with check-before-add.")
+    parser.add_argument("--no-session", action="store_true", help="One keepassxc-cli process per command (no `open` session).")
+    parser.add_argument("--queue", action="store_true", help="Hand add/update to a shared writer that saves a burst of writes together (same as KEEPASS_QUEUE=1).")
+    parser.add_argument("--profile", action="store_true", help=f"Print a per-phase timing breakdown to stderr (records are also appended to ${PROFILE_LOG_ENV} if set).")
     sub = parser.add_subparsers(dest="command", required=True)
     # get
     p_get = sub.add_parser("get", help="Get attribute (e.g. Password) for an entry.")
@@ -216,10 +1210,38 @@ def main() -> int:
     p_update = sub.add_parser("update", help="Update entry password. Entry must exist.")
     p_update.add_argument("path", help="Full path to entry.")
     p_update.add_argument("--password-from-stdin", action="store_true", help="Read new password from stdin.")
+    # get-many
+    p_many = sub.add_parser("get-many", help="Get several attributes at once (env-file or JSON output).")
+    p_many.add_argument("specs", nargs="*", help="NAME=Group/Env/Title[#Attribute] (attribute default: Password).")
+    p_many.add_argument("--from", dest="spec_file", default=None, help="File with one NAME=PATH[#ATTRIBUTE] per line (# comments allowed).")
+    p_many.add_argument("--format", choices=("env", "json"), default="env", help="env: NAME='value' lines (default); json: one object.")
+    # batch
+    p_batch = sub.add_parser("batch", help="Run JSON-lines operations from stdin with one unlock.")
+    p_batch.add_argument("--stop-on-error", action="store_true", help="Stop at the first failed operation.")
 
     args = parser.parse_args()
+    if args.no_session:
+        os.environ["KEEPASS_SESSION"] = "0"
+    if args.queue:
+        os.environ["KEEPASS_QUEUE"] = "1"
+    global _profile, _profile_command
+    _profile_command = args.command
+    if args.profile:
+        _profile = []
     db_path = get_db_path()
+    t0 = time.perf_counter()
+    code = 1
+    try:
+        code = run_command(args, db_path)
+        return code
+    finally:
+        close_sessions()  # inside the timed run, so the session's quit/save is counted
+        record("command", (time.perf_counter() - t0) * 1000, "ok" if code == 0 else "error", name=args.command)
+        if args.profile:
+            print_profile()
+
 
+def run_command(args: argparse.Namespace, db_path: str) -> int:
     if args.command == "get":
         return cmd_get(db_path, args.path_or_title, args.attr)
     if args.command == "list":
@@ -228,6 +1250,10 @@ def main() -> int:
         return cmd_add(db_path, args.path, args.username, args.password_from_stdin)
     if args.command == "update":
         return cmd_update(db_path, args.path, args.password_from_stdin)
+    if args.command == "get-many":
+        return cmd_get_many(db_path, args.specs, args.spec_file, args.format)
+    if args.command == "batch":
+        return cmd_batch(db_path, args.stop_on_error)
     return 0
 
 
@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""
+Caching stdio proxy for MCP servers: repeated read-only tools/call answered from memory.
+
+Agents repeat the same read-only calls within a session (the same search, the
+same GitHub file, the same memory lookup), and each one goes to the container
+again. Wrap any stdio entry of mcp.json with the proxy, original command after "--":
+
+  "duckduckgo": {
+    "command": "python3",
+    "args": ["/home/me/.cursor/scripts/mcp-cache-proxy.py", "--server", "duckduckgo",
+             "--", "docker", "run", "-i", "--rm", "mcp/duckduckgo"]
+  }
+
+The proxy starts the command and passes every message through unchanged, except
+tools/call requests for read-only tools whose (server, tool, canonical arguments)
+result is cached: those are answered directly. Only successful results are
+cached (no JSON-RPC errors, no isError). Entries expire after --ttl seconds; the
+least recently used are evicted beyond --max-entries or --max-bytes of results.
+
+Read vs write is the classification guard-mcp-write.py applies (the compiled
+mcp_policy table, then its WRITE_TOOLS/verb heuristic): anything the hook would
+not simply allow is a write. Writes always pass through and clear the server's
+cache, both when sent and when answered, and a read answered after a write was
+sent is not cached, so a read never returns data from before a write.
+
+Not every read is cacheable: the hook allows Playwright's browser_click or
+browser_snapshot because they write no data, but their results depend on the
+page, not on the arguments. STATEFUL_TOOLS lists such tools per server kind
+(the mcp_policy catalog key); they pass through and clear the cache like
+writes. --no-cache TOOL adds to that list for this server, --cache TOOL takes a
+tool off it.
+
+--server is the server's key in mcp.json, which the policy and the overrides
+use. Without it, the proxy looks for the one mcp.json entry that runs the
+command (itself, or wrapped as above); if there is none, or more than one, it
+runs the command in its place and caches nothing.
+
+The cache lives for one session (one proxy process). Hits, misses, writes,
+evictions and the latency saved (the upstream time of each cached answer) go to
+a stats file, updated at most once a second and on exit; `mcp-cache-proxy.py
+stats` prints them. It can wrap `mcp-pool.py connect ...` as well.
+
+Usage:
+  mcp-cache-proxy.py [--server NAME] [--ttl S] [--max-entries N] [--max-bytes N]
+                     [--cache TOOL] [--no-cache TOOL] [--stats FILE] -- COMMAND ARG ...
+  mcp-cache-proxy.py stats [FILE ...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import mcp_stdio  # noqa: E402
+
+HOOKS_DIR = os.path.join(mcp_stdio.REPO_ROOT, "hooks")
+sys.path.insert(0, HOOKS_DIR)
+from guardlib import mcp_policy, registry  # noqa: E402
+
+STATS_INTERVAL = 1.0
+
+CacheKey = Tuple[str, str, str]  # (server, tool, canonical arguments)
+
+# Per server kind: tools the mcp-write hook allows whose results depend on session
+# state (the browser page, the task planner's thought chain) rather than on their
+# arguments, so an equal call can get another answer. "*" is every tool.
+STATEFUL_TOOLS: Dict[str, Tuple[str, ...]] = {
+    "playwright": ("*",),
+    "shrimp": ("process_thought", "research_mode"),
+}
+
+
+def stats_dir() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "cursor-mcp")
+
+
+def canonical_arguments(arguments: Any) -> str:
+    """Arguments as compact JSON with sorted keys, so equal calls get equal keys."""
+    return json.dumps(arguments if arguments is not None else {}, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+class Classifier:
+    """Per tool: read vs write, decided as the beforeMCPExecution hook decides it, and cacheable or not."""
+
+    def __init__(self, server: str, kind: str, cache: Tuple[str, ...] = (), no_cache: Tuple[str, ...] = ()) -> None:
+        self.server = server
+        hook = registry.load_hook("mcp-write")
+        self.fallback = hook.heuristic_decision
+        self.heuristic = hook.HEURISTIC
+        stateful = STATEFUL_TOOLS.get(kind, ())
+        self.all_stateful = "*" in stateful
+        self.stateful = {mcp_policy.normalize_tool(t) for t in (*stateful, *no_cache)}
+        self.cache = {mcp_policy.normalize_tool(t) for t in cache}
+        self.known: Dict[str, bool] = {}
+        self.known_cacheable: Dict[str, bool] = {}
+
+    def is_read(self, tool: str) -> bool:
+        read = self.known.get(tool)
+        if read is None:
+            read = mcp_policy.get_policy(self.heuristic).decide(self.server, tool, self.fallback) == "allow"
+            self.known[tool] = read
+        return read
+
+    def is_cacheable(self, tool: str) -> bool:
+        """A read whose result depends only on its arguments (not in STATEFUL_TOOLS / --no-cache)."""
+        cacheable = self.known_cacheable.get(tool)
+        if cacheable is None:
+            name = mcp_policy.normalize_tool(tool)
+            stateful = (self.all_stateful or name in self.stateful) and name not in self.cache
+            cacheable = self.is_read(tool) and not stateful
+            self.known_cacheable[tool] = cacheable
+        return cacheable
+
+
+class Entry:
+    __slots__ = ("result", "stored", "upstream_ms")
+
+    def __init__(self, result: bytes, stored: float, upstream_ms: float) -> None:
+        self.result = result  # the encoded "result" value
+        self.stored = stored
+        self.upstream_ms = upstream_ms
+
+
+class ResultCache:
+    """LRU with TTL and a size limit over encoded results. Not thread-safe; Proxy locks."""
+
+    def __init__(self, ttl: float, max_entries: int, max_bytes: int) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries: "OrderedDict[CacheKey, Entry]" = OrderedDict()
+        self.bytes = 0
+        self.evictions = 0
+        self.expired = 0
+
+    def get(self, key: CacheKey, now: float) -> Optional[Entry]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if now - entry.stored > self.ttl:
+            self._drop(key)
+            self.expired += 1
+            return None
+        self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key: CacheKey, entry: Entry) -> None:
+        if len(entry.result) > self.max_bytes:
+            return
+        if key in self.entries:
+            self._drop(key)
+        self.entries[key] = entry
+        self.bytes += len(entry.result)
+        while len(self.entries) > self.max_entries or self.bytes > self.max_bytes:
+            self._drop(next(iter(self.entries)))
+            self.evictions += 1
+
+    def clear(self, server: str) -> int:
+        keys = [key for key in self.entries if key[0] == server]
+        for key in keys:
+            self._drop(key)
+        return len(keys)
+
+    def _drop(self, key: CacheKey) -> None:
+        self.bytes -= len(self.entries.pop(key).result)
+
+
+class Pending:
+    """A tools/call forwarded upstream, waiting for its response."""
+
+    __slots__ = ("key", "sent", "generation")
+
+    def __init__(self, key: Optional[CacheKey], sent: float, generation: int) -> None:
+        self.key = key  # None for writes and stateful reads
+        self.sent = sent
+        self.generation = generation
+
+
+class Proxy:
+    """Client (stdin/stdout) <-> upstream server, with the cache in between."""
+
+    def __init__(self, classifier: Classifier, upstream: mcp_stdio.McpProcess, cache: ResultCache, stats_path: str) -> None:
+        self.server = classifier.server
+        self.upstream = upstream
+        self.cache = cache
+        self.classifier = classifier
+        self.stats_path = stats_path
+        self.lock = threading.Lock()
+        self.out_lock = threading.Lock()
+        self.pending: Dict[Any, Pending] = {}
+        self.generation = 0  # bumped by every write; reads sent before one are not cached
+        self.counters = {"hits": 0, "misses": 0, "writes": 0, "stateful": 0, "uncacheable": 0, "invalidated": 0}
+        self.saved_ms = 0.0
+        self.started = time.time()
+        self.stats_written = 0.0
+        self.closing = False  # the client closed stdin; run() finishes up
+
+    def write_out(self, data: bytes) -> None:
+        with self.out_lock:
+            sys.stdout.buffer.write(data)
+            sys.stdout.buffer.flush()
+
+    def _invalidate(self) -> None:
+        self.generation += 1
+        self.counters["invalidated"] += self.cache.clear(self.server)
+
+    def from_client(self, message: Dict[str, Any]) -> None:
+        """One client message: answer from the cache or forward it."""
+        if message.get("method") == "tools/call" and "id" in message:
+            params = message.get("params") or {}
+            tool = str(params.get("name") or "")
+            now = time.monotonic()
+            reply = None
+            with self.lock:
+                if not self.classifier.is_cacheable(tool):
+                    self.counters["writes" if not self.classifier.is_read(tool) else "stateful"] += 1
+                    self._invalidate()
+                    self.pending[message["id"]] = Pending(None, now, self.generation)
+                else:
+                    key = (self.server, tool, canonical_arguments(params.get("arguments")))
+                    entry = self.cache.get(key, now)
+                    if entry is not None:
+                        self.counters["hits"] += 1
+                        self.saved_ms += entry.upstream_ms
+                        reply = b'{"jsonrpc":"2.0","id":' + json.dumps(message["id"]).encode("utf-8") + b',"result":' + entry.result + b"}\n"
+                    else:
+                        self.counters["misses"] += 1
+                        self.pending[message["id"]] = Pending(key, now, self.generation)
+            if reply is not None:
+                self.write_out(reply)
+                self.save_stats()
+                return
+        self.upstream.send(message)
+
+    def from_server(self, message: Dict[str, Any]) -> None:
+        """One upstream message: cache a read result, then pass it on."""
+        if "id" in message and "method" not in message:
+            with self.lock:
+                pending = self.pending.pop(message["id"], None)
+                if pending is not None:
+                    if pending.key is None:
+                        self._invalidate()  # the write is done; drop reads cached meanwhile
+                    elif "result" in message and not (message["result"] or {}).get("isError") and pending.generation == self.generation:
+                        upstream_ms = (time.monotonic() - pending.sent) * 1000
+                        self.cache.put(pending.key, Entry(mcp_stdio.encode(message["result"])[:-1], time.monotonic(), upstream_ms))
+                    else:
+                        self.counters["uncacheable"] += 1
+        self.write_out(mcp_stdio.encode(message))
+        if message.get("id") is not None:
+            self.save_stats()
+
+    def pump_server(self) -> None:
+        while True:
+            message = self.upstream.receive()
+            if message is None:
+                break
+            try:
+                self.from_server(message)
+            except OSError:
+                break
+        if self.closing:
+            return
+        # Upstream exited on its own: so does the proxy, like the server it stands for.
+        self.save_stats(force=True)
+        os._exit(self.upstream.proc.poll() or 0)
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            lookups = self.counters["hits"] + self.counters["misses"]
+            return {
+                "server": self.server,
+                "pid": os.getpid(),
+                "started": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.started)),
+                **self.counters,
+                "hit_rate": round(self.counters["hits"] / lookups, 3) if lookups else None,
+                "saved_ms": round(self.saved_ms, 1),
+                "entries": len(self.cache.entries),
+                "bytes": self.cache.bytes,
+                "evictions": self.cache.evictions,
+                "expired": self.cache.expired,
+            }
+
+    def save_stats(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self.stats_written < STATS_INTERVAL:
+            return
+        self.stats_written = now
+        tmp = f"{self.stats_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.stats_path)), exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.stats(), f, indent=2)
+                f.write("\n")
+            os.replace(tmp, self.stats_path)
+        except OSError:
+            pass  # stats are informational only
+
+
+def default_server(upstream_argv: List[str]) -> Optional[str]:
+    """mcp.json key of the one entry that runs upstream_argv, itself or after a wrapper's "--"; else None."""
+    try:
+        servers = mcp_stdio.load_servers()
+    except (OSError, ValueError):
+        return None
+    names = []
+    for name, config in servers.items():
+        try:
+            argv = mcp_stdio.server_argv(config)
+        except mcp_stdio.McpError:
+            continue
+        if argv == upstream_argv or argv[-len(upstream_argv) - 1:] == ["--", *upstream_argv]:
+            names.append(name)
+    return names[0] if len(names) == 1 else None
+
+
+def run(args: argparse.Namespace, upstream_argv: List[str]) -> int:
+    server = args.server or default_server(upstream_argv)
+    if server is None:
+        # The policy and the cache are keyed on the mcp.json name; a guessed one could
+        # classify writes as reads.
+        print(f"mcp-cache-proxy: no single mcp.json entry runs {upstream_argv[0]}, not caching (pass --server NAME)", file=sys.stderr)
+        try:
+            os.execvp(upstream_argv[0], upstream_argv)
+        except OSError as e:
+            print(f"mcp-cache-proxy: cannot start {upstream_argv[0]}: {e}", file=sys.stderr)
+        return 1
+    try:
+        # The server's stderr stays on ours, which Cursor shows in the MCP log.
+        upstream = mcp_stdio.McpProcess(upstream_argv, capture_stderr=False)
+    except OSError as e:
+        print(f"mcp-cache-proxy {server}: cannot start {upstream_argv[0]}: {e}", file=sys.stderr)
+        return 1
+    cache = ResultCache(args.ttl, args.max_entries, args.max_bytes)
+    kind = mcp_policy.server_kind(server, {"args": upstream_argv})
+    classifier = Classifier(server, kind, tuple(args.cache), tuple(args.no_cache))
+    proxy = Proxy(classifier, upstream, cache, args.stats or os.path.join(stats_dir(), f"cache-stats-{server}.json"))
+    pump = threading.Thread(target=proxy.pump_server, daemon=True)
+    pump.start()
+
+    for line in sys.stdin.buffer:
+        if not line.strip():
+            continue
+        try:
+            message = json.loads(line)
+        except ValueError:
+            continue
+        if not isinstance(message, dict):
+            continue
+        try:
+            proxy.from_client(message)
+        except mcp_stdio.McpError:
+            break
+    # Servers exit on stdin EOF after answering what they have; those answers still go out.
+    proxy.closing = True
+    upstream.close(timeout=5)
+    pump.join(timeout=5)
+    proxy.save_stats(force=True)
+    s = proxy.stats()
+    print(
+        f"mcp-cache-proxy {server}: {s['hits']} hits, {s['misses']} misses, {s['writes']} writes, saved {s['saved_ms'] / 1000:.1f}s",
+        file=sys.stderr,
+    )
+    return 0
+
+
+def print_stats(paths: List[str]) -> int:
+    paths = paths or sorted(glob.glob(os.path.join(stats_dir(), "cache-stats-*.json")))
+    if not paths:
+        print(f"No cache stats in {stats_dir()}", file=sys.stderr)
+        return 1
+    for path in paths:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                s = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"  {path}: {e}", file=sys.stderr)
+            continue
+        rate = f"{s['hit_rate'] * 100:.0f}%" if s.get("hit_rate") is not None else "-"
+        print(
+            f"  {s['server']:16} hits {s['hits']:5}  misses {s['misses']:5} ({rate} hit rate)  writes {s['writes']:4}  "
+            f"saved {s['saved_ms'] / 1000:7.1f}s  entries {s['entries']} ({s['bytes']} B)  "
+            f"evicted {s['evictions']}  expired {s['expired']}  since {s['started']}"
+        )
+    return 0
+
+
+def main() -> int:
+    argv = sys.argv[1:]
+    if argv[:1] == ["stats"]:
+        return print_stats(argv[1:])
+    # Everything after "--" is the upstream command.
+    own, upstream = (argv[: argv.index("--")], argv[argv.index("--") + 1 :]) if "--" in argv else (argv, [])
+    p = argparse.ArgumentParser(
+        description="Run an MCP server behind a cache for read-only tools/call.",
+        usage="%(prog)s [options] -- COMMAND ARG ...  |  %(prog)s stats [FILE ...]",
+    )
+    p.add_argument("--server", default=None, help="Server name as in mcp.json, for the read/write policy (default: the entry that runs the command; without one, nothing is cached).")
+    p.add_argument("--ttl", type=float, default=300.0, help="Seconds a cached result stays valid (default: 300).")
+    p.add_argument("--max-entries", type=int, default=256, help="Cached results at most (default: 256).")
+    p.add_argument("--max-bytes", type=int, default=16 << 20, help="Bytes of cached results at most (default: 16 MiB).")
+    p.add_argument("--cache", action="append", default=[], metavar="TOOL", help="Cache this read tool although STATEFUL_TOOLS lists it (repeatable).")
+    p.add_argument("--no-cache", action="append", default=[], metavar="TOOL", help="Never cache this tool; it clears the cache like a write (repeatable).")
+    p.add_argument("--stats", default=None, help="Stats file (default: ~/.cache/cursor-mcp/cache-stats-<server>.json).")
+    args = p.parse_args(own)
+    if not upstream:
+        p.error("no server command after '--'")
+    return run(args, upstream)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,581 @@
+#!/usr/bin/env python3
+"""
+Warm-instance pool for stdio MCP servers: pre-started containers, one per session.
+
+Every mcp.json server is a `docker run -i --rm ...`, so each Cursor session or
+reconnect waits for a container start and server boot. `mcp-pool.py serve` keeps
+--size instances of each pooled server started and handshaken (initialize +
+notifications/initialized), and `mcp-pool.py connect` is the thin command
+mcp.json runs instead of docker:
+
+  "memory": {
+    "command": "python3",
+    "args": ["/home/me/.cursor/scripts/mcp-pool.py", "connect", "memory",
+             "--", "docker", "run", "-i", "--rm", ..., "mcp/neo4j-memory"]
+  }
+
+connect asks the pool (Unix socket) for a ready instance and relays stdio to
+it. The instance already answered initialize, so Cursor's initialize is answered
+from that result and its notifications/initialized is not repeated; everything
+after that passes through unchanged, so servers need no changes. That replay is
+only done when Cursor asks for the same protocolVersion and capabilities the
+instance was warmed up with. Otherwise the session gets a freshly started server
+that sees Cursor's own initialize, and the pool warms later instances with
+Cursor's parameters, so the next sessions match again. Without a
+running pool (or if the pool fails), connect runs the command after "--"
+itself, so the entry works either way. The same happens when the socket is
+not served by this user: a session carries tool arguments and results, so
+connect never relays it to another user's process, and serve only listens in
+a directory that is ours and closed to others (unix_peer.py).
+
+Instances are never reused: after a session the container exits, and the pool
+starts a replacement as soon as one is handed out. Idle instances are pinged
+every --health-interval seconds (dead or unresponsive ones are replaced) and
+recycled after --max-idle seconds, so a session never gets a stale connection.
+Failed starts back off (1 s doubling to 60 s).
+
+The pool reads mcp.json: entries wrapped with `mcp-pool.py connect` are pooled
+with the command after "--"; --servers also pools unwrapped stdio entries. The
+pool starts the servers with its own environment, so export the variables
+mcp.json passes with `-e` (setup-env-vars.sh) before `serve`.
+
+Usage:
+  mcp-pool.py serve [--config mcp.json] [--servers a,b] [--size N] [--size SERVER=N]
+                    [--health-interval S] [--max-idle S] [--socket PATH] [--daemon]
+  mcp-pool.py connect SERVER [-- COMMAND ARG ...]
+  mcp-pool.py status|stop [--socket PATH]
+
+With --daemon the pool detaches and prints a line for eval:
+  eval "$(~/.cursor/scripts/mcp-pool.py serve --daemon)"
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import mcp_stdio  # noqa: E402
+import unix_peer  # noqa: E402
+
+SOCK_ENV = "MCP_POOL_SOCK"
+CONNECT_TIMEOUT = 120.0
+MAX_BACKOFF = 60.0
+
+
+def socket_path() -> str:
+    """$MCP_POOL_SOCK, else mcp-pool.sock in $XDG_RUNTIME_DIR or /tmp/cursor-mcp-<uid>."""
+    path = os.environ.get(SOCK_ENV)
+    if path:
+        return path
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    directory = os.environ.get("XDG_RUNTIME_DIR") or os.path.join(os.environ.get("TMPDIR") or "/tmp", f"cursor-mcp-{uid}")
+    return os.path.join(directory, "mcp-pool.sock")
+
+
+def _read_line(sock: socket.socket) -> bytes:
+    line = b""
+    while not line.endswith(b"\n") and len(line) < 4096:
+        chunk = sock.recv(1)
+        if not chunk:
+            break
+        line += chunk
+    return line
+
+
+def pooled_command(config: Dict[str, Any]) -> Optional[List[str]]:
+    """The command after "--" of an entry that runs `mcp-pool.py connect`, else None."""
+    argv = [str(config.get("command") or ""), *(str(a) for a in config.get("args") or ())]
+    for i, arg in enumerate(argv):
+        if os.path.basename(arg) == "mcp-pool.py" and argv[i + 1 : i + 2] == ["connect"] and "--" in argv[i:]:
+            return argv[argv.index("--", i) + 1 :] or None
+    return None
+
+
+# --- connect: the thin command mcp.json runs ---
+
+
+def _run_direct(server: str, upstream: List[str], reason: str) -> int:
+    if not upstream:
+        print(f"mcp-pool connect {server}: {reason}, and no command after '--' to run instead", file=sys.stderr)
+        return 1
+    print(f"mcp-pool connect {server}: {reason}; running {upstream[0]} directly", file=sys.stderr)
+    os.execvp(upstream[0], upstream)
+    return 1  # not reached
+
+
+def connect(server: str, upstream: List[str]) -> int:
+    """Relay stdio to a pooled instance, or run the upstream command without the pool."""
+    if not hasattr(socket, "AF_UNIX"):
+        return _run_direct(server, upstream, "no Unix sockets")
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT)
+        sock.connect(socket_path())
+        if unix_peer.peer_uid(sock) != os.getuid():
+            # Whoever listens there would read and answer the whole session.
+            raise PermissionError(f"{socket_path()} is not served by this user")
+        sock.sendall(f"connect {server}\n".encode("utf-8"))
+        reply = _read_line(sock).decode("utf-8", errors="replace").strip()
+    except OSError as e:
+        sock.close()
+        return _run_direct(server, upstream, f"pool not available ({e.strerror or e})")
+    if reply != "OK":
+        sock.close()
+        return _run_direct(server, upstream, f"pool refused ({reply or 'no reply'})")
+    sock.settimeout(None)
+
+    def pump_stdin() -> None:
+        try:
+            while True:
+                data = os.read(0, 65536)
+                if not data:
+                    break
+                sock.sendall(data)
+        except OSError:
+            pass
+        try:
+            sock.shutdown(socket.SHUT_WR)
+        except OSError:
+            pass
+
+    threading.Thread(target=pump_stdin, daemon=True).start()
+    try:
+        while True:
+            data = sock.recv(65536)
+            if not data:
+                break
+            os.write(1, data)
+    except OSError:
+        pass
+    os._exit(0)  # the stdin thread may still be blocked in read()
+
+
+# --- serve: the supervisor ---
+
+
+class Instance:
+    """A started, handshaken server process and its initialize result."""
+
+    def __init__(self, process: mcp_stdio.McpProcess, init_params: Dict[str, Any], init_result: Dict[str, Any]) -> None:
+        self.process = process
+        self.init_params = init_params
+        self.init_result = init_result
+        self.created = time.monotonic()
+        self.checked = self.created
+
+
+class ServerPool:
+    """Ready instances of one server, refilled in background threads."""
+
+    def __init__(self, name: str, argv: List[str], env: Dict[str, str], size: int, settings: argparse.Namespace) -> None:
+        self.name, self.argv, self.env, self.size = name, argv, env, size
+        self.settings = settings
+        self.ready: Deque[Instance] = deque()
+        self.starting = 0
+        self.backoff_until = 0.0
+        self.failures_in_row = 0
+        self.lock = threading.Lock()
+        self.stats = {"sessions": 0, "warm": 0, "cold": 0, "start_failures": 0, "unhealthy": 0, "recycled": 0, "mismatched": 0}
+        self.start_ms: Deque[float] = deque(maxlen=50)
+        self.last_error = ""
+        # initialize params for warm-ups; replaced by the last client's that did not match
+        self.handshake = mcp_stdio.initialize_params()
+
+    def start_instance(self) -> Instance:
+        t0 = time.perf_counter()
+        params = self.handshake
+        process = mcp_stdio.McpProcess(self.argv, self.env)
+        try:
+            result = process.initialize(self.settings.start_timeout, params)
+        except mcp_stdio.McpError as e:
+            tail = process.stderr_tail().strip().splitlines()
+            process.close(timeout=2)
+            raise mcp_stdio.McpError(f"{e}{': ' + tail[-1] if tail else ''}") from e
+        self.start_ms.append((time.perf_counter() - t0) * 1000)
+        return Instance(process, params, result)
+
+    def _spawn(self) -> None:
+        error = ""
+        try:
+            instance: Optional[Instance] = self.start_instance()
+        except (mcp_stdio.McpError, OSError) as e:
+            instance, error = None, str(e)
+        with self.lock:
+            self.starting -= 1
+            if instance is not None and handshake_matches(instance.init_params, self.handshake):
+                self.ready.append(instance)
+                self.failures_in_row = 0
+                return
+            if instance is None:
+                self.stats["start_failures"] += 1
+                self.failures_in_row += 1
+                self.last_error = error
+                self.backoff_until = time.monotonic() + min(MAX_BACKOFF, 2.0 ** (self.failures_in_row - 1))
+        if instance is not None:
+            # Warmed with params that learn_handshake() has replaced meanwhile: start another.
+            instance.process.close(timeout=2)
+            self.refill()
+            return
+        print(f"mcp-pool: {self.name}: start failed: {error}", file=sys.stderr)
+
+    def refill(self) -> None:
+        with self.lock:
+            if time.monotonic() < self.backoff_until:
+                return
+            missing = max(0, self.size - len(self.ready) - self.starting)
+            self.starting += missing
+        for _ in range(missing):
+            threading.Thread(target=self._spawn, daemon=True).start()
+
+    def acquire(self) -> Tuple[Instance, bool]:
+        """(instance, warm): a ready instance, else a freshly started one; refills either way."""
+        instance = None
+        with self.lock:
+            while self.ready and instance is None:
+                candidate = self.ready.popleft()
+                if candidate.process.alive():
+                    instance = candidate
+                else:
+                    self.stats["unhealthy"] += 1
+            warm = instance is not None
+            self.stats["sessions"] += 1
+            self.stats["warm" if warm else "cold"] += 1
+        self.refill()
+        if instance is None:
+            instance = self.start_instance()
+        instance.process.discard_pending()
+        return instance, warm
+
+    def maintain(self) -> None:
+        """Recycle instances idle past --max-idle, ping the ones due a health check, refill."""
+        settings = self.settings
+        now = time.monotonic()
+        with self.lock:
+            due = [i for i in self.ready if now - i.created > settings.max_idle or now - i.checked > settings.health_interval or not i.process.alive()]
+            for instance in due:
+                self.ready.remove(instance)
+        for instance in due:
+            if now - instance.created > settings.max_idle:
+                outcome = "recycled"
+            else:
+                try:
+                    if not instance.process.alive():
+                        raise mcp_stdio.McpError("exited")
+                    instance.process.request("ping", None, settings.health_timeout)
+                    instance.process.discard_pending()
+                    instance.checked = time.monotonic()
+                    with self.lock:
+                        self.ready.append(instance)
+                    continue
+                except mcp_stdio.McpError:
+                    outcome = "unhealthy"
+            with self.lock:
+                self.stats[outcome] += 1
+            instance.process.close(timeout=2)
+        self.refill()
+
+    def learn_handshake(self, params: Dict[str, Any]) -> None:
+        """Warm future instances with a client's initialize params; drop ready ones warmed otherwise."""
+        with self.lock:
+            self.stats["mismatched"] += 1
+            self.handshake = params
+            stale = [i for i in self.ready if not handshake_matches(i.init_params, params)]
+            for instance in stale:
+                self.ready.remove(instance)
+        for instance in stale:
+            instance.process.close(timeout=2)
+        self.refill()
+
+    def status(self) -> Dict[str, Any]:
+        with self.lock:
+            ready, starting, stats = len(self.ready), self.starting, dict(self.stats)
+        starts = sorted(self.start_ms)
+        return {
+            "size": self.size,
+            "ready": ready,
+            "starting": starting,
+            **stats,
+            "start_ms_median": round(starts[len(starts) // 2], 1) if starts else None,
+            "last_error": self.last_error,
+        }
+
+    def close(self) -> None:
+        with self.lock:
+            instances, self.ready = list(self.ready), deque()
+        for instance in instances:
+            instance.process.close(timeout=2)
+
+
+def handshake_matches(warm: Dict[str, Any], client: Dict[str, Any]) -> bool:
+    """True if a server initialized with warm would answer client's initialize the same way."""
+    return warm.get("protocolVersion") == client.get("protocolVersion") and warm.get("capabilities") == client.get("capabilities")
+
+
+def relay(sock: socket.socket, pool: ServerPool, instance: Instance) -> None:
+    """Messages between a connect client and one instance; initialize is answered from the warm-up.
+
+    If the client's initialize asks for another protocol version or other
+    capabilities than the warm-up did, the instance is dropped and the session
+    runs on a freshly started server that gets the client's own initialize.
+    """
+    process = instance.process
+    reader = sock.makefile("rb")
+    replayed = False
+    first = reader.readline()
+    try:
+        message = json.loads(first) if first.strip() else None
+    except ValueError:
+        message = None
+    if isinstance(message, dict) and message.get("method") == "initialize" and "id" in message:
+        params = message.get("params") if isinstance(message.get("params"), dict) else {}
+        if handshake_matches(instance.init_params, params):
+            sock.sendall(mcp_stdio.encode({"jsonrpc": "2.0", "id": message["id"], "result": instance.init_result}))
+            replayed = True
+        else:
+            process.close(timeout=2)
+            pool.learn_handshake(params)
+            try:
+                process = mcp_stdio.McpProcess(pool.argv, pool.env)
+                process.send(message)
+            except (mcp_stdio.McpError, OSError) as e:
+                error = {"code": -32603, "message": f"mcp-pool: start failed: {e}"}
+                sock.sendall(mcp_stdio.encode({"jsonrpc": "2.0", "id": message["id"], "error": error}))
+                return
+    elif isinstance(message, dict):
+        process.send(message)
+
+    def pump_server() -> None:
+        while True:
+            out = process.receive()
+            if out is None:
+                break
+            try:
+                sock.sendall(mcp_stdio.encode(out))
+            except OSError:
+                break
+        try:
+            sock.shutdown(socket.SHUT_WR)
+        except OSError:
+            pass
+
+    pump = threading.Thread(target=pump_server, daemon=True)
+    pump.start()
+    for line in reader:
+        if not line.strip():
+            continue
+        try:
+            message = json.loads(line)
+        except ValueError:
+            continue
+        if replayed and message.get("method") == "notifications/initialized":
+            replayed = False  # the instance got it once, when it was warmed up
+            continue
+        try:
+            process.send(message)
+        except mcp_stdio.McpError:
+            break
+    process.close(timeout=5)
+    pump.join(timeout=5)
+
+
+class PoolHandler(socketserver.BaseRequestHandler):
+    def handle(self) -> None:
+        uid = unix_peer.peer_uid(self.request)
+        if uid is None or uid != os.getuid():
+            self.request.sendall(b"ERR permission denied\n")
+            return
+        pools: Dict[str, ServerPool] = self.server.pools  # type: ignore[attr-defined]
+        command = _read_line(self.request).decode("utf-8", errors="replace").strip()
+        verb, _, name = command.partition(" ")
+        if verb == "status":
+            payload = json.dumps({n: p.status() for n, p in pools.items()})
+            self.request.sendall(f"OK {payload}\n".encode("utf-8"))
+        elif verb == "stop":
+            self.request.sendall(b"OK stopping\n")
+            threading.Thread(target=self.server.shutdown).start()
+        elif verb == "connect":
+            pool = pools.get(name)
+            if pool is None:
+                self.request.sendall(f"ERR {name} is not pooled\n".encode("utf-8"))
+                return
+            try:
+                instance, _ = pool.acquire()
+            except (mcp_stdio.McpError, OSError) as e:
+                self.request.sendall(f"ERR start failed: {e}\n".encode("utf-8"))
+                return
+            self.request.sendall(b"OK\n")
+            relay(self.request, pool, instance)
+        else:
+            self.request.sendall(f"ERR unknown command {command!r}\n".encode("utf-8"))
+
+
+class PoolServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, pools: Dict[str, ServerPool]) -> None:
+        self.pools = pools
+        super().__init__(path, PoolHandler)
+
+
+def build_pools(args: argparse.Namespace) -> Dict[str, ServerPool]:
+    """ServerPool per wrapped entry (or per --servers entry), sized by --size."""
+    servers = mcp_stdio.load_servers(args.config)
+    wanted = {s.strip() for s in (args.servers or "").split(",") if s.strip()}
+    default_size, sizes = 1, {}
+    for spec in args.size or ():
+        server, sep, count = spec.rpartition("=")
+        if sep:
+            sizes[server] = int(count)
+        else:
+            default_size = int(count)
+    pools = {}
+    for name, config in servers.items():
+        if wanted and name not in wanted:
+            continue
+        upstream = pooled_command(config)
+        if upstream is None and name in wanted and config.get("command"):
+            upstream = mcp_stdio.server_argv(config)
+        if upstream is not None:
+            pools[name] = ServerPool(name, upstream, mcp_stdio.server_env(config), sizes.get(name, default_size), args)
+    missing = wanted - set(pools)
+    if missing:
+        raise ValueError(f"not pooled (unknown or url servers): {', '.join(sorted(missing))}")
+    if not pools:
+        raise ValueError("no servers to pool (wrap entries with `mcp-pool.py connect NAME -- ...` or use --servers)")
+    return pools
+
+
+def serve(args: argparse.Namespace) -> int:
+    try:
+        pools = build_pools(args)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    path = args.socket or socket_path()
+    if os.path.exists(path):
+        try:
+            request("status", path)
+            print(f"Error: mcp-pool already running on {path}", file=sys.stderr)
+            return 1
+        except OSError:
+            os.unlink(path)  # stale socket from a crashed pool
+    directory = os.path.dirname(path)
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    if not unix_peer.private_dir(directory):
+        print(f"Error: {directory} must be owned by you and closed to others (chmod 700)", file=sys.stderr)
+        return 1
+    old_umask = os.umask(0o177)
+    try:
+        server = PoolServer(path, pools)
+    finally:
+        os.umask(old_umask)
+
+    if args.daemon:
+        if os.fork():
+            print(f"{SOCK_ENV}={path}; export {SOCK_ENV};")
+            return 0
+        os.setsid()
+        devnull = os.open(os.devnull, os.O_RDWR)
+        for fd in (0, 1, 2):
+            os.dup2(devnull, fd)
+    else:
+        print(f"mcp-pool listening on {path} ({', '.join(f'{n} x{p.size}' for n, p in pools.items())})", file=sys.stderr)
+
+    stopping = threading.Event()
+
+    def maintain() -> None:
+        while not stopping.wait(1.0):
+            for pool in pools.values():
+                pool.maintain()
+
+    for pool in pools.values():
+        pool.refill()
+    threading.Thread(target=maintain, daemon=True).start()
+    try:
+        server.serve_forever(poll_interval=0.5)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stopping.set()
+        server.server_close()
+        for pool in pools.values():
+            pool.close()
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+    return 0
+
+
+def request(command: str, path: Optional[str] = None) -> Tuple[bool, str]:
+    """Send status/stop to a running pool. Returns (ok, payload); raises OSError if not running."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(10)
+        sock.connect(path or socket_path())
+        sock.sendall(command.encode("utf-8") + b"\n")
+        status, _, payload = _read_line(sock).decode("utf-8").rstrip("\n").partition(" ")
+    return status == "OK", payload
+
+
+def main() -> int:
+    argv = sys.argv[1:]
+    if argv[:1] == ["connect"]:
+        # Everything after "--" belongs to the upstream command, so no argparse here.
+        rest = argv[1:]
+        names, upstream = (rest[: rest.index("--")], rest[rest.index("--") + 1 :]) if "--" in rest else (rest, [])
+        if len(names) != 1:
+            print("Usage: mcp-pool.py connect SERVER [-- COMMAND ARG ...]", file=sys.stderr)
+            return 2
+        return connect(names[0], upstream)
+
+    p = argparse.ArgumentParser(description="Keep pre-started MCP server instances and hand them out per session.")
+    p.add_argument("command", choices=["serve", "status", "stop"], help="serve: run the pool; status/stop: talk to a running pool.")
+    p.add_argument("--socket", default=None, help=f"Socket path (default: ${SOCK_ENV} or runtime dir).")
+    p.add_argument("--config", default=None, help=f"mcp.json (default: ${mcp_stdio.MCP_CONFIG_ENV} or the repo's mcp.json).")
+    p.add_argument("--servers", default=None, help="Comma-separated servers to pool (default: entries wrapped with connect).")
+    p.add_argument("--size", action="append", help="Instances per server: N, or SERVER=N (repeatable; default 1).")
+    p.add_argument("--health-interval", type=float, default=30.0, help="Seconds between pings of an idle instance (default: 30).")
+    p.add_argument("--health-timeout", type=float, default=10.0, help="Seconds a ping may take (default: 10).")
+    p.add_argument("--max-idle", type=float, default=900.0, help="Recycle instances idle this long (default: 900).")
+    p.add_argument("--start-timeout", type=float, default=120.0, help="Seconds for start + initialize (default: 120).")
+    p.add_argument("--daemon", action="store_true", help="Detach and print the environment line for eval.")
+    args = p.parse_args(argv)
+    if not hasattr(socket, "AF_UNIX"):
+        print("Error: mcp-pool needs Unix sockets (Linux, WSL or macOS).", file=sys.stderr)
+        return 1
+    if args.command == "serve":
+        return serve(args)
+    path = args.socket or socket_path()
+    try:
+        ok, payload = request(args.command, path)
+    except OSError:
+        print(f"No mcp-pool running on {path}", file=sys.stderr)
+        return 2
+    if not ok:
+        print(f"Error: {payload}", file=sys.stderr)
+        return 1
+    if args.command == "status":
+        for name, s in json.loads(payload).items():
+            print(
+                f"  {name:22} ready {s['ready']}/{s['size']} (+{s['starting']} starting)  sessions {s['sessions']} "
+                f"(warm {s['warm']}, cold {s['cold']})  start median {s['start_ms_median']} ms  "
+                f"unhealthy {s['unhealthy']}  recycled {s['recycled']}  failed starts {s['start_failures']}"
+            )
+            if s["last_error"]:
+                print(f"      last error: {s['last_error']}")
+    else:
+        print(payload)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Local stub MCP server (stdio) for testing the MCP tools without Docker or network.
+
+Speaks the stdio transport (one JSON-RPC message per line): initialize, ping,
+tools/list and tools/call, and ignores notifications. Tools:
+
+- search, get_file_contents: read-only; the result text echoes the arguments
+- create_issue: a write
+- fail: returns an isError result
+
+Every tools/call result ends with "call #N" (N counts calls in this process), so
+tests can tell a server answer from a cached one. Delays make it behave like a
+slow container: --startup-delay before the first message is read, --delay
+before every response.
+
+Usage:
+  mcp-stub-server.py [--name NAME] [--startup-delay S] [--delay S] [--exit-after N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from typing import Any, Dict, Optional
+
+TOOLS = [
+    {"name": "search", "description": "Search (read-only).", "inputSchema": {"type": "object", "properties": {"query": {"type": "string"}}}},
+    {"name": "get_file_contents", "description": "Read a file (read-only).", "inputSchema": {"type": "object", "properties": {"path": {"type": "string"}}}},
+    {"name": "create_issue", "description": "Create an issue (write).", "inputSchema": {"type": "object", "properties": {"title": {"type": "string"}}}},
+    {"name": "browser_snapshot", "description": "Snapshot of the current page (read-only, stateful).", "inputSchema": {"type": "object"}},
+    {"name": "fail", "description": "Always fails.", "inputSchema": {"type": "object"}},
+]
+
+
+def handle(message: Dict[str, Any], name: str, calls: Dict[str, int]) -> Optional[Dict[str, Any]]:
+    method = message.get("method")
+    if "id" not in message:
+        return None  # notification
+    reply: Dict[str, Any] = {"jsonrpc": "2.0", "id": message["id"]}
+    params = message.get("params") or {}
+    if method == "initialize":
+        reply["result"] = {
+            "protocolVersion": params.get("protocolVersion", "2025-06-18"),
+            "capabilities": {"tools": {"listChanged": False}},
+            "serverInfo": {"name": name, "version": "1.0"},
+        }
+    elif method == "ping":
+        reply["result"] = {}
+    elif method == "tools/list":
+        reply["result"] = {"tools": TOOLS}
+    elif method == "tools/call":
+        tool = params.get("name")
+        if tool not in {t["name"] for t in TOOLS}:
+            reply["error"] = {"code": -32602, "message": f"Unknown tool: {tool}"}
+            return reply
+        calls["n"] += 1
+        args = json.dumps(params.get("arguments") or {}, sort_keys=True)
+        text = f"{tool} {args} call #{calls['n']}"
+        reply["result"] = {"content": [{"type": "text", "text": text}], "isError": tool == "fail"}
+    else:
+        reply["error"] = {"code": -32601, "message": f"Method not found: {method}"}
+    return reply
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Stub MCP server over stdio, for tests.")
+    p.add_argument("--name", default="stub", help="serverInfo.name (default: stub).")
+    p.add_argument("--startup-delay", type=float, default=0.0, help="Seconds before reading the first message.")
+    p.add_argument("--delay", type=float, default=0.0, help="Seconds before every response.")
+    p.add_argument("--exit-after", type=int, default=0, help="Exit after this many requests (0 = never), to test crashes.")
+    args = p.parse_args()
+
+    time.sleep(args.startup_delay)
+    print(f"{args.name}: ready", file=sys.stderr, flush=True)
+    calls = {"n": 0}
+    requests = 0
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            message = json.loads(line)
+        except ValueError:
+            reply: Optional[Dict[str, Any]] = {"jsonrpc": "2.0", "id": None, "error": {"code": -32700, "message": "Parse error"}}
+        else:
+            reply = handle(message, args.name, calls)
+        if reply is None:
+            continue
+        time.sleep(args.delay)
+        sys.stdout.write(json.dumps(reply) + "\n")
+        sys.stdout.flush()
+        requests += 1
+        if args.exit_after and requests >= args.exit_after:
+            return 3
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
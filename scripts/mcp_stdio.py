@@ -0,0 +1,210 @@
+"""
+MCP over stdio: start a server from its mcp.json entry and exchange JSON-RPC messages.
+
+The stdio transport sends one JSON-RPC message per line in each direction; the
+server's stderr is free-form logging. McpProcess runs the server exactly as
+mcp.json configures it (command, args, env on top of ours) and reads its stdout
+and stderr in background threads, so callers can wait for a response with a
+timeout, from several threads for several servers.
+
+Used by probe-mcp-servers.py, mcp-pool.py and mcp-cache-proxy.py; mcp-stub-server.py is a local
+server to test them without Docker.
+"""
+
+from __future__ import annotations
+
+import collections
+import json
+import os
+import queue
+import subprocess
+import threading
+import time
+from typing import Any, Deque, Dict, List, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MCP_CONFIG_ENV = "CURSOR_MCP_CONFIG"
+PROTOCOL_VERSION = "2025-06-18"
+CLIENT_INFO = {"name": "cursor-mcp-tools", "version": "1.0"}
+STDERR_TAIL = 20
+
+
+class McpError(RuntimeError):
+    """The server failed, exited or answered with a JSON-RPC error."""
+
+
+class McpTimeout(McpError):
+    """No response within the timeout."""
+
+
+def mcp_config_path() -> str:
+    """mcp.json next to scripts/ (~/.cursor/mcp.json when installed); override: CURSOR_MCP_CONFIG."""
+    return os.environ.get(MCP_CONFIG_ENV) or os.path.join(REPO_ROOT, "mcp.json")
+
+
+def load_servers(path: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """The mcpServers mapping of an mcp.json file."""
+    with open(path or mcp_config_path(), "r", encoding="utf-8") as f:
+        servers = json.load(f).get("mcpServers") or {}
+    return {name: cfg for name, cfg in servers.items() if isinstance(cfg, dict)}
+
+
+def server_argv(config: Dict[str, Any]) -> List[str]:
+    """Command line of a stdio server entry; McpError for url (remote) servers."""
+    if not config.get("command"):
+        raise McpError("not a stdio server (no command; url servers are remote)")
+    return [str(config["command"]), *(str(a) for a in config.get("args") or ())]
+
+
+def server_env(config: Dict[str, Any]) -> Dict[str, str]:
+    return {**os.environ, **{k: str(v) for k, v in (config.get("env") or {}).items()}}
+
+
+def encode(message: Dict[str, Any]) -> bytes:
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+def initialize_params() -> Dict[str, Any]:
+    return {"protocolVersion": PROTOCOL_VERSION, "capabilities": {}, "clientInfo": CLIENT_INFO}
+
+
+class McpProcess:
+    """One running stdio server. Thread-safe for one requester at a time per id."""
+
+    def __init__(
+        self, argv: List[str], env: Optional[Dict[str, str]] = None, cwd: Optional[str] = None, capture_stderr: bool = True
+    ) -> None:
+        """capture_stderr=False leaves the server's stderr on ours (no stderr_tail)."""
+        self.argv = argv
+        self.started = time.perf_counter()
+        self.proc = subprocess.Popen(
+            argv,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE if capture_stderr else None,
+            env=env,
+            cwd=cwd,
+        )
+        self._messages: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        self._stderr: Deque[str] = collections.deque(maxlen=STDERR_TAIL)
+        self._write_lock = threading.Lock()
+        self._next_id = 0
+        self.notifications: List[Dict[str, Any]] = []
+        threading.Thread(target=self._read_stdout, daemon=True).start()
+        if capture_stderr:
+            threading.Thread(target=self._read_stderr, daemon=True).start()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "McpProcess":
+        return cls(server_argv(config), server_env(config), config.get("cwd"))
+
+    def _read_stdout(self) -> None:
+        assert self.proc.stdout is not None
+        for line in self.proc.stdout:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                message = json.loads(line)
+            except ValueError:
+                self._stderr.append(f"(stdout, not JSON) {line[:200]!r}")
+                continue
+            if isinstance(message, dict):
+                self._messages.put(message)
+        self._messages.put(None)  # EOF
+
+    def _read_stderr(self) -> None:
+        assert self.proc.stderr is not None
+        for line in self.proc.stderr:
+            self._stderr.append(line.decode("utf-8", errors="replace").rstrip())
+
+    def stderr_tail(self) -> str:
+        return "\n".join(self._stderr)
+
+    def send(self, message: Dict[str, Any]) -> None:
+        assert self.proc.stdin is not None
+        try:
+            with self._write_lock:
+                self.proc.stdin.write(encode(message))
+                self.proc.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            raise McpError(f"server stdin closed: {e}") from e
+
+    def notify(self, method: str, params: Optional[Dict[str, Any]] = None) -> None:
+        self.send({"jsonrpc": "2.0", "method": method, **({"params": params} if params is not None else {})})
+
+    def receive(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Next message from the server (any kind), None once it has exited."""
+        try:
+            message = self._messages.get(timeout=timeout)
+        except queue.Empty:
+            raise McpTimeout(f"no message in {timeout:.1f}s") from None
+        if message is None:
+            self._messages.put(None)  # EOF stays visible to later calls
+        return message
+
+    def discard_pending(self) -> int:
+        """Drop messages received so far (e.g. notifications meant for an earlier client)."""
+        dropped = 0
+        while True:
+            try:
+                message = self._messages.get_nowait()
+            except queue.Empty:
+                return dropped
+            if message is None:
+                self._messages.put(None)
+                return dropped
+            dropped += 1
+
+    def request(self, method: str, params: Optional[Dict[str, Any]] = None, timeout: float = 30.0) -> Dict[str, Any]:
+        """Send a request and return its result; server notifications are kept in .notifications."""
+        self._next_id += 1
+        rid = self._next_id
+        self.send({"jsonrpc": "2.0", "id": rid, "method": method, **({"params": params} if params is not None else {})})
+        deadline = time.monotonic() + timeout
+        while True:
+            left = deadline - time.monotonic()
+            if left <= 0:
+                raise McpTimeout(f"{method}: no response in {timeout:.1f}s")
+            try:
+                message = self.receive(left)
+            except McpTimeout:
+                raise McpTimeout(f"{method}: no response in {timeout:.1f}s") from None
+            if message is None:
+                raise McpError(f"{method}: server exited (code {self.proc.poll()})")
+            if message.get("id") == rid and "method" not in message:
+                if "error" in message:
+                    error = message["error"] or {}
+                    raise McpError(f"{method}: {error.get('message', error)}")
+                return message.get("result") or {}
+            if "method" in message and "id" not in message:
+                self.notifications.append(message)
+            # Anything else (server-to-client requests, stale ids) is not ours to answer.
+
+    def initialize(self, timeout: float = 30.0, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """The MCP handshake: initialize (default: initialize_params()), then notifications/initialized."""
+        result = self.request("initialize", params or initialize_params(), timeout)
+        self.notify("notifications/initialized")
+        return result
+
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def close(self, timeout: float = 5.0) -> Optional[int]:
+        """Close stdin (servers exit on EOF), then terminate and kill if needed."""
+        try:
+            if self.proc.stdin:
+                self.proc.stdin.close()
+        except OSError:
+            pass
+        for stop in (None, self.proc.terminate, self.proc.kill):
+            if stop is not None:
+                try:
+                    stop()
+                except OSError:
+                    pass
+            try:
+                return self.proc.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                continue
+        return self.proc.poll()
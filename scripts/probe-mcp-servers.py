@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+MCP probe: start every mcpServers entry as configured and time it over JSON-RPC.
+
+Each stdio server in mcp.json is launched exactly as Cursor launches it (command,
+args, env; e.g. `docker run -i --rm mcp/neo4j-memory`), then:
+
+- time to first response: process start -> initialize result (container start,
+  server boot and handshake; the cold start a new Cursor session pays)
+- first tools/list after the handshake, and the tool count
+- --calls more tools/list requests: p50/p90/p99/min/max latency of a warm server
+
+Servers are probed concurrently (--jobs), each under its own --timeout for the
+whole probe; a server that times out is killed and reported, the rest carry on.
+url servers are remote and reported as skipped. Results are written as JSON
+(default ~/.cursor/test-results/mcp-probe-<timestamp>.json) for comparison over
+time; --baseline prints the change against an earlier result.
+
+--stub probes local stub servers (mcp-stub-server.py) instead of mcp.json, to
+test the harness without Docker or network.
+
+Exits 1 if any probed server fails or times out.
+
+Usage:
+  probe-mcp-servers.py [SERVER ...] [--config mcp.json] [--calls N] [--timeout S]
+                       [--jobs N] [--out FILE] [--baseline FILE] [--stub] [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPTS_DIR)
+import mcp_stdio  # noqa: E402
+
+STUB = os.path.join(SCRIPTS_DIR, "mcp-stub-server.py")
+STUB_SERVERS = {
+    "stub": {"command": sys.executable, "args": [STUB, "--name", "stub"]},
+    "stub-slow-start": {"command": sys.executable, "args": [STUB, "--name", "stub-slow-start", "--startup-delay", "0.5"]},
+    "stub-slow-calls": {"command": sys.executable, "args": [STUB, "--name", "stub-slow-calls", "--delay", "0.01"]},
+    "stub-hangs": {"command": sys.executable, "args": [STUB, "--name", "stub-hangs", "--startup-delay", "3600"]},
+    "stub-remote": {"url": "https://example.invalid/mcp"},
+}
+
+
+def percentile(samples: List[float], p: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def latency_summary(samples: List[float]) -> Dict[str, float]:
+    return {
+        "p50": round(percentile(samples, 50), 2),
+        "p90": round(percentile(samples, 90), 2),
+        "p99": round(percentile(samples, 99), 2),
+        "min": round(min(samples), 2),
+        "max": round(max(samples), 2),
+        "mean": round(sum(samples) / len(samples), 2),
+    }
+
+
+def probe(name: str, config: Dict[str, Any], calls: int, timeout: float) -> Dict[str, Any]:
+    """Launch one server, handshake, list tools; never raises."""
+    if not config.get("command"):
+        return {"status": "skipped", "reason": "url server (remote; not started locally)"}
+    deadline = time.monotonic() + timeout
+    result: Dict[str, Any] = {"status": "error"}
+    server: Optional[mcp_stdio.McpProcess] = None
+
+    def left() -> float:
+        return max(0.001, deadline - time.monotonic())
+
+    try:
+        server = mcp_stdio.McpProcess.from_config(config)
+        info = server.initialize(left())
+        result["time_to_first_response_ms"] = round((time.perf_counter() - server.started) * 1000, 2)
+        result["server_info"] = info.get("serverInfo", {})
+        result["protocol_version"] = info.get("protocolVersion")
+
+        t0 = time.perf_counter()
+        tools = server.request("tools/list", None, left()).get("tools") or []
+        result["first_tools_list_ms"] = round((time.perf_counter() - t0) * 1000, 2)
+        result["tools"] = len(tools)
+
+        samples = []
+        for _ in range(calls):
+            t0 = time.perf_counter()
+            server.request("tools/list", None, left())
+            samples.append((time.perf_counter() - t0) * 1000)
+        if samples:
+            result["tools_list_ms"] = latency_summary(samples)
+        result["calls"] = len(samples)
+        result["status"] = "ok"
+    except mcp_stdio.McpTimeout as e:
+        result.update(status="timeout", error=f"{e} (probe timeout {timeout:g}s)")
+    except (mcp_stdio.McpError, OSError) as e:
+        result["error"] = str(e)
+    finally:
+        if server is not None:
+            if result["status"] != "ok":
+                result["stderr_tail"] = server.stderr_tail()
+            server.close(timeout=2)
+    result["wall_ms"] = round((timeout - (deadline - time.monotonic())) * 1000, 2)
+    return result
+
+
+def probe_all(servers: Dict[str, Dict[str, Any]], calls: int, timeout: float, jobs: int) -> Dict[str, Dict[str, Any]]:
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        futures = {name: pool.submit(probe, name, cfg, calls, timeout) for name, cfg in servers.items()}
+        return {name: f.result() for name, f in futures.items()}
+
+
+def default_out() -> str:
+    return os.path.join(os.path.expanduser("~"), ".cursor", "test-results", f"mcp-probe-{time.strftime('%Y%m%d-%H%M%S')}.json")
+
+
+def print_table(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any]) -> None:
+    def delta(name: str, key: str, value: Optional[float], sub: Optional[str] = None) -> str:
+        old = baseline.get(name, {}).get(key)
+        if sub and isinstance(old, dict):
+            old = old.get(sub)
+        if value is None or not isinstance(old, (int, float)):
+            return ""
+        return f" ({value - old:+.1f})"
+
+    print(f"  {'server':22} {'status':8} {'first resp ms':>22} {'tools':>5} {'list p50 ms':>18} {'p99 ms':>9}")
+    for name, r in results.items():
+        ttfr = r.get("time_to_first_response_ms")
+        p50 = r.get("tools_list_ms", {}).get("p50")
+        p99 = r.get("tools_list_ms", {}).get("p99")
+        print(
+            f"  {name:22} {r['status']:8} "
+            f"{(f'{ttfr:.1f}' + delta(name, 'time_to_first_response_ms', ttfr)) if ttfr is not None else '-':>22} "
+            f"{r.get('tools', '-'):>5} "
+            f"{(f'{p50:.2f}' + delta(name, 'tools_list_ms', p50, 'p50')) if p50 is not None else '-':>18} "
+            f"{f'{p99:.2f}' if p99 is not None else '-':>9}"
+        )
+        if r.get("error"):
+            print(f"      {r['error']}")
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Start each MCP server as configured and time initialize and tools/list.")
+    p.add_argument("servers", nargs="*", help="Servers to probe (default: all in the config).")
+    p.add_argument("--config", default=None, help=f"mcp.json (default: ${mcp_stdio.MCP_CONFIG_ENV} or the repo's mcp.json).")
+    p.add_argument("--calls", type=int, default=20, help="Repeated tools/list calls per server (default: 20).")
+    p.add_argument("--timeout", type=float, default=120.0, help="Seconds for each server's whole probe (default: 120).")
+    p.add_argument("--jobs", type=int, default=0, help="Servers probed at once (default: all).")
+    p.add_argument("--out", default=None, help="Result JSON (default: ~/.cursor/test-results/mcp-probe-<timestamp>.json; '-' = none).")
+    p.add_argument("--baseline", default=None, help="Earlier result JSON to compare against.")
+    p.add_argument("--stub", action="store_true", help="Probe local stub servers instead of mcp.json (no Docker needed).")
+    p.add_argument("--json", action="store_true", help="Print the result JSON.")
+    args = p.parse_args()
+
+    if args.stub:
+        servers = dict(STUB_SERVERS)
+        if not args.servers and args.timeout == p.get_default("timeout"):
+            args.timeout = 5.0  # stub-hangs never answers
+    else:
+        try:
+            servers = mcp_stdio.load_servers(args.config)
+        except (OSError, ValueError) as e:
+            print(f"Error: cannot read mcp.json: {e}", file=sys.stderr)
+            return 2
+    if args.servers:
+        unknown = [s for s in args.servers if s not in servers]
+        if unknown:
+            print(f"Error: unknown servers: {', '.join(unknown)} (configured: {', '.join(servers)})", file=sys.stderr)
+            return 2
+        servers = {s: servers[s] for s in args.servers}
+
+    t0 = time.perf_counter()
+    results = probe_all(servers, args.calls, args.timeout, args.jobs or len(servers))
+    report = {
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "config": "stub" if args.stub else os.path.abspath(args.config or mcp_stdio.mcp_config_path()),
+        "calls": args.calls,
+        "timeout_s": args.timeout,
+        "wall_ms": round((time.perf_counter() - t0) * 1000, 1),
+        "servers": results,
+    }
+
+    baseline: Dict[str, Any] = {}
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f).get("servers", {})
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_table(results, baseline)
+        print(f"\n  probed {len(results)} servers in {report['wall_ms']:.0f} ms")
+    if args.out != "-":
+        out = args.out or default_out()
+        os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+        with open(out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"  results: {out}", file=sys.stderr)
+    failed = [name for name, r in results.items() if r["status"] in ("error", "timeout")]
+    if args.stub:
+        # The hanging stub is there to exercise the timeout path.
+        failed = [name for name in failed if name != "stub-hangs" or results[name]["status"] != "timeout"]
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -63,6 +63,14 @@ if [ "$POSTMAN_API_KEY" = "CHANGE_ME" ] || [ -z "$POSTMAN_API_KEY" ]; then
     echo "⚠ POSTMAN_API_KEY is not set (CHANGE_ME or empty)"
 fi
 
+# KeePass credential agent: if keepass-agent.py is running, record its socket so new
+# shells (and Cursor started from them) use it instead of querying the keyring per call.
+KEEPASS_AGENT_SOCK=""
+if command -v python3 >/dev/null 2>&1 && python3 "$SCRIPT_DIR/keepass-agent.py" status >/dev/null 2>&1; then
+    KEEPASS_AGENT_SOCK="$(python3 -c 'import sys; sys.path.insert(0, sys.argv[1]); import keepass_ops; print(keepass_ops.agent_socket_path())' "$SCRIPT_DIR")"
+    echo "✓ keepass-agent running on: $KEEPASS_AGENT_SOCK"
+fi
+
 echo ""
 echo "Environment variables loaded from .env."
 echo "Variables marked with CHANGE_ME need to be set in .env file."
@@ -74,6 +82,7 @@ if [ "$EUID" -eq 0 ]; then
         echo ""
         echo "# Cursor/MCP environment variables (from .env)"
         echo "CURSOR_CONFIG_DIR=\"$CURSOR_CONFIG_DIR\""
+        [ -n "$KEEPASS_AGENT_SOCK" ] && echo "KEEPASS_AGENT_SOCK=\"$KEEPASS_AGENT_SOCK\""
         echo "NEO4J_URI=\"$NEO4J_URI\""
         echo "NEO4J_USERNAME=\"$NEO4J_USERNAME\""
         [ -n "$NEO4J_PASSWORD" ] && [ "$NEO4J_PASSWORD" != "CHANGE_ME" ] && echo "NEO4J_PASSWORD=\"$NEO4J_PASSWORD\""
@@ -155,6 +164,7 @@ PYEOF
             echo ""
             echo "# Cursor/MCP environment variables (from .env) - $(date '+%Y-%m-%d %H:%M:%S')"
             echo "export CURSOR_CONFIG_DIR=\"$CURSOR_CONFIG_DIR\""
+            [ -n "$KEEPASS_AGENT_SOCK" ] && echo "export KEEPASS_AGENT_SOCK=\"$KEEPASS_AGENT_SOCK\""
             echo "export NEO4J_URI=\"$NEO4J_URI\""
             echo "export NEO4J_USERNAME=\"$NEO4J_USERNAME\""
             [ -n "$NEO4J_PASSWORD" ] && [ "$NEO4J_PASSWORD" != "CHANGE_ME" ] && echo "export NEO4J_PASSWORD=\"$NEO4J_PASSWORD\""
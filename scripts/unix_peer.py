@@ -0,0 +1,40 @@
+"""
+Same-user checks for the Unix sockets of keepass-agent.py, keepass_ops.py --queue and mcp-pool.py.
+
+A socket only protects what is sent over it if both ends belong to the same user:
+servers check each connecting peer, and clients check the server before sending
+a password or a session's messages. Sockets live in a per-user runtime directory,
+which must be ours and closed to everyone else.
+"""
+
+from __future__ import annotations
+
+import os
+import socket
+import struct
+import sys
+from typing import Optional
+
+# macOS: SOL_LOCAL / LOCAL_PEERCRED, struct xucred {u_int cr_version; uid_t cr_uid; ...}
+_SOL_LOCAL = 0
+_LOCAL_PEERCRED = 1
+
+
+def peer_uid(sock: socket.socket) -> Optional[int]:
+    """uid of the process on the other end of a Unix socket, or None if unknown."""
+    if hasattr(socket, "SO_PEERCRED"):
+        creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+        return struct.unpack("3i", creds)[1]
+    if sys.platform == "darwin":
+        creds = sock.getsockopt(_SOL_LOCAL, _LOCAL_PEERCRED, struct.calcsize("2I"))
+        return struct.unpack("2I", creds[: struct.calcsize("2I")])[1]
+    return None
+
+
+def private_dir(directory: str) -> bool:
+    """True if directory is owned by this user and closed to everyone else (mode 0o700 or stricter)."""
+    try:
+        st = os.stat(directory)
+    except OSError:
+        return False
+    return st.st_uid == os.getuid() and not st.st_mode & 0o077
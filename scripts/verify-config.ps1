@@ -105,11 +105,13 @@ try {
     if ($LASTEXITCODE -eq 0) {
         Write-Host "  [OK] Docker is available" -ForegroundColor Green
         
+        # One inventory query for all local images instead of one `docker images` per image
+        $localImages = @(docker images --format "{{.Repository}}:{{.Tag}}" 2>$null)
+
         # Check Docker images for MCP servers
         $mcpImages = @("mcp/grafana", "mcp/playwright", "mcp/duckduckgo", "mcp/neo4j-memory", "mcp/github", "mcp/shrimp", "mcp/postman")
         foreach ($image in $mcpImages) {
-            $imageCheck = docker images $image --format "{{.Repository}}:{{.Tag}}" 2>&1
-            if ($LASTEXITCODE -eq 0 -and $imageCheck) {
+            if ($localImages -like "${image}:*") {
                 Write-Host "    [OK] Image exists: $image" -ForegroundColor Green
             } else {
                 # Check if available on Docker Hub
@@ -135,8 +137,7 @@ try {
 Write-Host "`nChecking Shrimp Task Manager..." -ForegroundColor Yellow
 try {
     # Check if Docker image exists
-    $shrimpImage = docker images mcp/shrimp --format "{{.Repository}}:{{.Tag}}" 2>&1
-    if ($LASTEXITCODE -eq 0 -and $shrimpImage) {
+    if ($localImages -like "mcp/shrimp:*") {
         Write-Host "  [OK] Shrimp Docker image exists: mcp/shrimp" -ForegroundColor Green
     } else {
         # Check if available on Docker Hub or needs build
@@ -145,7 +146,7 @@ try {
             Write-Host "  [OK] Shrimp image available on Docker Hub: mcp/shrimp" -ForegroundColor Green
         } else {
             $warnings += "Shrimp Docker image (mcp/shrimp) not found - needs build"
-            Write-Host "  [WARN] Shrimp image not found - run: .\scripts\build-mcp-images.ps1 --shrimp" -ForegroundColor Yellow
+            Write-Host "  [WARN] Shrimp image not found - run: .\scripts\build-mcp-images.ps1 -Shrimp" -ForegroundColor Yellow
         }
     }
     
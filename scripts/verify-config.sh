@@ -90,10 +90,13 @@ echo "Checking Docker..."
 if docker --version >/dev/null 2>&1; then
     echo "  ✓ Docker is available"
     
+    # One inventory query for all local images instead of one `docker images` per image
+    local_images="$(docker images --format "{{.Repository}}:{{.Tag}}" 2>/dev/null || true)"
+
     # Check Docker images for MCP servers
     mcp_images=("mcp/grafana" "mcp/playwright" "mcp/duckduckgo" "mcp/neo4j-memory" "mcp/github" "mcp/shrimp" "mcp/postman")
     for image in "${mcp_images[@]}"; do
-        if docker images "$image" --format "{{.Repository}}:{{.Tag}}" 2>/dev/null | grep -q .; then
+        if grep -q "^$image:" <<< "$local_images"; then
             echo "    ✓ Image exists: $image"
         elif docker manifest inspect "$image" >/dev/null 2>&1; then
             echo "    ✓ Image available on Docker Hub: $image"
@@ -110,7 +113,7 @@ fi
 # Check Shrimp Docker image and volume
 echo ""
 echo "Checking Shrimp Task Manager..."
-if docker images mcp/shrimp --format "{{.Repository}}:{{.Tag}}" 2>/dev/null | grep -q .; then
+if grep -q "^mcp/shrimp:" <<< "${local_images:-}"; then
     echo "  ✓ Shrimp Docker image exists: mcp/shrimp"
 elif docker manifest inspect mcp/shrimp >/dev/null 2>&1; then
     echo "  ✓ Shrimp image available on Docker Hub: mcp/shrimp"